@@ -1,3 +1,4 @@
+import logging
 import os
 from dotenv import load_dotenv
 from pathlib import Path
@@ -6,8 +7,7 @@ from pathlib import Path
 backend_root = Path(__file__).parent.parent
 env_path = backend_root / ".env"
 
-print(f"🔍 Looking for .env file at: {env_path}")
-print(f"🔍 .env file exists: {env_path.exists()}")
+logging.getLogger(__name__).debug("Loading .env from %s (exists: %s)", env_path, env_path.exists())
 
 load_dotenv(env_path)
 
@@ -25,4 +25,109 @@ DEFAULT_ORIGINS = [
 
 ALLOWED_ORIGINS = [o.strip() for o in os.getenv("ALLOWED_ORIGINS", "").split(",") if o.strip()] or DEFAULT_ORIGINS
 
+# 업스트림 API 주소 (벤치마크에서는 benchmarks.mock_upstreams 로컬 서버로 바꿔서 사용)
+KMA_BASE_URL = os.getenv("KMA_BASE_URL", "https://apihub.kma.go.kr").rstrip("/")
+KAKAO_BASE_URL = os.getenv("KAKAO_BASE_URL", "https://dapi.kakao.com").rstrip("/")
+KHOA_BASE_URL = os.getenv("KHOA_BASE_URL", "http://www.khoa.go.kr").rstrip("/")
 
+# 업스트림 HTTP 커넥션 풀 설정 (app/deps.py 의 HttpClientPool 에서 사용)
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+# HTTP/2 는 h2 패키지(httpx[http2])가 설치된 경우에만 활성화됨
+HTTP_HTTP2 = os.getenv("HTTP_HTTP2", "false").lower() in {"1", "true", "yes"}
+# 업스트림(호스트)별 최대 커넥션 수 — 지정하지 않으면 HTTP_MAX_CONNECTIONS 사용
+HTTP_MAX_CONNECTIONS_PER_UPSTREAM = {
+    "kma": int(os.getenv("HTTP_MAX_CONNECTIONS_KMA", str(HTTP_MAX_CONNECTIONS))),
+    "khoa": int(os.getenv("HTTP_MAX_CONNECTIONS_KHOA", str(HTTP_MAX_CONNECTIONS))),
+    "kakao": int(os.getenv("HTTP_MAX_CONNECTIONS_KAKAO", str(HTTP_MAX_CONNECTIONS))),
+}
+
+# 카카오 로컬 API 레이트 리밋 (API 키별 토큰 버킷, 같은 키를 쓰는 클라이언트끼리 공유)
+KAKAO_QPS = float(os.getenv("KAKAO_QPS", "10"))
+KAKAO_BURST = int(os.getenv("KAKAO_BURST", "10"))
+# API 키별 적응형 동시 요청 수 (AIMD: 성공 시 증가, 429/5xx 시 절반)
+KAKAO_CONCURRENCY_INITIAL = int(os.getenv("KAKAO_CONCURRENCY_INITIAL", "8"))
+KAKAO_CONCURRENCY_MIN = int(os.getenv("KAKAO_CONCURRENCY_MIN", "1"))
+KAKAO_CONCURRENCY_MAX = int(os.getenv("KAKAO_CONCURRENCY_MAX", "32"))
+# 429/5xx/연결 오류 재시도 (Retry-After 우선, 없으면 지수 백오프 + 지터)
+KAKAO_MAX_RETRIES = int(os.getenv("KAKAO_MAX_RETRIES", "3"))
+KAKAO_RETRY_BASE_DELAY = float(os.getenv("KAKAO_RETRY_BASE_DELAY", "0.5"))
+KAKAO_RETRY_MAX_DELAY = float(os.getenv("KAKAO_RETRY_MAX_DELAY", "10"))
+# 연속 실패 KAKAO_BREAKER_FAILURES 번이면 KAKAO_BREAKER_RESET 초 동안 카카오 호출 중단 (캐시된 결과로 응답)
+KAKAO_BREAKER_FAILURES = int(os.getenv("KAKAO_BREAKER_FAILURES", "5"))
+KAKAO_BREAKER_RESET = float(os.getenv("KAKAO_BREAKER_RESET", "30"))
+
+# 업스트림 결과 캐시 저장소: memory (워커별) 또는 sqlite (같은 호스트의 워커끼리 공유, KMA 갱신도 리더 워커만 수행)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", str(backend_root / "data" / "cache.sqlite3"))
+
+# /api/places/in-rect 타일 캐시 ((타일, 키워드) 단위, TTL + LRU)
+PLACE_CACHE_TTL = float(os.getenv("PLACE_CACHE_TTL", "3600"))
+PLACE_CACHE_MAX_ENTRIES = int(os.getenv("PLACE_CACHE_MAX_ENTRIES", "5000"))
+# 요청 영역을 덮는 타일 수 상한 (줌 구간 결정). 타일이 모두 캐시에 있을 때만 캐시로 응답하므로 조회 비용만 늘어남
+PLACE_TILE_MAX_TILES = int(os.getenv("PLACE_TILE_MAX_TILES", "16"))
+
+# KMA sea_obs 스냅샷 백그라운드 갱신 주기(초)와 stale 판정 기준(초)
+KMA_REFRESH_INTERVAL = float(os.getenv("KMA_REFRESH_INTERVAL", "300"))
+KMA_SNAPSHOT_MAX_AGE = float(os.getenv("KMA_SNAPSHOT_MAX_AGE", str(KMA_REFRESH_INTERVAL * 3)))
+# 첫 스냅샷을 만들지 못했을 때 다시 시도하는 첫 간격(초). 실패할 때마다 두 배로 늘리되 갱신 주기를 넘지 않음
+KMA_RETRY_INTERVAL = float(os.getenv("KMA_RETRY_INTERVAL", "5"))
+# 공유 캐시 사용 시 리더가 아닌 워커가 공유 스냅샷을 확인하는 주기(초)
+KMA_FOLLOWER_POLL_INTERVAL = float(os.getenv("KMA_FOLLOWER_POLL_INTERVAL", "15"))
+# /api/stations?since= 증분 응답용으로 보관하는 최근 스냅샷 변경분 수 (이보다 뒤처진 클라이언트는 전체 응답)
+STATION_DIFF_HISTORY = int(os.getenv("STATION_DIFF_HISTORY", "32"))
+# GET /api/stations/events (SSE) 클라이언트별 대기 메시지 수, 최대 동시 구독자 수, heartbeat 간격(초)
+STATION_EVENTS_QUEUE_SIZE = int(os.getenv("STATION_EVENTS_QUEUE_SIZE", "8"))
+STATION_EVENTS_MAX_CLIENTS = int(os.getenv("STATION_EVENTS_MAX_CLIENTS", "5000"))
+STATION_EVENTS_HEARTBEAT = float(os.getenv("STATION_EVENTS_HEARTBEAT", "15"))
+
+# 관측 이력 저장소 (SQLite). 이력 조회 시 비어 있는 시각은 KMA 에서 요청당 최대 HISTORY_MAX_GAP_FETCHES 번,
+# 프로세스 전체에서 동시에 HISTORY_GAP_CONCURRENCY 개까지만 채움 (한 번이 stn=0 전체 응답)
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", str(backend_root / "data" / "history.sqlite3"))
+HISTORY_STEP_MINUTES = int(os.getenv("HISTORY_STEP_MINUTES", "60"))
+HISTORY_MAX_GAP_FETCHES = int(os.getenv("HISTORY_MAX_GAP_FETCHES", "6"))
+HISTORY_GAP_CONCURRENCY = int(os.getenv("HISTORY_GAP_CONCURRENCY", "2"))
+# 이보다 최근 시각은 아직 발표 전일 수 있어 조회해도 '조회함'으로 기록하지 않음 (다음 요청에서 다시 채움)
+HISTORY_PUBLISH_DELAY_MINUTES = int(os.getenv("HISTORY_PUBLISH_DELAY_MINUTES", "60"))
+
+# 오프라인 해안 장소 인덱스 (SQLite R-tree). PLACES_SOURCE=index 면 /api/places/in-rect 를 인덱스에서만 응답
+PLACES_SOURCE = os.getenv("PLACES_SOURCE", "kakao")
+PLACE_INDEX_DB_PATH = os.getenv("PLACE_INDEX_DB_PATH", str(backend_root / "data" / "places.sqlite3"))
+PLACE_INDEX_BOUNDS = os.getenv("PLACE_INDEX_BOUNDS", "124.5,33.0,131.0,38.7")  # minLng,minLat,maxLng,maxLat
+PLACE_INDEX_CELL_SIZE = float(os.getenv("PLACE_INDEX_CELL_SIZE", "0.16"))
+PLACE_INDEX_MAX_AGE = float(os.getenv("PLACE_INDEX_MAX_AGE", str(7 * 24 * 3600)))
+# 백그라운드 증분 갱신: 주기(초, 0 이면 비활성)마다 오래된 셀을 최대 PLACE_INDEX_REFRESH_BATCH 개씩 다시 수집
+PLACE_INDEX_REFRESH_INTERVAL = float(os.getenv("PLACE_INDEX_REFRESH_INTERVAL", "0"))
+PLACE_INDEX_REFRESH_BATCH = int(os.getenv("PLACE_INDEX_REFRESH_BATCH", "5"))
+# 해안 근접 마스크: 바다 전용 활동(서핑·다이빙·해수욕장 등) 키워드는 바다에서 COAST_MAX_DISTANCE_KM 보다 먼
+# 내륙 영역·셀을 카카오에 요청하지 않음 (카약·제트스키·낚시는 강·호수도 검색, 0 이하면 비활성)
+COASTLINE_PATH = os.getenv("COASTLINE_PATH", str(backend_root / "app" / "geo" / "korea_coastline.json"))
+COAST_MASK_PATH = os.getenv("COAST_MASK_PATH", str(backend_root / "app" / "geo" / "coast_distance.json"))
+COAST_MAX_DISTANCE_KM = float(os.getenv("COAST_MAX_DISTANCE_KM", "10"))
+
+# 카카오 검색 결과가 45개(3페이지) 상한을 넘으면 영역을 4분할해 재귀 검색 (완전 수집 모드에서만)
+KAKAO_SUBDIVIDE_MAX_DEPTH = int(os.getenv("KAKAO_SUBDIVIDE_MAX_DEPTH", "4"))
+KAKAO_SUBDIVIDE_MAX_REQUESTS = int(os.getenv("KAKAO_SUBDIVIDE_MAX_REQUESTS", "64"))
+
+# 줌 레벨별 격자 클러스터링 (카카오맵 레벨 1~14, 레벨이 1 오를 때마다 격자 크기 2배)
+CLUSTER_BASE_CELL_DEG = float(os.getenv("CLUSTER_BASE_CELL_DEG", "0.0001"))  # 레벨 1 격자 크기(도)
+CLUSTER_MIN_LEVEL = int(os.getenv("CLUSTER_MIN_LEVEL", "5"))
+CLUSTER_MAX_LEVEL = int(os.getenv("CLUSTER_MAX_LEVEL", "14"))
+
+# 응답에 Server-Timing 헤더(업스트림별·구간별 처리 시간)를 붙일지 여부 (/metrics 집계는 항상 켜짐)
+METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "false").lower() in {"1", "true", "yes"}
+
+# 시도 경계 (프론트엔드와 같은 GeoJSON, 관측소·장소의 region 판정용)
+REGIONS_GEOJSON_PATH = os.getenv(
+    "REGIONS_GEOJSON_PATH", str(backend_root.parent / "frontend" / "public" / "geo" / "korea_sido_simple.json")
+)
+# 어느 시도 경계에도 들지 않는 해상 관측소는 이 거리(도) 안의 가장 가까운 시도로 봄
+REGION_MAX_OFFSHORE_DEG = float(os.getenv("REGION_MAX_OFFSHORE_DEG", "0.5"))
+
+# KHOA 수치조류도 (예보 시각 단위로 해안 전체 격자를 한 번 받아 메모리에서 보간)
+KHOA_CURRENT_BOUNDS = os.getenv("KHOA_CURRENT_BOUNDS", "124.5,33.0,131.0,38.7")  # minLng,minLat,maxLng,maxLat
+KHOA_CURRENT_STEP_MINUTES = int(os.getenv("KHOA_CURRENT_STEP_MINUTES", "60"))
+KHOA_CURRENT_INTERPOLATION = os.getenv("KHOA_CURRENT_INTERPOLATION", "bilinear")  # bilinear | nearest
+KHOA_CURRENT_RETRY_INTERVAL = float(os.getenv("KHOA_CURRENT_RETRY_INTERVAL", "60"))
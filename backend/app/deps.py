@@ -1,8 +1,131 @@
+import logging
+from typing import Dict, Any
+
 import httpx
+from fastapi import Request
+
+from .metrics import InstrumentedTransport
+from .config import (
+    HTTP_TIMEOUT,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_HTTP2,
+    HTTP_MAX_CONNECTIONS_PER_UPSTREAM,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (httpx 의 HTTP/2 지원에 필요)
+    _H2_AVAILABLE = True
+except ImportError:
+    _H2_AVAILABLE = False
+
+
+class HttpClientPool:
+    """
+    업스트림(kma, khoa, kakao)별로 하나씩 유지되는 공유 httpx.AsyncClient 풀.
+    앱 lifespan 동안 커넥션을 재사용해서 요청마다 TCP+TLS 핸드셰이크를 하지 않도록 함
+    """
+
+    def __init__(
+        self,
+        max_connections: Dict[str, int] = HTTP_MAX_CONNECTIONS_PER_UPSTREAM,
+        max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        http2: bool = HTTP_HTTP2,
+        timeout: float = HTTP_TIMEOUT,
+    ):
+        if http2 and not _H2_AVAILABLE:
+            logger.warning("HTTP_HTTP2 requested but 'h2' is not installed; falling back to HTTP/1.1")
+            http2 = False
+        self.max_connections = dict(max_connections)
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.timeout = timeout
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._request_counts: Dict[str, int] = {}
+
+    def _build_client(self, upstream: str) -> httpx.AsyncClient:
+        max_connections = self.max_connections[upstream]
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(self.max_keepalive_connections, max_connections),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+        async def count_request(request: httpx.Request):
+            self._request_counts[upstream] = self._request_counts.get(upstream, 0) + 1
+
+        # 업스트림별 지연·상태 지표를 집계하도록 전송 계층을 감쌈
+        transport = InstrumentedTransport(httpx.AsyncHTTPTransport(limits=limits, http2=self.http2), upstream)
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            transport=transport,
+            event_hooks={"request": [count_request]},
+        )
+
+    async def start(self):
+        for upstream in self.max_connections:
+            if upstream not in self._clients:
+                self._clients[upstream] = self._build_client(upstream)
+
+    async def aclose(self):
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """업스트림 이름으로 공유 클라이언트를 반환 (lifespan 밖에서는 지연 생성)"""
+        client = self._clients.get(upstream)
+        if client is None:
+            if upstream not in self.max_connections:
+                raise KeyError(f"Unknown upstream: {upstream}")
+            client = self._clients[upstream] = self._build_client(upstream)
+        return client
+
+    def stats(self) -> Dict[str, Any]:
+        """업스트림별 커넥션 풀 상태 (열린/유휴 커넥션 수, 누적 요청 수)"""
+        upstreams = {}
+        for upstream, limit in self.max_connections.items():
+            client = self._clients.get(upstream)
+            connections = _pool_connections(client) if client else []
+            idle = sum(1 for conn in connections if conn.is_idle())
+            upstreams[upstream] = {
+                "max_connections": limit,
+                "open_connections": len(connections),
+                "idle_connections": idle,
+                "active_connections": len(connections) - idle,
+                "requests": self._request_counts.get(upstream, 0),
+            }
+        return {
+            "http2": self.http2,
+            "keepalive_expiry": self.keepalive_expiry,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "upstreams": upstreams,
+        }
+
+
+def _pool_connections(client: httpx.AsyncClient) -> list:
+    # httpx 는 커넥션 풀을 공개 API 로 노출하지 않으므로 방어적으로 접근
+    transport = getattr(client, "_transport", None)
+    transport = getattr(transport, "inner", transport)  # InstrumentedTransport
+    pool = getattr(transport, "_pool", None)
+    return list(getattr(pool, "connections", []) or [])
+
+
+def get_http_pool(request: Request) -> HttpClientPool:
+    return request.app.state.http_pool
+
+
+def get_kma_http_client(request: Request) -> httpx.AsyncClient:
+    return get_http_pool(request).get("kma")
 
 
-async def get_http_client():
-    async with httpx.AsyncClient(timeout=10) as client:
-        yield client
+def get_khoa_http_client(request: Request) -> httpx.AsyncClient:
+    return get_http_pool(request).get("khoa")
 
 
+def get_kakao_http_client(request: Request) -> httpx.AsyncClient:
+    return get_http_pool(request).get("kakao")
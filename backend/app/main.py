@@ -1,14 +1,91 @@
-from fastapi import FastAPI, Depends, Query, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Query, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+import asyncio
 import httpx
+import json
+import logging
+import time
+from datetime import datetime
 from typing import List
-from .config import ALLOWED_ORIGINS, KAKAO_API_KEY, VITE_KAKAO_APPKEY
-from .schemas import ConditionResponse, PlacesInRectResponse
-from .deps import get_http_client
-from .services.kma_client import fetch_all_stations, fetch_station_by_id
-from .services.kakao_local_client import KakaoLocalClient
+from .config import ALLOWED_ORIGINS, KAKAO_API_KEY, VITE_KAKAO_APPKEY, PLACES_SOURCE
+from .schemas import ConditionResponse, ConditionsBatchRequest, ConditionsBatchResponse, PlacesInRectResponse
+from .responses import CachedJSONBody, CompressionMiddleware, json_response
+from .metrics import MetricsMiddleware, metrics, span
+from .deps import HttpClientPool, get_http_pool, get_kma_http_client, get_kakao_http_client
+from .services.kma_client import fetch_all_stations, fetch_station_by_id, fetch_sea_obs_text, parse_sea_obs_columns
+from .services.khoa_client import TidalCurrentRefresher
+from .services.kakao_local_client import KakaoLocalClient, plan_keyword_searches
+from .services.cache_backend import make_cache_backend
+from .services.place_cache import PlaceTileCache, parse_rect
+from .services.place_index import PlaceIndex, CoastalPlaceCrawler
+from .services.station_snapshot import StationRefresher, StationSnapshot, KST
+from .services.station_events import StationBroadcaster
+from .services.spatial_index import StationIndex
+from .services.clustering import GridClusterIndex
+from .services.suitability import ACTIVITY_PROFILES, SuitabilityIndex
+from .services.regions import region_names, region_of
+from .services.history_store import ObservationHistoryStore, TM_FORMAT
+from .services.single_flight import single_flight
+from .services.rate_limiter import circuit_breakers, concurrency_limiters, rate_limiters
 
-app = FastAPI(title="Marine Conditions API")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 업스트림별 공유 HTTP 커넥션 풀 (요청마다 새 클라이언트를 만들지 않음)
+    http_pool = HttpClientPool()
+    await http_pool.start()
+    app.state.http_pool = http_pool
+    # KMA 관측 스냅샷은 백그라운드에서 주기적으로 갱신
+    station_refresher.start()
+    # KHOA 조류 격자는 예보 시각마다 한 번 갱신 (KHOA_API_KEY 가 있을 때만)
+    tidal_currents.start()
+    # 오프라인 장소 인덱스 증분 갱신 (PLACE_INDEX_REFRESH_INTERVAL > 0 일 때만)
+    if place_crawler is not None:
+        place_crawler.start()
+    try:
+        yield
+    finally:
+        if place_crawler is not None:
+            await place_crawler.stop()
+        await station_refresher.stop()
+        await tidal_currents.stop()
+        await http_pool.aclose()
+        history_store.close()
+        place_index.close()
+        place_tile_cache.close()
+        cache_backend.close()
+
+
+app = FastAPI(title="Marine Conditions API", lifespan=lifespan)
+
+# 업스트림 결과 캐시 저장소 (CACHE_BACKEND=sqlite 면 워커끼리 공유)
+cache_backend = make_cache_backend()
+
+# sea_obs.php(stn=0) 스냅샷 — /api/stations, /api/conditions 는 tm 이 없으면 여기서 응답
+# 공유 저장소면 리더 워커만 KMA 를 조회하고 나머지는 저장된 스냅샷을 읽음
+station_refresher = StationRefresher(lambda: app.state.http_pool.get("kma"), backend=cache_backend)
+
+# 갱신된 스냅샷은 관측 이력 저장소(SQLite)에도 쌓음 (여러 워커면 리더만)
+history_store = ObservationHistoryStore()
+station_refresher.subscribe(history_store.append_snapshot, leader_only=True)
+
+# 스냅샷이 바뀌면 바뀐 관측소만 SSE 구독자(GET /api/stations/events)에게 전송 (모든 워커에서)
+station_broadcaster = StationBroadcaster(station_refresher.diffs)
+station_refresher.subscribe(station_broadcaster.publish)
+
+# KHOA 수치조류도 격자 — 조건·장소 응답의 유속·유향을 메모리에서 보간
+tidal_currents = TidalCurrentRefresher(lambda: app.state.http_pool.get("khoa"), backend=cache_backend)
+
+def _warm_suitability(snapshot: StationSnapshot):
+    """활동별 적합도 순위는 요청 시가 아니라 스냅샷이 바뀔 때 미리 계산 (cached_property 를 한 번 읽어 둠)"""
+    snapshot.suitability
+
+
+station_refresher.subscribe(_warm_suitability)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,68 +93,425 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "X-Snapshot-Age", "X-Snapshot-Stale", "X-Snapshot-Version", "Server-Timing"],
 )
+# br(설치된 경우)/gzip 응답 압축 — 스트리밍 응답과 미리 압축된 본문은 제외
+app.add_middleware(CompressionMiddleware)
+# 라우트별 요청 수·지연 집계 (/metrics), METRICS_SERVER_TIMING=true 면 Server-Timing 헤더 추가
+app.add_middleware(MetricsMiddleware)
 
 # 환경변수 확인 및 로깅
-print(f"🔑 KAKAO_API_KEY loaded: {'YES' if KAKAO_API_KEY else 'NO'} (length: {len(KAKAO_API_KEY) if KAKAO_API_KEY else 0})")
-print(f"🔑 VITE_KAKAO_APPKEY loaded: {'YES' if VITE_KAKAO_APPKEY else 'NO'} (length: {len(VITE_KAKAO_APPKEY) if VITE_KAKAO_APPKEY else 0})")
+logger.info("KAKAO_API_KEY loaded: %s, VITE_KAKAO_APPKEY loaded: %s", bool(KAKAO_API_KEY), bool(VITE_KAKAO_APPKEY))
+
+# 카카오 검색 결과는 API 키와 무관하므로 두 클라이언트가 타일 캐시를 공유
+place_tile_cache = PlaceTileCache(backend=cache_backend)
 
 # 카카오 로컬 API 클라이언트 초기화 (사업장 검색용)
-kakao_client = KakaoLocalClient(KAKAO_API_KEY) if KAKAO_API_KEY else None
-print(f"🏢 kakao_client initialized: {'YES' if kakao_client else 'NO'}")
+kakao_client = KakaoLocalClient(KAKAO_API_KEY, tile_cache=place_tile_cache) if KAKAO_API_KEY else None
 
 # 해양정보용 카카오 클라이언트 (VITE_KAKAO_APPKEY 사용)
-marine_kakao_client = KakaoLocalClient(VITE_KAKAO_APPKEY) if VITE_KAKAO_APPKEY else None
-print(f"🌊 marine_kakao_client initialized: {'YES' if marine_kakao_client else 'NO'}")
+marine_kakao_client = KakaoLocalClient(VITE_KAKAO_APPKEY, tile_cache=place_tile_cache) if VITE_KAKAO_APPKEY else None
+
+# 오프라인 해안 장소 인덱스 (source=index 또는 PLACES_SOURCE=index 일 때 사용)
+place_index = PlaceIndex()
+place_crawler = (
+    CoastalPlaceCrawler(place_index, kakao_client, lambda: app.state.http_pool.get("kakao"))
+    if kakao_client else None
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus 텍스트 형식 지표"""
+    await place_tile_cache.count_entries()
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@metrics.collector
+def _collect_service_metrics():
+    # 다른 객체가 이미 세고 있는 값은 스크랩 시점에 읽어서 내보냄
+    cache = place_tile_cache.stats()
+    yield "place_tile_cache_hits_total", "counter", "Place tile cache hits", {}, cache["hits"]
+    yield "place_tile_cache_misses_total", "counter", "Place tile cache misses", {}, cache["misses"]
+    yield "place_tile_cache_hit_ratio", "gauge", "Place tile cache hit ratio", {}, cache["hit_ratio"]
+    yield "place_tile_cache_entries", "gauge", "Place tile cache entries", {}, cache["entries"]
+    yield "place_tile_cache_stale_served_total", "counter", "Expired tiles served because Kakao was unavailable", {}, cache["stale_served"]
+    flights = single_flight.stats()
+    yield "single_flight_in_flight", "gauge", "Coalesced upstream calls in flight", {}, flights["in_flight"]
+    for upstream, counts in flights["upstreams"].items():
+        yield "single_flight_calls_total", "counter", "Upstream calls started by single-flight", {"upstream": upstream}, counts["calls"]
+        yield "single_flight_coalesced_total", "counter", "Calls that joined an in-flight upstream call", {"upstream": upstream}, counts["coalesced"]
+    for name, bucket in rate_limiters().items():
+        yield "rate_limiter_acquired_total", "counter", "Rate limiter tokens acquired", {"limiter": name}, bucket.total_acquired
+        yield "rate_limiter_wait_seconds_total", "counter", "Time spent waiting for rate limiter tokens", {"limiter": name}, bucket.total_wait_seconds
+    for name, limiter in concurrency_limiters().items():
+        yield "kakao_concurrency_limit", "gauge", "Adaptive (AIMD) Kakao concurrency limit", {"limiter": name}, limiter.limit
+        yield "kakao_concurrency_in_flight", "gauge", "Kakao requests holding a concurrency slot", {"limiter": name}, limiter.in_flight
+    for name, breaker in circuit_breakers().items():
+        yield "kakao_circuit_open", "gauge", "1 while the Kakao circuit breaker is open", {"limiter": name}, int(breaker.state == "open")
+        yield "kakao_circuit_rejected_total", "counter", "Kakao calls rejected by the open circuit", {"limiter": name}, breaker.rejected
+    for name, kakao in (("kakao", kakao_client), ("marine", marine_kakao_client)):
+        if kakao is not None:
+            yield "kakao_inland_skipped_total", "counter", "Kakao area searches skipped because the area is inland", {"client": name}, kakao.inland_skipped
+    events = station_broadcaster.stats()
+    yield "station_events_subscribers", "gauge", "Open station SSE connections", {}, events["subscribers"]
+    yield "station_events_published_total", "counter", "Station snapshot changes pushed to subscribers", {}, events["published"]
+    yield "station_events_dropped_total", "counter", "Slow station SSE subscribers disconnected", {}, events["dropped"]
+    yield "station_refresher_leader", "gauge", "1 if this worker polls KMA itself", {}, int(station_refresher.is_leader)
+    snapshot = station_refresher.snapshot
+    if snapshot.ready:
+        yield "station_snapshot_age_seconds", "gauge", "Age of the KMA station snapshot", {}, snapshot.age_seconds
+        yield "station_snapshot_stations", "gauge", "Stations in the KMA station snapshot", {}, len(snapshot.by_id)
+    if tidal_currents.fetched_at is not None:
+        yield "tidal_current_grid_age_seconds", "gauge", "Time since the KHOA tidal current grid was loaded", {}, time.time() - tidal_currents.fetched_at
+    http_pool = getattr(app.state, "http_pool", None)
+    if http_pool is not None:
+        for upstream, pool in http_pool.stats()["upstreams"].items():
+            yield "http_pool_open_connections", "gauge", "Open upstream connections", {"upstream": upstream}, pool["open_connections"]
+            yield "http_pool_idle_connections", "gauge", "Idle upstream connections", {"upstream": upstream}, pool["idle_connections"]
+
+
+@app.get("/api/http-pool")
+async def get_http_pool_stats(http_pool: HttpClientPool = Depends(get_http_pool)):
+    """업스트림별 HTTP 커넥션 풀 상태와 single-flight 병합 통계를 반환"""
+    return {**http_pool.stats(), "single_flight": single_flight.stats()}
 
 
 @app.get("/api/stations")
 async def get_all_stations(
+    request: Request,
     tm: str | None = Query(None, description="KST 시각 YYYYMMDDHHMM"),
-    client: httpx.AsyncClient = Depends(get_http_client),
+    level: int | None = Query(None, ge=1, le=14, description="카카오맵 레벨. 지정하면 관측소 대신 격자 클러스터를 반환"),
+    rect: str | None = Query(None, description="클러스터 영역 제한: minLng,minLat,maxLng,maxLat"),
+    region: str | None = Query(None, description="시도 이름 (예: 제주, 강원). 지정하면 그 시도의 관측소만"),
+    since: int | None = Query(None, description="이전 응답의 version. 그 뒤로 관측값이 바뀐 관측소와 사라진 관측소 ID 만 반환"),
+    client: httpx.AsyncClient = Depends(get_kma_http_client),
 ):
     """모든 해양 관측소 데이터를 반환"""
+    _check_region(region)
+    snapshot = station_refresher.snapshot
+    if since is not None and (tm is not None or level is not None):
+        raise HTTPException(status_code=400, detail="since cannot be combined with tm or level")
+    if level is not None:
+        return await _station_clusters(request, snapshot, tm, level, rect, client, region)
+    if since is not None and snapshot.ready:
+        # 링에 남은 변경분으로 이어지지 않으면(너무 뒤처진 클라이언트) 아래의 전체 응답으로 대체
+        delta = _stations_delta_body(snapshot, since, region)
+        if delta is not None:
+            return delta.response(request, headers=_snapshot_headers(snapshot))
+    if tm is None and snapshot.ready:
+        # 스냅샷이 바뀔 때까지 직렬화·압축된 본문을 재사용하고, ETag/Last-Modified 로 304 응답
+        return _stations_body(snapshot, region).response(request, headers=_snapshot_headers(snapshot))
     try:
-        stations = await fetch_all_stations(client, tm)
+        stations = _in_region(await fetch_all_stations(client, tm), region)
         return {"stations": stations, "count": len(stations)}
     except Exception as e:
         return {"error": str(e), "stations": [], "count": 0}
 
 
+_stations_body_cache: dict = {}
+
+
+def _stations_body(snapshot: StationSnapshot, region: str | None = None) -> CachedJSONBody:
+    cached = _stations_body_cache.get(("stations", region))
+    if cached is None or cached[0] is not snapshot:
+        stations = snapshot.stations if region is None else snapshot.by_region.get(region, [])
+        payload = {
+            "stations": stations,
+            "count": len(stations),
+            "updated_at": snapshot.updated_at,
+            "version": snapshot.version,
+            "full": True,
+        }
+        # 시도별 본문은 ETag 의 본문 CRC 로 구분됨 (헤더에 한글을 넣지 않음)
+        body = CachedJSONBody(payload, modified_at=snapshot.observed_datetime, tag=snapshot.observed_at or "")
+        cached = _stations_body_cache[("stations", region)] = (snapshot, body)
+    return cached[1]
+
+
+_delta_body_cache: dict = {}
+
+
+def _stations_delta_body(snapshot: StationSnapshot, since: int, region: str | None) -> CachedJSONBody | None:
+    """since 버전 이후 바뀐 관측소(최신 관측)와 사라진 관측소 ID. 변경분이 이어지지 않으면 None"""
+    if _delta_body_cache.get("snapshot") is not snapshot:
+        _delta_body_cache.clear()
+        _delta_body_cache["snapshot"] = snapshot
+    body = _delta_body_cache.get((since, region))
+    if body is None:
+        delta = station_refresher.diffs.since(since, snapshot.version)
+        if delta is None:
+            return None
+        changed, removed = delta
+        stations = _in_region([snapshot.by_id[station_id] for station_id in sorted(changed)], region)
+        payload = {
+            "stations": stations,
+            "removed": sorted(removed),
+            "count": len(stations),
+            "updated_at": snapshot.updated_at,
+            "version": snapshot.version,
+            "since": since,
+            "full": False,
+        }
+        body = _delta_body_cache[(since, region)] = CachedJSONBody(
+            payload, modified_at=snapshot.observed_datetime, tag=f"{snapshot.observed_at or ''}-d{since}"
+        )
+    return body
+
+
+def _check_region(region: str | None):
+    if region is not None and region not in region_names():
+        raise HTTPException(status_code=400, detail=f"Unknown region: {region}")
+
+
+def _in_region(items: List[dict], region: str | None, lat_key: str = "lat", lon_key: str = "lon") -> List[dict]:
+    # 수집 시 region 이 붙지 않은 항목(이전 캐시 등)은 좌표로 판정
+    if region is None:
+        return items
+    return [
+        item for item in items
+        if (item["region"] if "region" in item else region_of(item[lat_key], item[lon_key])) == region
+    ]
+
+
+def _cluster_bounds(rect: str | None):
+    if rect is None:
+        return None
+    try:
+        return parse_rect(rect)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="rect must be minLng,minLat,maxLng,maxLat")
+
+
+async def _station_clusters(
+    request: Request,
+    snapshot: StationSnapshot,
+    tm: str | None,
+    level: int,
+    rect: str | None,
+    client: httpx.AsyncClient,
+    region: str | None = None,
+):
+    """레벨별 관측소 클러스터. 스냅샷이면 미리 계산된 색인을 쓰고, 영역 제한이 없으면 본문도 캐시함"""
+    bounds = _cluster_bounds(rect)
+    if tm is None and snapshot.ready:
+        index = snapshot.clusters if region is None else snapshot.region_clusters(region)
+        if bounds is None:
+            cached = _stations_body_cache.get(("clusters", level, region))
+            if cached is None or cached[0] is not snapshot:
+                payload = _clusters_payload(index, level, None, updated_at=snapshot.updated_at)
+                body = CachedJSONBody(payload, modified_at=snapshot.observed_datetime, tag=f"{snapshot.observed_at or ''}-L{level}")
+                cached = _stations_body_cache[("clusters", level, region)] = (snapshot, body)
+            return cached[1].response(request, headers=_snapshot_headers(snapshot))
+        return json_response(
+            _clusters_payload(index, level, bounds, updated_at=snapshot.updated_at),
+            headers=_snapshot_headers(snapshot),
+        )
+    try:
+        stations = _in_region(await fetch_all_stations(client, tm), region)
+    except Exception as e:
+        return {"error": str(e), "clusters": [], "count": 0}
+    return json_response(_clusters_payload(GridClusterIndex(stations, id_key="station_id"), level, bounds))
+
+
+def _clusters_payload(index: GridClusterIndex, level: int, bounds, **extra) -> dict:
+    clusters = index.clusters(level, bounds)
+    return {"clusters": clusters, "count": len(clusters), "total": index.total, "level": level, **extra}
+
+
+def _snapshot_headers(snapshot: StationSnapshot) -> dict:
+    # 스냅샷 나이는 요청마다 달라지므로 캐시된 본문이 아닌 헤더로 노출
+    return {
+        "X-Snapshot-Age": f"{snapshot.age_seconds:.1f}",
+        "X-Snapshot-Stale": "true" if snapshot.stale else "false",
+        "X-Snapshot-Version": str(snapshot.version),
+    }
+
+
+@app.get("/api/stations/events")
+async def get_station_events(
+    request: Request,
+    since: int | None = Query(None, description="마지막으로 받은 version (없으면 Last-Event-ID 헤더 사용)"),
+    region: str | None = Query(None, description="시도 이름. 지정하면 그 시도의 관측소 변경만"),
+    rect: str | None = Query(None, description="영역 제한: minLng,minLat,maxLng,maxLat"),
+):
+    """관측소 변경분을 Server-Sent Events 로 푸시 (스냅샷 갱신마다 stations 이벤트)"""
+    _check_region(region)
+    bounds = _cluster_bounds(rect)
+    if since is None and request.headers.get("last-event-id", "").isdigit():
+        since = int(request.headers["last-event-id"])
+    if station_broadcaster.full:
+        raise HTTPException(status_code=503, detail="Too many station event subscribers")
+    return StreamingResponse(
+        station_broadcaster.stream(lambda: station_refresher.snapshot, since, region, bounds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/stations/nearest")
+async def get_nearest_stations(
+    lat: float = Query(..., description="위도"),
+    lon: float = Query(..., description="경도"),
+    k: int = Query(1, ge=1, le=50, description="반환할 관측소 수"),
+    client: httpx.AsyncClient = Depends(get_kma_http_client),
+):
+    """좌표에서 가까운 순으로 k 개 관측소를 반환"""
+    index = await _station_index(client)
+    stations = index.nearest(lat, lon, k)
+    return {"stations": stations, "count": len(stations)}
+
+
+async def _station_index(client: httpx.AsyncClient) -> StationIndex:
+    # 스냅샷이 아직 없으면 한 번 조회해서 임시 인덱스를 만듦
+    snapshot = station_refresher.snapshot
+    if snapshot.ready:
+        return snapshot.index
+    return StationIndex(await fetch_all_stations(client))
+
+
+@app.get("/api/recommendations")
+async def get_recommendations(
+    activity: str = Query(..., description="활동 (surfing, scuba, kayak, windsurf 등)"),
+    region: str | None = Query(None, description="시도 이름 (예: 제주, 강원)"),
+    k: int = Query(10, ge=1, le=100, description="반환할 관측소 수"),
+    client: httpx.AsyncClient = Depends(get_kma_http_client),
+):
+    """현재 관측값 기준 활동 적합도가 높은 관측소 상위 k 개를 반환"""
+    if activity not in ACTIVITY_PROFILES:
+        raise HTTPException(status_code=400, detail=f"activity must be one of: {', '.join(ACTIVITY_PROFILES)}")
+    _check_region(region)
+    snapshot = station_refresher.snapshot
+    if snapshot.ready:
+        index, headers = snapshot.suitability, _snapshot_headers(snapshot)
+    else:
+        # 스냅샷이 아직 없으면 한 번 조회해서 임시 순위를 만듦
+        index, headers = SuitabilityIndex(await fetch_all_stations(client)), None
+    recommendations = index.top(activity, k, region)
+    return json_response(
+        {
+            "activity": activity,
+            "region": region,
+            "recommendations": recommendations,
+            "count": len(recommendations),
+            "updated_at": snapshot.updated_at,
+        },
+        headers=headers,
+    )
+
+
+@app.get("/api/stations/{station_id}/history")
+async def get_station_history(
+    station_id: str,
+    from_tm: str = Query(..., alias="from", description="시작 KST 시각 YYYYMMDDHHMM"),
+    to_tm: str | None = Query(None, alias="to", description="끝 KST 시각 YYYYMMDDHHMM (기본: 현재)"),
+    client: httpx.AsyncClient = Depends(get_kma_http_client),
+):
+    """지점의 관측 이력을 로컬 저장소에서 반환 (비어 있는 시각만 KMA 에서 채움)"""
+    to_tm = to_tm or datetime.now(KST).strftime(TM_FORMAT)
+    try:
+        if datetime.strptime(from_tm, TM_FORMAT) > datetime.strptime(to_tm, TM_FORMAT):
+            raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="'from' and 'to' must be YYYYMMDDHHMM")
+    
+    result = await history_store.history(client, station_id, from_tm, to_tm)
+    return {
+        "station_id": station_id,
+        "from": from_tm,
+        "to": to_tm,
+        "observations": result["observations"],
+        "count": len(result["observations"]),
+        "fetched_gaps": result["fetched_gaps"],
+        "missing_gaps": result["missing_gaps"],
+    }
+
+
 @app.get("/api/conditions", response_model=ConditionResponse)
 async def get_conditions(
+    response: Response,
     station_id: str = Query(..., description="KMA 지점 ID"),
     tm: str | None = Query(None, description="KST 시각 YYYYMMDDHHMM"),
-    client: httpx.AsyncClient = Depends(get_http_client),
+    region: str | None = Query(None, description="시도 이름. 지점이 다른 시도면 404"),
+    client: httpx.AsyncClient = Depends(get_kma_http_client),
 ):
     """특정 지점의 해양 조건 데이터를 반환"""
+    _check_region(region)
+    snapshot = station_refresher.snapshot
+    if tm is None and station_id in snapshot.by_id:
+        # 스냅샷 나이를 헤더로 노출 (업스트림 호출 없음)
+        response.headers.update(_snapshot_headers(snapshot))
+        return _condition_in_region(snapshot.by_id[station_id], region)
     try:
         station_data = await fetch_station_by_id(client, station_id, tm)
-        if not station_data:
-            return ConditionResponse(
-                spotName="Unknown",
-                lat=0.0,
-                lon=0.0,
-                sst=None,
-                wave_height=None,
-                current_speed=None,
-                observed_at=None,
-                source="KMA",
-            )
-        
+        return _condition_in_region(station_data, region)
+    except HTTPException:
+        raise
+    except Exception as e:
         return ConditionResponse(
-            spotName=station_data.get("station_name", "Unknown"),
-            lat=station_data.get("lat", 0.0),
-            lon=station_data.get("lon", 0.0),
-            sst=station_data.get("sst"),
-            wave_height=station_data.get("wave_height"),
+            spotName="Error",
+            lat=0.0,
+            lon=0.0,
+            sst=None,
+            wave_height=None,
             current_speed=None,
-            observed_at=station_data.get("observed_at"),
+            observed_at=None,
             source="KMA",
         )
-    except Exception as e:
+
+
+@app.post("/api/conditions/batch", response_model=ConditionsBatchResponse)
+async def get_conditions_batch(
+    batch: ConditionsBatchRequest,
+    response: Response,
+    client: httpx.AsyncClient = Depends(get_kma_http_client),
+):
+    """
+    여러 지점 ID·좌표의 해양 조건을 한 번에 반환.
+    스냅샷(또는 tm 지정 시 stn=0 한 번 조회)에서 ID 는 색인으로, 좌표는 KD-트리 최근접 관측소로 찾음
+    """
+    _check_region(batch.region)
+    snapshot = station_refresher.snapshot
+    if batch.tm is None and snapshot.ready:
+        response.headers.update(_snapshot_headers(snapshot))
+    else:
+        try:
+            text = await fetch_sea_obs_text(client, 0, batch.tm)
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"KMA fetch failed: {e}")
+        snapshot = StationSnapshot(columns=parse_sea_obs_columns(text), fetched_at=time.time())
+
+    stations = [
+        _condition_from_station(snapshot.by_id[station_id]).model_copy(update={"station_id": station_id})
+        if station_id in snapshot.by_id and _in_region([snapshot.by_id[station_id]], batch.region) else None
+        for station_id in batch.station_ids
+    ]
+    index = snapshot.index
+    points = []
+    for point, match in zip(batch.points, index.tree.query_many([(point.lat, point.lon) for point in batch.points])):
+        if match is None or (batch.region is not None and region_of(point.lat, point.lon) != batch.region):
+            points.append(None)
+            continue
+        station = index.stations[match[0]]
+        # 조류는 관측소가 아니라 요청 좌표에서 보간
+        points.append(_condition_from_station(station).model_copy(update={
+            "station_id": station["station_id"],
+            "distance_km": round(match[1], 3),
+            **tidal_currents.at(point.lat, point.lon),
+        }))
+    return ConditionsBatchResponse(stations=stations, points=points, observed_at=snapshot.observed_at)
+
+
+def _condition_in_region(station_data: dict, region: str | None) -> ConditionResponse:
+    if region is not None and station_data and not _in_region([station_data], region):
+        raise HTTPException(status_code=404, detail=f"Station is not in region: {region}")
+    return _condition_from_station(station_data)
+
+
+def _condition_from_station(station_data: dict) -> ConditionResponse:
+    if not station_data:
         return ConditionResponse(
-            spotName="Error",
+            spotName="Unknown",
             lat=0.0,
             lon=0.0,
             sst=None,
@@ -86,13 +520,46 @@ async def get_conditions(
             observed_at=None,
             source="KMA",
         )
+    
+    lat, lon = station_data.get("lat"), station_data.get("lon")
+    return ConditionResponse(
+        spotName=station_data.get("station_name", "Unknown"),
+        lat=lat if lat is not None else 0.0,
+        lon=lon if lon is not None else 0.0,
+        sst=station_data.get("sst"),
+        wave_height=station_data.get("wave_height"),
+        observed_at=station_data.get("observed_at"),
+        source="KMA",
+        region=station_data.get("region"),
+        **(tidal_currents.at(lat, lon) if lat is not None and lon is not None else {}),
+    )
+
+
+@app.get("/api/places/cache")
+async def get_place_cache_stats():
+    """장소 타일 캐시 상태(항목 수, 적중률)를 반환"""
+    await place_tile_cache.count_entries()
+    return place_tile_cache.stats()
+
+
+@app.get("/api/places/index")
+async def get_place_index_stats():
+    """오프라인 장소 인덱스 상태(장소 수, 수집 셀 수)를 반환"""
+    return await asyncio.to_thread(place_index.stats)
 
 
 @app.get("/api/places/in-rect", response_model=PlacesInRectResponse)
 async def get_places_in_rect(
     rect: str = Query(..., description="영역 좌표: minLng,minLat,maxLng,maxLat"),
     activities: str = Query(..., description="활동 종류: scuba,kayak,beach 등 (쉼표로 구분)"),
-    client: httpx.AsyncClient = Depends(get_http_client),
+    with_conditions: bool = Query(False, description="각 장소에 최근접 관측소의 수온·파고를 첨부"),
+    stream: str | None = Query(None, description="스트리밍 응답: ndjson 또는 sse (키워드별로 결과를 바로 전송)"),
+    source: str = Query(PLACES_SOURCE, description="kakao: 카카오 API 검색, index: 오프라인 장소 인덱스만 사용"),
+    complete: bool = Query(False, description="키워드별 45개 상한을 넘는 영역을 분할 검색해 결과를 모두 수집"),
+    level: int | None = Query(None, ge=1, le=14, description="카카오맵 레벨. 지정하면 장소 대신 격자 클러스터를 반환"),
+    region: str | None = Query(None, description="시도 이름. 지정하면 그 시도의 장소만"),
+    client: httpx.AsyncClient = Depends(get_kakao_http_client),
+    kma_client: httpx.AsyncClient = Depends(get_kma_http_client),
 ):
     """지정된 사각형 영역 내의 해양레저 사업장을 검색"""
     # 활동 목록 파싱
@@ -100,6 +567,14 @@ async def get_places_in_rect(
     
     if not activity_list:
         raise HTTPException(status_code=400, detail="At least one activity must be specified")
+    if level is not None and stream is not None:
+        raise HTTPException(status_code=400, detail="level (clusters) cannot be combined with stream")
+    _check_region(region)
+    
+    if source == "index":
+        return await _places_from_index(rect, activity_list, with_conditions, stream, kma_client, level, region)
+    if source != "kakao":
+        raise HTTPException(status_code=400, detail="source must be 'kakao' or 'index'")
     
     # 해양정보인 경우 marine_kakao_client 사용, 그 외는 일반 kakao_client 사용
     if "marine_info" in activity_list:
@@ -111,33 +586,135 @@ async def get_places_in_rect(
         if not client_to_use:
             raise HTTPException(status_code=500, detail="Kakao API key not configured")
     
+    if stream is not None:
+        if stream not in STREAM_MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail="stream must be 'ndjson' or 'sse'")
+        return StreamingResponse(
+            _stream_places(
+                stream, client_to_use, client, kma_client, rect, activity_list, with_conditions, complete, region
+            ),
+            media_type=STREAM_MEDIA_TYPES[stream],
+        )
+    
     try:
-        print(f"🔍 Searching places with rect: {rect}, activities: {activity_list}")
-        print(f"🔑 Using client: {'marine_kakao_client' if 'marine_info' in activity_list else 'kakao_client'}")
-        print(f"🔑 Client object: {client_to_use}")
-        print(f"🔑 Client API key (first 10 chars): {client_to_use.api_key[:10] if client_to_use and client_to_use.api_key else 'None'}...")
+        logger.debug("Searching places with rect: %s, activities: %s", rect, activity_list)
         
         # 카카오 로컬 API로 장소 검색
-        places = await client_to_use.search_places_in_rect(
-            client=client,
-            rect=rect,
-            activities=activity_list
-        )
+        with span("search"):
+            places = await client_to_use.search_places_in_rect(
+                client=client,
+                rect=rect,
+                activities=activity_list,
+                max_results_per_activity=None if complete else 45
+            )
+        places = _in_region(places, region, lat_key="y", lon_key="x")
         
-        print(f"✅ Found {len(places)} places")
-        if len(places) > 0:
-            print(f"📍 First place example: {places[0].get('name', 'N/A')}")
+        if level is not None:
+            return json_response({
+                **_place_clusters_payload(places, level),
+                "activities": activity_list,
+                "rect": rect,
+                "plan": plan_keyword_searches(activity_list).stats(),
+            })
         
-        return PlacesInRectResponse(
-            places=places,
-            count=len(places),
-            activities=activity_list,
-            rect=rect
-        )
+        if with_conditions:
+            with span("conditions"):
+                _attach_conditions(places, await _station_index(kma_client))
+        
+        logger.debug("Found %d places", len(places))
+        
+        # 장소 dict 는 이미 PlaceResponse 형태로 정리돼 있으므로 pydantic 재검증 없이 바로 직렬화
+        return json_response({
+            "places": places,
+            "count": len(places),
+            "activities": activity_list,
+            "rect": rect,
+            "plan": plan_keyword_searches(activity_list).stats(),
+        })
         
     except Exception as e:
-        print(f"❌ Search failed: {str(e)}")
-        print(f"❌ Error type: {type(e).__name__}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
\ No newline at end of file
+        logger.exception("Place search failed")
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+
+async def _places_from_index(
+    rect: str,
+    activity_list: List[str],
+    with_conditions: bool,
+    stream: str | None,
+    kma_client: httpx.AsyncClient,
+    level: int | None = None,
+    region: str | None = None,
+):
+    """업스트림 호출 없이 오프라인 장소 인덱스에서 rect+활동 질의에 응답"""
+    try:
+        bounds = parse_rect(rect)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="rect must be minLng,minLat,maxLng,maxLat")
+    places = await asyncio.to_thread(place_index.query, bounds, activity_list, None, region)
+    if level is not None:
+        return json_response({**_place_clusters_payload(places, level), "activities": activity_list, "rect": rect})
+    if with_conditions:
+        _attach_conditions(places, await _station_index(kma_client))
+    summary = {"count": len(places), "activities": activity_list, "rect": rect}
+    if stream is not None:
+        if stream not in STREAM_MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail="stream must be 'ndjson' or 'sse'")
+        records = [_stream_record(stream, "places", {"places": places}), _stream_record(stream, "summary", summary)]
+        return StreamingResponse(iter(records), media_type=STREAM_MEDIA_TYPES[stream])
+    return json_response({"places": places, **summary})
+
+
+def _attach_conditions(places: List[dict], index: StationIndex) -> List[dict]:
+    # 최근접 관측소의 수온·파고와 장소 좌표에서 보간한 조류
+    index.attach_nearest_conditions(places)
+    return tidal_currents.attach(places)
+
+
+def _place_clusters_payload(places: List[dict], level: int) -> dict:
+    # 장소 검색 결과는 요청마다 다르므로 결과 목록으로 바로 한 번 집계 (활동 태그별 개수 포함)
+    index = GridClusterIndex(places, lon_key="x", lat_key="y", tags_key="activities")
+    return _clusters_payload(index, level, None)
+
+
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _stream_record(fmt: str, record_type: str, payload: dict) -> str:
+    data = json.dumps({"type": record_type, **payload}, ensure_ascii=False)
+    if fmt == "sse":
+        return f"event: {record_type}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+async def _stream_places(
+    fmt: str,
+    kakao: KakaoLocalClient,
+    client: httpx.AsyncClient,
+    kma_client: httpx.AsyncClient,
+    rect: str,
+    activity_list: List[str],
+    with_conditions: bool,
+    complete: bool = False,
+    region: str | None = None,
+):
+    """키워드 검색이 끝나는 대로 중복 제거된 장소 묶음을 내보내고, 마지막에 요약 레코드를 보냄"""
+    count = 0
+    try:
+        index = await _station_index(kma_client) if with_conditions else None
+        async for batch in kakao.iter_places_in_rect(
+            client, rect, activity_list, None if complete else 45, ordered=False
+        ):
+            batch = _in_region(batch, region, lat_key="y", lon_key="x")
+            if not batch:
+                continue
+            if index is not None:
+                _attach_conditions(batch, index)
+            count += len(batch)
+            yield _stream_record(fmt, "places", {"places": batch})
+    except Exception as e:
+        logger.exception("Streaming place search failed")
+        yield _stream_record(fmt, "error", {"detail": f"Search failed: {str(e)}"})
+    yield _stream_record(fmt, "summary", {
+        "count": count, "activities": activity_list, "rect": rect, "plan": plan_keyword_searches(activity_list).stats(),
+    })
@@ -0,0 +1,242 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import METRICS_SERVER_TIMING
+
+# 지연 히스토그램 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = _labels(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in self._values.items()]
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str):
+        self._values[_labels(labels)] = value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name, self.help = name, help
+        self.buckets = tuple(buckets)
+        # 라벨별 [버킷별 개수..., +Inf 개수], 합계
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = _labels(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {self._sums[key]!r}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    의존성 없이 Prometheus 텍스트 형식으로 내보내는 프로세스 내 지표 모음.
+    캐시 적중률처럼 다른 객체가 이미 세고 있는 값은 collector 콜백으로 스크랩 시점에 읽음
+    """
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]] = []
+
+    def counter(self, name: str, help: str) -> Counter:
+        metric = Counter(name, help)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        metric = Gauge(name, help)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn: Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]):
+        """(이름, 타입, 설명, 라벨, 값) 을 내는 콜백 등록"""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines += metric.render()
+        described = set()
+        for fn in self._collectors:
+            for name, kind, help, labels, value in fn():
+                if name not in described:
+                    described.add(name)
+                    lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                lines.append(f"{name}{_format_labels(_labels(labels))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter("http_requests_total", "API requests by route and status")
+http_request_duration = metrics.histogram("http_request_duration_seconds", "API request latency by route")
+http_in_flight = metrics.gauge("http_requests_in_flight", "API requests currently being handled")
+upstream_requests = metrics.counter("upstream_requests_total", "Upstream HTTP requests by upstream and status")
+upstream_duration = metrics.histogram("upstream_request_duration_seconds", "Upstream HTTP latency by upstream")
+upstream_in_flight = metrics.gauge("upstream_requests_in_flight", "Upstream HTTP requests currently in flight")
+
+
+# 요청별 구간 측정 (Server-Timing). 미들웨어가 요청마다 dict 를 넣어 두고 span()/업스트림 훅이 시간을 더함
+_spans: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("server_timing_spans", default=None)
+
+
+def record_span(name: str, seconds: float):
+    spans = _spans.get()
+    if spans is not None:
+        entry = spans.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """with span("search"): ... 구간 시간을 현재 요청의 Server-Timing 에 추가"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+
+def _server_timing(spans: Dict[str, List[float]], total: float) -> str:
+    parts = [f'{name};dur={seconds * 1000:.1f};desc="{count}x"' for name, (seconds, count) in spans.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """
+    라우트 템플릿별 요청 수·지연·처리 중 요청 수를 집계하는 ASGI 미들웨어.
+    server_timing=True 면 응답에 Server-Timing 헤더(업스트림별·구간별 시간)를 붙임
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = METRICS_SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = "500"
+        token = _spans.set({}) if self.server_timing else None
+        http_in_flight.inc()
+
+        async def send_with_metrics(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                if token is not None:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", _server_timing(_spans.get() or {}, time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            http_in_flight.dec()
+            # 경로 그대로 쓰면 지점 ID 등으로 라벨이 끝없이 늘어나므로 라우트 템플릿 사용
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_requests.inc(route=route, method=scope["method"], status=status)
+            http_request_duration.observe(time.perf_counter() - start, route=route)
+            if token is not None:
+                _spans.reset(token)
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    업스트림별 지연·상태·처리 중 요청 수를 집계하는 httpx 전송 래퍼 (응답 헤더 수신까지의 시간).
+    이벤트 훅과 달리 연결 실패 같은 예외도 error 상태로 집계됨
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, upstream: str):
+        self.inner = inner
+        self.upstream = upstream
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        status = "error"
+        upstream_in_flight.inc(upstream=self.upstream)
+        try:
+            response = await self.inner.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            upstream_in_flight.dec(upstream=self.upstream)
+            upstream_requests.inc(upstream=self.upstream, status=status)
+            upstream_duration.observe(elapsed, upstream=self.upstream)
+            record_span(self.upstream, elapsed)
+
+    async def aclose(self):
+        await self.inner.aclose()
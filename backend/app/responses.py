@@ -0,0 +1,177 @@
+import gzip
+import json
+import zlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 스트리밍 응답은 청크 단위로 바로 보내야 하므로 압축하지 않음
+STREAMING_MEDIA_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def json_bytes(payload: Any) -> bytes:
+    """JSON 직렬화 (orjson 이 설치돼 있으면 사용)"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(payload: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """pydantic 검증 없이 이미 정리된 dict 를 바로 직렬화해서 응답"""
+    return Response(content=json_bytes(payload), status_code=status_code, media_type="application/json", headers=headers)
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Accept-Encoding 헤더를 {인코딩: q 값} 으로 파싱 (q 가 없으면 1, 잘못된 q 는 0 으로 봄)"""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, *params = (item.strip() for item in part.split(";"))
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Accept-Encoding 헤더로 응답 인코딩을 고름. q=0 은 거부로 보고, q 가 같으면 br(설치된 경우) 을 우선함.
+    명시되지 않은 인코딩은 * 의 q 를 따름
+    """
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    candidates = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class CachedJSONBody:
+    """
+    한 번 직렬화한 JSON 본문과 압축본, ETag/Last-Modified 를 데이터가 바뀔 때까지 재사용하기 위한 캐시 항목.
+    ETag 는 관측 시각과 본문 CRC 로 만들어서, 같은 데이터로 다시 갱신돼도 값이 바뀌지 않음
+    """
+
+    def __init__(self, payload: Any, modified_at: Optional[datetime] = None, tag: str = ""):
+        self.body = json_bytes(payload)
+        self.etag = f'"{tag}-{zlib.crc32(self.body):08x}"' if tag else f'"{zlib.crc32(self.body):08x}"'
+        self.last_modified = format_datetime(modified_at.astimezone(timezone.utc), usegmt=True) if modified_at else None
+        self._modified_at = modified_at
+        self._compressed: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.body
+        body = self._compressed.get(encoding)
+        if body is None:
+            body = self._compressed[encoding] = compress(self.body, encoding)
+        return body
+
+    def not_modified(self, request: Request) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return self.etag in tags or "*" in tags
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self._modified_at is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return self._modified_at.replace(microsecond=0) <= since
+        return False
+
+    def response(self, request: Request, headers: Optional[Dict[str, str]] = None) -> Response:
+        """조건부 요청이면 304, 아니면 협상된 인코딩의 캐시된 본문으로 응답"""
+        response_headers = {"ETag": self.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if self.last_modified:
+            response_headers["Last-Modified"] = self.last_modified
+        response_headers.update(headers or {})
+        if self.not_modified(request):
+            return Response(status_code=304, headers=response_headers)
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+        if encoding is not None:
+            response_headers["Content-Encoding"] = encoding
+        return Response(content=self.encoded(encoding), media_type="application/json", headers=response_headers)
+
+
+class CompressionMiddleware:
+    """
+    한 번에 전송되는 응답 본문을 brotli(설치된 경우) 또는 gzip 으로 압축하는 미들웨어.
+    이미 Content-Encoding 이 있거나 스트리밍(SSE/NDJSON, 여러 청크) 응답은 그대로 통과시킴
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                passthrough = "content-encoding" in headers or headers.get("content-type", "").startswith(STREAMING_MEDIA_TYPES)
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            if start_message is not None:
+                body = message.get("body", b"")
+                headers = MutableHeaders(raw=start_message["headers"])
+                if not message.get("more_body", False) and len(body) >= self.minimum_size:
+                    body = compress(body, encoding)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    headers.add_vary_header("Accept-Encoding")
+                    message = {**message, "body": body}
+                else:
+                    passthrough = True
+                await send(start_message)
+                start_message = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
 from datetime import datetime
 
 class ConditionResponse(BaseModel):
@@ -8,9 +8,32 @@ class ConditionResponse(BaseModel):
     lon: float
     sst: Optional[float] = None
     wave_height: Optional[float] = None
+    # KHOA 수치조류도 보간값 (유속은 기관 응답 단위 그대로, 유향은 흘러가는 방향 °, 예보 시각 KST)
     current_speed: Optional[float] = None
+    current_dir: Optional[float] = None
+    current_time: Optional[str] = None
     observed_at: Optional[str] = None
     source: str = "KMA"
+    region: Optional[str] = None  # 시도 (korea_sido_simple.json 기준)
+    # 일괄 조회(/api/conditions/batch) 에서 응답한 관측소와 요청 좌표까지의 거리
+    station_id: Optional[str] = None
+    distance_km: Optional[float] = None
+
+class ConditionPoint(BaseModel):
+    lat: float
+    lon: float
+
+class ConditionsBatchRequest(BaseModel):
+    station_ids: List[str] = Field(default_factory=list, max_length=500)
+    points: List[ConditionPoint] = Field(default_factory=list, max_length=500)
+    tm: Optional[str] = None  # KST 시각 YYYYMMDDHHMM (없으면 최신 스냅샷)
+    region: Optional[str] = None  # 시도 이름. 지정하면 다른 시도의 지점·좌표는 null
+
+class ConditionsBatchResponse(BaseModel):
+    # 요청 순서와 같은 순서. 찾지 못한 지점은 null
+    stations: List[Optional[ConditionResponse]]
+    points: List[Optional[ConditionResponse]]
+    observed_at: Optional[str] = None
 
 class PlaceResponse(BaseModel):
     id: str
@@ -27,9 +50,22 @@ class PlaceResponse(BaseModel):
     source: str
     collected_at: Optional[str] = None
     search_keyword: str
+    region: Optional[str] = None  # 시도 (korea_sido_simple.json 기준)
+    # 같은 장소가 여러 요청 활동의 키워드에 걸리면 모든 활동 (activity 는 그중 첫 번째)
+    activities: Optional[List[str]] = None
+    # with_conditions=true 일 때 최근접 관측소 정보
+    nearest_station_id: Optional[str] = None
+    station_distance_km: Optional[float] = None
+    sst: Optional[float] = None
+    wave_height: Optional[float] = None
+    current_speed: Optional[float] = None
+    current_dir: Optional[float] = None
+    current_time: Optional[str] = None
 
 class PlacesInRectResponse(BaseModel):
     places: List[PlaceResponse]
     count: int
     activities: List[str]
-    rect: str
\ No newline at end of file
+    rect: str
+    # 활동 간 겹치는 키워드를 합친 검색 계획 (keyword_searches, unique_keywords, searches_saved)
+    plan: Optional[Dict[str, int]] = None
\ No newline at end of file
@@ -0,0 +1,235 @@
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import CACHE_BACKEND, CACHE_DB_PATH, PLACE_CACHE_MAX_ENTRIES
+from ..responses import json_bytes
+
+
+# 고정 항목은 만료되고도 이 시간(초)이 지나야 지움 (allow_stale 조회용으로 남겨 둠)
+PINNED_STALE_GRACE = 24 * 3600
+
+
+class CacheBackend(ABC):
+    """
+    업스트림 결과 캐시 저장소 인터페이스 (문자열 키 -> JSON 으로 표현 가능한 값, 만료 시각 포함).
+    shared=True 인 구현은 여러 uvicorn 워커가 같은 저장소를 보므로 리더 임대(lease)도 의미가 있고,
+    blocking=True 인 구현은 디스크·잠금을 기다릴 수 있어 이벤트 루프 밖(스레드)에서 호출해야 함
+    """
+
+    shared = False
+    blocking = False
+
+    @abstractmethod
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """만료되지 않은 값을 반환. allow_stale=True 면 만료됐어도 남아 있으면 반환"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float, pinned: bool = False):
+        """
+        값 저장. pinned=True 면 항목 수 정리(max_entries)에서 빼고 따로 보관함
+        (공유 스냅샷·조류 격자처럼 키가 몇 개뿐이고 타일 캐시에 밀려나면 안 되는 값)
+        """
+
+    @abstractmethod
+    def clear(self, prefix: str = ""):
+        ...
+
+    @abstractmethod
+    def count(self, prefix: str = "") -> int:
+        ...
+
+    @abstractmethod
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """name 임대를 owner 가 ttl 초 동안 잡거나 연장. 다른 owner 의 임대가 살아 있으면 False"""
+
+    @abstractmethod
+    def release_lease(self, name: str, owner: str):
+        ...
+
+    def close(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """프로세스 내 LRU 캐시 (기본값, 워커마다 따로 가짐)"""
+
+    def __init__(self, max_entries: int = PLACE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._pinned: Dict[str, Tuple[float, Any]] = {}
+        self._leases: Dict[str, Tuple[str, float]] = {}
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        else:
+            entry = self._pinned.get(key)
+        if entry is None or (not allow_stale and time.time() > entry[0]):
+            return None
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float, pinned: bool = False):
+        now = time.time()
+        if pinned:
+            self._pinned[key] = (now + ttl, value)
+            for old in [k for k, (expires_at, _) in self._pinned.items() if expires_at < now - PINNED_STALE_GRACE]:
+                del self._pinned[old]
+            return
+        self._entries[key] = (now + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self, prefix: str = ""):
+        for entries in (self._entries, self._pinned):
+            for key in [k for k in entries if k.startswith(prefix)]:
+                del entries[key]
+
+    def count(self, prefix: str = "") -> int:
+        return sum(1 for entries in (self._entries, self._pinned) for key in entries if key.startswith(prefix))
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        current = self._leases.get(name)
+        now = time.time()
+        if current is not None and current[0] != owner and current[1] > now:
+            return False
+        self._leases[name] = (owner, now + ttl)
+        return True
+
+    def release_lease(self, name: str, owner: str):
+        if self._leases.get(name, ("",))[0] == owner:
+            del self._leases[name]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at);
+-- 항목 수 정리에서 빠지는 고정 항목 (공유 스냅샷, 조류 격자)
+CREATE TABLE IF NOT EXISTS pinned (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    같은 호스트의 워커들이 공유하는 SQLite(WAL) 캐시.
+    다른 워커가 쓰는 중이면 최대 5초까지 잠금을 기다리므로 호출자는 스레드에서 부름 (blocking).
+    항목 수가 max_entries 를 넘으면 만료가 가까운 항목부터 정리함 (set 이 prune_every 번 쌓일 때마다, 고정 항목 제외)
+    """
+
+    shared = True
+    blocking = True
+
+    def __init__(self, path: str = CACHE_DB_PATH, max_entries: int = PLACE_CACHE_MAX_ENTRIES, prune_every: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._sets = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            # 다른 워커가 쓰는 중이면 잠시 기다림
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM cache WHERE key = ? "
+                "UNION ALL SELECT value, expires_at FROM pinned WHERE key = ?",
+                (key, key),
+            ).fetchone()
+        if row is None or (not allow_stale and time.time() > row[1]):
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float, pinned: bool = False):
+        table = "pinned" if pinned else "cache"
+        with self._lock:
+            conn = self._connection()
+            conn.execute(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?)", (key, json_bytes(value), time.time() + ttl))
+            self._sets += 1
+            if self._sets % self.prune_every == 0:
+                self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection):
+        excess = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at LIMIT ?)", (excess,)
+            )
+        conn.execute("DELETE FROM pinned WHERE expires_at < ?", (time.time() - PINNED_STALE_GRACE,))
+
+    def clear(self, prefix: str = ""):
+        with self._lock:
+            conn = self._connection()
+            for table in ("cache", "pinned"):
+                conn.execute(f"DELETE FROM {table} WHERE key >= ? AND key < ?", (prefix, prefix + "￿"))
+
+    def count(self, prefix: str = "") -> int:
+        with self._lock:
+            conn = self._connection()
+            return sum(
+                conn.execute(f"SELECT COUNT(*) FROM {table} WHERE key >= ? AND key < ?", (prefix, prefix + "￿")).fetchone()[0]
+                for table in ("cache", "pinned")
+            )
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            # 임대가 없거나, 내 것이거나, 만료됐을 때만 가져옴 (한 문장이라 워커 간 경쟁에도 원자적)
+            conn.execute(
+                "INSERT INTO leases VALUES (?, ?, ?) ON CONFLICT (name) DO UPDATE "
+                "SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                (name, owner, now + ttl, now),
+            )
+            row = conn.execute("SELECT owner FROM leases WHERE name = ?", (name,)).fetchone()
+        return row is not None and row[0] == owner
+
+    def release_lease(self, name: str, owner: str):
+        with self._lock:
+            self._connection().execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+
+def make_cache_backend(kind: str = CACHE_BACKEND) -> CacheBackend:
+    """CACHE_BACKEND 설정(memory | sqlite)에 맞는 캐시 저장소 생성"""
+    if kind == "sqlite":
+        return SQLiteCacheBackend()
+    if kind != "memory":
+        raise ValueError(f"Unknown CACHE_BACKEND: {kind}")
+    return MemoryCacheBackend()
@@ -0,0 +1,119 @@
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..config import CLUSTER_BASE_CELL_DEG, CLUSTER_MIN_LEVEL, CLUSTER_MAX_LEVEL
+from .place_cache import Rect
+
+Cell = Tuple[int, int]
+
+
+def clamp_level(level: int) -> int:
+    return min(max(level, CLUSTER_MIN_LEVEL), CLUSTER_MAX_LEVEL)
+
+
+def cell_size_for_level(level: int) -> float:
+    """카카오맵 레벨의 클러스터 격자 크기(도). 레벨이 1 오를 때마다 2배"""
+    return CLUSTER_BASE_CELL_DEG * 2 ** (clamp_level(level) - 1)
+
+
+class _Cluster:
+    __slots__ = ("count", "sum_lat", "sum_lon", "min_lon", "min_lat", "max_lon", "max_lat", "tags", "first_id")
+
+    def __init__(self, lat: float, lon: float, item_id: Any, tags: Iterable[str]):
+        self.count = 1
+        self.sum_lat, self.sum_lon = lat, lon
+        self.min_lon, self.min_lat, self.max_lon, self.max_lat = lon, lat, lon, lat
+        self.tags = Counter(tags)
+        self.first_id = item_id
+
+    def merge(self, other: "_Cluster"):
+        self.count += other.count
+        self.sum_lat += other.sum_lat
+        self.sum_lon += other.sum_lon
+        self.min_lon = min(self.min_lon, other.min_lon)
+        self.min_lat = min(self.min_lat, other.min_lat)
+        self.max_lon = max(self.max_lon, other.max_lon)
+        self.max_lat = max(self.max_lat, other.max_lat)
+        self.tags.update(other.tags)
+
+    def copy(self) -> "_Cluster":
+        cluster = _Cluster.__new__(_Cluster)
+        for name in _Cluster.__slots__:
+            setattr(cluster, name, getattr(self, name))
+        cluster.tags = Counter(self.tags)
+        return cluster
+
+    def overlaps(self, rect: Rect) -> bool:
+        min_x, min_y, max_x, max_y = rect
+        return self.max_lon >= min_x and self.min_lon <= max_x and self.max_lat >= min_y and self.min_lat <= max_y
+
+    def to_dict(self, top_tags: int) -> Dict[str, Any]:
+        cluster = {
+            "count": self.count,
+            "lat": round(self.sum_lat / self.count, 6),
+            "lon": round(self.sum_lon / self.count, 6),
+            "bbox": [self.min_lon, self.min_lat, self.max_lon, self.max_lat],
+        }
+        if self.tags:
+            cluster["top_activities"] = [{"activity": tag, "count": n} for tag, n in self.tags.most_common(top_tags)]
+        if self.count == 1:
+            cluster["id"] = self.first_id
+        return cluster
+
+
+class GridClusterIndex:
+    """
+    줌 레벨별 격자 클러스터를 미리 계산해 두는 계층 색인.
+    가장 촘촘한 레벨에서 점을 격자 칸에 모은 뒤, 위 레벨은 아래 레벨의 2x2 칸을 합쳐 만듦 (점을 다시 보지 않음).
+    items 는 dict 목록이며 좌표·id·태그(활동 목록) 키를 지정함
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Dict[str, Any]],
+        lon_key: str = "lon",
+        lat_key: str = "lat",
+        id_key: str = "id",
+        tags_key: Optional[str] = None,
+    ):
+        finest: Dict[Cell, _Cluster] = {}
+        size = cell_size_for_level(CLUSTER_MIN_LEVEL)
+        self.total = 0
+        for item in items:
+            lon, lat = item.get(lon_key), item.get(lat_key)
+            if lon is None or lat is None or lon != lon or lat != lat:
+                continue
+            self.total += 1
+            tags = (item.get(tags_key) or ()) if tags_key else ()
+            if isinstance(tags, str):
+                tags = (tags,)
+            cluster = _Cluster(lat, lon, item.get(id_key), tags)
+            cell = (math.floor(lon / size), math.floor(lat / size))
+            existing = finest.get(cell)
+            if existing is None:
+                finest[cell] = cluster
+            else:
+                existing.merge(cluster)
+
+        self._levels: Dict[int, Dict[Cell, _Cluster]] = {CLUSTER_MIN_LEVEL: finest}
+        below = finest
+        for level in range(CLUSTER_MIN_LEVEL + 1, CLUSTER_MAX_LEVEL + 1):
+            cells: Dict[Cell, _Cluster] = {}
+            for (cx, cy), child in below.items():
+                parent = (cx // 2, cy // 2)
+                existing = cells.get(parent)
+                if existing is None:
+                    cells[parent] = child.copy()
+                else:
+                    existing.merge(child)
+            self._levels[level] = below = cells
+
+    def clusters(self, level: int, rect: Optional[Rect] = None, top_tags: int = 3) -> List[Dict[str, Any]]:
+        """레벨의 클러스터 목록. rect 를 주면 bbox 가 영역과 겹치는 클러스터만"""
+        cells = self._levels[clamp_level(level)]
+        return [
+            cluster.to_dict(top_tags)
+            for cluster in cells.values()
+            if rect is None or cluster.overlaps(rect)
+        ]
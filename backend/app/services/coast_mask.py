@@ -0,0 +1,174 @@
+"""
+해안 근접 마스크: 해안선(육지 다각형)에서 만든 거친 거리 래스터로 내륙 영역을 걸러냄.
+
+    python -m app.services.coast_mask build   # COASTLINE_PATH 로 COAST_MASK_PATH 래스터 생성
+
+래스터는 격자 칸마다 "바다까지의 거리(km, 0 = 바다, 255 에서 포화)"를 1바이트로 저장하며,
+칸 안 어느 지점이든 실제 거리보다 작게 잡히도록(보수적으로) 만들어 해안 장소를 잘못 빼지 않음
+"""
+import argparse
+import base64
+import json
+import logging
+import math
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..config import COASTLINE_PATH, COAST_MASK_PATH, COAST_MAX_DISTANCE_KM, PLACE_INDEX_BOUNDS
+from .place_cache import Rect, parse_rect
+from .regions import Ring, load_regions, point_in_ring
+
+logger = logging.getLogger(__name__)
+
+KM_PER_DEG = 111.0
+MAX_DISTANCE_KM = 255  # 1바이트 포화값
+
+
+def _segment_distance_km(lon: float, lat: float, a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """점과 선분 사이 거리 (위도에 맞춰 경도를 줄인 평면 근사)"""
+    kx = KM_PER_DEG * math.cos(math.radians(lat))
+    ax, ay = (a[0] - lon) * kx, (a[1] - lat) * KM_PER_DEG
+    bx, by = (b[0] - lon) * kx, (b[1] - lat) * KM_PER_DEG
+    dx, dy = bx - ax, by - ay
+    length = dx * dx + dy * dy
+    t = 0.0 if length == 0 else min(1.0, max(0.0, -(ax * dx + ay * dy) / length))
+    return math.hypot(ax + t * dx, ay + t * dy)
+
+
+class CoastMask:
+    """bounds 를 cell_deg 격자로 나눈 바다까지 거리(km) 래스터"""
+
+    def __init__(self, bounds: Rect, cell_deg: float, width: int, height: int, distances: bytes):
+        self.bounds = bounds
+        self.cell_deg = cell_deg
+        self.width = width
+        self.height = height
+        self.distances = distances  # 행(남 -> 북) 우선, 칸당 1바이트
+
+    @classmethod
+    def build(cls, land: Sequence[Ring], bounds: Rect, cell_deg: float = 0.05) -> "CoastMask":
+        """
+        육지 고리 목록으로 래스터 생성. 칸 중심이 바다면 0, 육지면 가장 가까운 해안선 선분까지의 거리에서
+        칸 반대각선 길이를 뺀 값 (래스터 밖으로 완전히 벗어난 선분은 육지를 닫으려고 그은 선이라 해안으로 보지 않음)
+        """
+        min_lng, min_lat, max_lng, max_lat = bounds
+        width = math.ceil(round((max_lng - min_lng) / cell_deg, 6))
+        height = math.ceil(round((max_lat - min_lat) / cell_deg, 6))
+        segments = [
+            (ring[i - 1], ring[i])
+            for ring in land
+            for i in range(1, len(ring))
+            if not (min(ring[i - 1][1], ring[i][1]) > max_lat or max(ring[i - 1][1], ring[i][1]) < min_lat)
+        ]
+        distances = bytearray(width * height)
+        for iy in range(height):
+            lat = min_lat + (iy + 0.5) * cell_deg
+            half_diagonal = 0.5 * cell_deg * KM_PER_DEG * math.hypot(1.0, math.cos(math.radians(lat)))
+            for ix in range(width):
+                lon = min_lng + (ix + 0.5) * cell_deg
+                if not any(point_in_ring(lon, lat, ring) for ring in land):
+                    continue
+                nearest = min((_segment_distance_km(lon, lat, a, b) for a, b in segments), default=0.0)
+                distances[iy * width + ix] = min(MAX_DISTANCE_KM, max(0, math.floor(nearest - half_diagonal)))
+        return cls(bounds, cell_deg, width, height, bytes(distances))
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {
+            "bounds": list(self.bounds),
+            "cell_deg": self.cell_deg,
+            "width": self.width,
+            "height": self.height,
+            "distance_km": base64.b64encode(self.distances).decode("ascii"),
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "CoastMask":
+        distances = base64.b64decode(payload["distance_km"])
+        if len(distances) != payload["width"] * payload["height"]:
+            raise ValueError("coast mask size does not match its dimensions")
+        return cls(tuple(payload["bounds"]), payload["cell_deg"], payload["width"], payload["height"], distances)
+
+    def _column(self, lon: float) -> int:
+        return math.floor((lon - self.bounds[0]) / self.cell_deg)
+
+    def _row(self, lat: float) -> int:
+        return math.floor((lat - self.bounds[1]) / self.cell_deg)
+
+    def distance_km(self, lat: float, lon: float) -> Optional[int]:
+        """좌표가 든 칸의 바다까지 거리 하한 (래스터 밖이면 None)"""
+        ix, iy = self._column(lon), self._row(lat)
+        if not (0 <= ix < self.width and 0 <= iy < self.height):
+            return None
+        return self.distances[iy * self.width + ix]
+
+    def is_coastal(self, rect: Rect, max_km: float) -> bool:
+        """영역과 겹치는 칸 중 하나라도 바다에서 max_km 이내면 True (래스터를 벗어나는 영역도 True)"""
+        min_lng, min_lat, max_lng, max_lat = rect
+        x0, x1 = self._column(min_lng), self._column(max_lng)
+        y0, y1 = self._row(min_lat), self._row(max_lat)
+        if x0 < 0 or y0 < 0 or x1 >= self.width or y1 >= self.height:
+            return True
+        for iy in range(y0, y1 + 1):
+            start = iy * self.width
+            if min(self.distances[start + x0:start + x1 + 1]) <= max_km:
+                return True
+        return False
+
+
+def _land_rings(path: str) -> List[Ring]:
+    return [polygon[0] for region in load_regions(path) for polygon in region.polygons]
+
+
+def load_coast_mask(path: str = COAST_MASK_PATH) -> Optional[CoastMask]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return CoastMask.from_payload(json.load(f))
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Coast mask not loaded from %s: %s", path, e)
+        return None
+
+
+@lru_cache(maxsize=1)
+def default_coast_mask() -> Optional[CoastMask]:
+    """미리 만든 래스터. 없으면 해안선 파일에서 바로 만들고, 그것도 없으면 None (마스크 없이 동작)"""
+    mask = load_coast_mask()
+    if mask is None:
+        land = _land_rings(COASTLINE_PATH)
+        if land:
+            logger.warning("Building coast mask from %s at startup; run `python -m app.services.coast_mask build`", COASTLINE_PATH)
+            mask = CoastMask.build(land, parse_rect(PLACE_INDEX_BOUNDS))
+    return mask
+
+
+def coastal_rect_filter(max_km: float = COAST_MAX_DISTANCE_KM) -> Optional[Callable[[Rect], bool]]:
+    """영역이 해안 근처인지 판정하는 함수 (마스크가 꺼져 있거나 없으면 None)"""
+    if max_km <= 0:
+        return None
+    mask = default_coast_mask()
+    if mask is None:
+        return None
+    return lambda rect: mask.is_coastal(rect, max_km)
+
+
+def _main(args):
+    land = _land_rings(args.coastline)
+    if not land:
+        raise SystemExit(f"No land polygons in {args.coastline}")
+    mask = CoastMask.build(land, parse_rect(args.bounds), args.cell_deg)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({**mask.to_payload(), "source": os.path.basename(args.coastline)}, f)
+        f.write("\n")
+    coastal = sum(1 for d in mask.distances if d <= COAST_MAX_DISTANCE_KM)
+    print(f"{mask.width}x{mask.height} cells, {coastal} within {COAST_MAX_DISTANCE_KM:g} km of the sea -> {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--coastline", default=COASTLINE_PATH, help="육지 다각형 GeoJSON")
+    parser.add_argument("--bounds", default=PLACE_INDEX_BOUNDS, help="래스터 영역 minLng,minLat,maxLng,maxLat")
+    parser.add_argument("--cell-deg", type=float, default=0.05, help="격자 크기(도)")
+    parser.add_argument("--output", default=COAST_MASK_PATH)
+    logging.basicConfig(level=logging.WARNING)
+    _main(parser.parse_args())
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+import httpx
+
+from ..config import (
+    HISTORY_DB_PATH,
+    HISTORY_GAP_CONCURRENCY,
+    HISTORY_MAX_GAP_FETCHES,
+    HISTORY_PUBLISH_DELAY_MINUTES,
+    HISTORY_STEP_MINUTES,
+)
+from .kma_client import SeaObsColumns, fetch_sea_obs_text, parse_sea_obs_columns
+from .single_flight import single_flight
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+TM_FORMAT = "%Y%m%d%H%M"
+
+# 저장하는 관측값 컬럼 (SeaObsColumns 컬럼명과 동일)
+_VALUE_COLUMNS = (
+    "lat", "lon", "sst", "wave_height", "wind_dir", "wind_speed",
+    "wind_gust", "air_temp", "pressure", "humidity",
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS observations (
+    station_id TEXT NOT NULL,
+    tm TEXT NOT NULL,
+    station_name TEXT,
+    tp TEXT,
+    {", ".join(f"{name} REAL" for name in _VALUE_COLUMNS)},
+    PRIMARY KEY (station_id, tm)
+) WITHOUT ROWID;
+-- tm 을 지정해 전체 지점을 조회한 적이 있는 시각 (이력 공백 판단용)
+CREATE TABLE IF NOT EXISTS fetched_times (
+    tm TEXT PRIMARY KEY
+) WITHOUT ROWID;
+"""
+
+
+class ObservationHistoryStore:
+    """
+    sea_obs 관측값을 (station_id, tm) 단위로 쌓는 SQLite 이력 저장소.
+    같은 관측 시각은 한 번만 저장되며 (INSERT OR IGNORE), DB 작업은 스레드에서 실행됨
+    """
+
+    def __init__(
+        self,
+        path: str = HISTORY_DB_PATH,
+        gap_concurrency: int = HISTORY_GAP_CONCURRENCY,
+        publish_delay_minutes: int = HISTORY_PUBLISH_DELAY_MINUTES,
+    ):
+        self.path = path
+        self.publish_delay = timedelta(minutes=publish_delay_minutes)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # 공백 채우기는 요청마다 stn=0 전체 응답을 받으므로 프로세스 전체 동시 조회 수를 제한
+        self._gap_slots = asyncio.Semaphore(max(1, gap_concurrency))
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def append(self, columns: SeaObsColumns, fetched_tm: str | None = None) -> int:
+        """관측 컬럼을 저장하고 새로 추가된 행 수를 반환. fetched_tm 은 tm 지정 조회였을 때의 시각"""
+        text = columns.text
+        rows = zip(
+            text["station_id"], text["observed_at"], text["station_name"], text["tp"],
+            *([None if v != v else v for v in columns.column(name)] for name in _VALUE_COLUMNS),
+        )
+        placeholders = ", ".join("?" * (4 + len(_VALUE_COLUMNS)))
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                before = conn.total_changes
+                conn.executemany(f"INSERT OR IGNORE INTO observations VALUES ({placeholders})", rows)
+                inserted = conn.total_changes - before
+                if fetched_tm:
+                    conn.execute("INSERT OR IGNORE INTO fetched_times VALUES (?)", (fetched_tm,))
+        return inserted
+
+    def query(self, station_id: str, from_tm: str, to_tm: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._connection().execute(
+                f"SELECT station_id, station_name, tm, tp, {', '.join(_VALUE_COLUMNS)} FROM observations "
+                "WHERE station_id = ? AND tm BETWEEN ? AND ? ORDER BY tm",
+                (station_id, from_tm, to_tm),
+            )
+            names = [d[0] for d in cursor.description]
+            rows = cursor.fetchall()
+        observations = []
+        for row in rows:
+            observation = dict(zip(names, row))
+            observation["observed_at"] = observation.pop("tm")
+            observation["source"] = "KMA"
+            observations.append(observation)
+        return observations
+
+    def fetched_times(self, from_tm: str, to_tm: str) -> Set[str]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT tm FROM fetched_times WHERE tm BETWEEN ? AND ?", (from_tm, to_tm)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    async def append_snapshot(self, snapshot) -> int:
+        """StationRefresher 리스너: 새 스냅샷을 이력에 추가"""
+        return await asyncio.to_thread(self.append, snapshot.columns)
+
+    async def history(
+        self,
+        client: httpx.AsyncClient,
+        station_id: str,
+        from_tm: str,
+        to_tm: str,
+        step_minutes: int = HISTORY_STEP_MINUTES,
+        max_gap_fetches: int = HISTORY_MAX_GAP_FETCHES,
+    ) -> Dict[str, Any]:
+        """
+        저장소에서 지점의 [from_tm, to_tm] 이력을 반환.
+        step_minutes 간격의 시각 중 이 지점 관측이 없고 아직 조회한 적 없는 시각만 최근 것부터 max_gap_fetches 개까지
+        KMA 에서 채우고, 남은 공백 수는 missing_gaps 로 알림
+        """
+        observations = await asyncio.to_thread(self.query, station_id, from_tm, to_tm)
+        have = {o["observed_at"] for o in observations}
+        fetched = await asyncio.to_thread(self.fetched_times, from_tm, to_tm)
+        gaps = [tm for tm in expected_times(from_tm, to_tm, step_minutes) if tm not in have and tm not in fetched]
+        missing = max(0, len(gaps) - max_gap_fetches)
+        gaps = gaps[missing:]  # 최근 시각부터 채움
+
+        if gaps:
+            results = await asyncio.gather(*(self._fill(client, tm) for tm in gaps))
+            if any(results):
+                observations = await asyncio.to_thread(self.query, station_id, from_tm, to_tm)
+        return {"observations": observations, "fetched_gaps": len(gaps), "missing_gaps": missing}
+
+    async def _fill(self, client: httpx.AsyncClient, tm: str) -> bool:
+        # 같은 시각을 채우는 요청이 겹치면 (다른 지점·기간이라도) 한 번만 조회·저장
+        return await single_flight.do(("history", "fill", tm), lambda: self._fetch_and_append(client, tm))
+
+    async def _fetch_and_append(self, client: httpx.AsyncClient, tm: str) -> bool:
+        try:
+            async with self._gap_slots:
+                text = await fetch_sea_obs_text(client, 0, tm)
+        except Exception as e:
+            logger.error("sea_obs history fetch failed for tm=%s: %s", tm, e)
+            return False
+        # 발표 지연보다 최근 시각은 아직 비어 있을 수 있으므로 조회한 시각으로 기록하지 않음
+        published = datetime.strptime(tm, TM_FORMAT) <= datetime.now(KST).replace(tzinfo=None) - self.publish_delay
+        await asyncio.to_thread(self.append, parse_sea_obs_columns(text), tm if published else None)
+        return True
+
+
+def expected_times(from_tm: str, to_tm: str, step_minutes: int) -> List[str]:
+    """from_tm 이후 step_minutes 격자에 맞춘 관측 시각 목록 (to_tm 포함)"""
+    start = datetime.strptime(from_tm, TM_FORMAT)
+    end = datetime.strptime(to_tm, TM_FORMAT)
+    step = timedelta(minutes=step_minutes)
+    # 격자(정시 등)에 맞춰 올림
+    offset = (start.hour * 60 + start.minute) % step_minutes
+    current = start + timedelta(minutes=(step_minutes - offset) % step_minutes)
+    times = []
+    while current <= end:
+        times.append(current.strftime(TM_FORMAT))
+        current += step
+    return times
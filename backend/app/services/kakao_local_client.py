@@ -1,10 +1,35 @@
 import httpx
 import asyncio
 import json
-from datetime import datetime
-from typing import List, Dict, Optional
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Callable, List, Dict, Optional
 import logging
 
+from ..config import (
+    KAKAO_BASE_URL,
+    KAKAO_MAX_RETRIES,
+    KAKAO_RETRY_BASE_DELAY,
+    KAKAO_RETRY_MAX_DELAY,
+    KAKAO_SUBDIVIDE_MAX_DEPTH,
+    KAKAO_SUBDIVIDE_MAX_REQUESTS,
+)
+from ..metrics import record_span
+from .rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    TokenBucket,
+    get_circuit_breaker,
+    get_concurrency_limiter,
+    get_rate_limiter,
+)
+from .single_flight import single_flight
+from .regions import default_region_index
+from .coast_mask import coastal_rect_filter
+from .place_cache import PlaceTileCache, Rect, Tile, parse_rect, format_rect, tiles_for_rect, tile_rect, ancestor_tiles, in_rect, rect_within
+
 logger = logging.getLogger(__name__)
 
 # 활동별 검색 키워드 맵
@@ -22,184 +47,541 @@ ACTIVITY_KEYWORDS = {
     "marine_info": ["해양관측소", "해양정보", "조위관측소", "해수욕장"]
 }
 
+# 키워드 -> 그 키워드를 쓰는 활동 목록 (ACTIVITY_KEYWORDS 순서 유지)
+KEYWORD_ACTIVITIES: Dict[str, List[str]] = {}
+for _activity, _keywords in ACTIVITY_KEYWORDS.items():
+    for _keyword in _keywords:
+        KEYWORD_ACTIVITIES.setdefault(_keyword, []).append(_activity)
+
+# 바다에서만 하는 활동. 카약·SUP·제트스키·낚시는 강·호수에서도 하므로 해안 마스크를 적용하지 않음
+SEA_ONLY_ACTIVITIES = frozenset({"surfing", "scuba", "snorkel", "freedive", "windsurf", "yacht", "beach", "marine_info"})
+# 바다에서만 하는 활동들만 쓰는 키워드 (해안 마스크 적용 대상)
+SEA_ONLY_KEYWORDS = frozenset(
+    keyword for keyword, activities in KEYWORD_ACTIVITIES.items()
+    if all(activity in SEA_ONLY_ACTIVITIES for activity in activities)
+)
+
+@dataclass
+class KeywordSearch:
+    keyword: str
+    activities: List[str]  # 이 키워드를 쓰는 요청 활동 (요청 순서)
+    max_results: Optional[int]
+
+
+@dataclass
+class KeywordPlan:
+    """요청한 활동들의 (활동, 키워드) 쌍을 중복 없는 키워드 검색 목록으로 합친 계획"""
+
+    searches: List[KeywordSearch] = field(default_factory=list)
+    requested: int = 0  # 활동별로 따로 검색했을 때의 (활동, 키워드) 검색 수
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "keyword_searches": self.requested,
+            "unique_keywords": len(self.searches),
+            "searches_saved": self.requested - len(self.searches),
+        }
+
+
+def plan_keyword_searches(activities: List[str], max_results_per_activity: Optional[int] = 45) -> KeywordPlan:
+    """
+    여러 활동에 겹치는 키워드(예: 해수욕장)는 한 번만 검색하도록 계획.
+    키워드별 결과 수는 그 키워드를 쓰는 활동들의 몫 중 가장 큰 값 (None 이면 제한 없음)
+    """
+    plan = KeywordPlan()
+    by_keyword: Dict[str, KeywordSearch] = {}
+    for activity in dict.fromkeys(activities):
+        if activity not in ACTIVITY_KEYWORDS:
+            continue
+            
+        keywords = ACTIVITY_KEYWORDS[activity]
+        per_keyword = None if max_results_per_activity is None else max_results_per_activity // len(keywords)
+        for keyword in keywords:
+            plan.requested += 1
+            search = by_keyword.get(keyword)
+            if search is None:
+                search = by_keyword[keyword] = KeywordSearch(keyword, [], per_keyword)
+                plan.searches.append(search)
+            elif search.max_results is not None:
+                search.max_results = None if per_keyword is None else max(search.max_results, per_keyword)
+            search.activities.append(activity)
+    return plan
+
+
 class KakaoLocalClient:
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        rate_limiter: Optional[TokenBucket] = None,
+        tile_cache: Optional[PlaceTileCache] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
         self.api_key = api_key
-        self.base_url = "https://dapi.kakao.com/v2/local/search/keyword.json"
+        self.base_url = f"{KAKAO_BASE_URL}/v2/local/search/keyword.json"
         self.headers = {"Authorization": f"KakaoAK {api_key}"}
+        # 같은 API 키를 쓰는 클라이언트끼리 하나의 토큰 버킷·동시 요청 한도·차단기를 공유
+        self.rate_limiter = rate_limiter or get_rate_limiter(api_key)
+        self.concurrency_limiter = concurrency_limiter or get_concurrency_limiter(api_key)
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(api_key)
+        # 지정하면 영역을 타일 단위로 나눠 (타일, 키워드) 결과를 캐시함
+        self.tile_cache = tile_cache
+        # 바다에서만 하는 활동의 키워드는 바다에서 COAST_MAX_DISTANCE_KM 보다 먼 영역·사분면을 요청하지 않음
+        # (None 이면 마스크 없이 영역 전체 검색)
+        self.coast_filter = coastal_rect_filter()
+        self.inland_skipped = 0
+        
+    def coast_filter_for(self, keyword: str) -> Optional[Callable[[Rect], bool]]:
+        """키워드에 적용할 해안 마스크 (강·호수에서도 하는 활동이 쓰는 키워드면 None)"""
+        return self.coast_filter if keyword in SEA_ONLY_KEYWORDS else None
         
     async def search_places_in_rect(
         self, 
         client: httpx.AsyncClient,
         rect: str,  # "minLng,minLat,maxLng,maxLat"
         activities: List[str],
-        max_results_per_activity: int = 45  # 3페이지 * 15개
+        max_results_per_activity: Optional[int] = 45  # 3페이지 * 15개
     ) -> List[Dict]:
         """
-        지정된 사각형 영역 내에서 활동별로 장소를 검색
+        지정된 사각형 영역 내에서 활동별로 장소를 검색.
+        max_results_per_activity=None 이면 영역을 분할해 가며 키워드별 결과를 모두 수집
         """
         all_places = []
-        seen_ids = set()
-        seen_locations = set()  # (name, phone) 조합으로 중복 체크
-        
+        async for batch in self.iter_places_in_rect(client, rect, activities, max_results_per_activity):
+            all_places.extend(batch)
+            
+        logger.debug("Found %d unique places for activities %s", len(all_places), activities)
+        return all_places
+    
+    async def iter_places_in_rect(
+        self,
+        client: httpx.AsyncClient,
+        rect: str,  # "minLng,minLat,maxLng,maxLat"
+        activities: List[str],
+        max_results_per_activity: Optional[int] = 45,
+        ordered: bool = True
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        요청한 활동들의 키워드를 중복 없이 한 번씩만 동시에 검색하고, 키워드 하나가 끝날 때마다
+        중복 제거된 장소 묶음을 반환. 장소의 activity 는 처음 일치한 활동, activities 는 일치한 모든 활동.
+        ordered=True 면 키워드 계획 순서대로 내보내 중복 제거 결과가 항상 같고,
+        False 면 먼저 끝난 키워드부터 내보냄 (스트리밍 응답용)
+        """
         for activity in activities:
             if activity not in ACTIVITY_KEYWORDS:
-                logger.warning(f"Unknown activity: {activity}")
-                continue
-                
-            keywords = ACTIVITY_KEYWORDS[activity]
-            activity_places = []
-            
-            logger.info(f"🔍 Searching for activity '{activity}' with keywords: {keywords}")
-            
-            for keyword in keywords:
-                try:
-                    logger.info(f"  🔎 Searching keyword: '{keyword}' in rect: {rect}")
-                    places = await self._search_by_keyword(
-                        client, keyword, rect, max_results_per_activity // len(keywords)
-                    )
-                    
-                    for place in places:
-                        # ID 기반 중복 제거
-                        if place["id"] in seen_ids:
-                            continue
-                            
-                        # 위치+이름 기반 중복 제거
-                        location_key = (place["name"], place.get("phone", ""))
-                        if location_key in seen_locations:
-                            continue
-                            
-                        # 활동 정보 추가 및 필드명 수정
-                        place["activity"] = activity
-                        place["search_keyword"] = keyword
-                        place["source"] = "kakao"
-                        place["collected_at"] = datetime.now().isoformat()
-                        
-                        # 스키마에 맞게 필드명 수정
-                        if "addr" in place:
-                            place["address"] = place.pop("addr")
-                        if "kakao_link" in place:
-                            place["place_url"] = place.pop("kakao_link")
-                        if "collectedAt" in place:
-                            place["collected_at"] = place.pop("collectedAt")
-                        
-                        # 누락된 필드 추가
-                        if "distance" not in place:
-                            place["distance"] = ""
-                        if "road_address" not in place:
-                            place["road_address"] = place.get("address", "")
-                        
-                        activity_places.append(place)
-                        seen_ids.add(place["id"])
-                        seen_locations.add(location_key)
+                logger.warning("Unknown activity: %s", activity)
+        plan = plan_keyword_searches(activities, max_results_per_activity)
+        searches = plan.searches
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Searching keywords %s for activities %s (%s)", [search.keyword for search in searches], activities, plan.stats())
+        
+        async def run(i: int, keyword: str, max_results: Optional[int]):
+            try:
+                return i, await self._search_keyword_in_rect(client, keyword, rect, max_results)
+            except Exception as e:
+                logger.error("Error searching for %s: %s", keyword, e)
+                return i, []
+        
+        # 업스트림 호출량은 토큰 버킷이 제어하므로 고정 sleep 없이 동시에 요청
+        tasks = [asyncio.ensure_future(run(i, search.keyword, search.max_results)) for i, search in enumerate(searches)]
+        seen_ids: Dict[str, Dict] = {}
+        seen_locations: Dict[tuple, Dict] = {}  # (name, phone) 조합으로 중복 체크
+        try:
+            for next_done in (tasks if ordered else asyncio.as_completed(tasks)):
+                i, places = await next_done
+                search = searches[i]
+                batch = []
+                for place in places:
+                    # ID 또는 위치+이름 기반 중복 제거. 이미 나온 장소에는 이 키워드의 활동만 추가
+                    location_key = (place["name"], place.get("phone", ""))
+                    existing = seen_ids.get(place["id"]) or seen_locations.get(location_key)
+                    if existing is not None:
+                        existing["activities"].extend(a for a in search.activities if a not in existing["activities"])
+                        continue
                         
-                    # API 레이트 제한 고려 - 더 긴 대기 시간
-                    await asyncio.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.error(f"Error searching for {keyword}: {e}")
-                    continue
-                    
-            all_places.extend(activity_places)
-            
-        logger.info(f"Found {len(all_places)} unique places for activities {activities}")
-        return all_places
+                    place = _normalize_place(place, search.activities[0], search.keyword)
+                    place["activities"] = list(search.activities)
+                    batch.append(place)
+                    seen_ids[place["id"]] = place
+                    seen_locations[location_key] = place
+                if batch:
+                    yield batch
+        finally:
+            # 소비자가 중간에 끊으면 (스트리밍 클라이언트 종료 등) 남은 요청 취소
+            for task in tasks:
+                task.cancel()
+    
+    async def _search_keyword_in_rect(
+        self,
+        client: httpx.AsyncClient,
+        keyword: str,
+        rect: str,
+        max_results: Optional[int]
+    ) -> List[Dict]:
+        """
+        타일 캐시를 거쳐 영역 내 키워드 검색 결과를 반환.
+        같은 영역의 이전 결과가 있거나, 영역을 덮는 고정 그리드 타일이 모두 캐시(타일 안 장소 전부, 더 큰 타일도 가능)에
+        있으면 카카오 호출 없이 응답하고, 아니면 영역을 그대로 검색함 (캐시가 없을 때와 같은 호출 수·결과).
+        그 검색이 영역의 장소를 빠짐없이 가져왔으면 영역 안에 완전히 들어가는 타일을 채워 둠
+        """
+        bounds = parse_rect(rect)
+        coast_filter = self.coast_filter_for(keyword)
+        if coast_filter is not None and not coast_filter(bounds):
+            self.inland_skipped += 1
+            return []
+        if self.tile_cache is None:
+            return await self._search_by_keyword(client, keyword, rect, max_results)
+        
+        # 페이지 단위로 받으므로 마지막 페이지까지 모두 남겨 두고 (호출 수는 같음) 반환할 때 자름
+        fetch = None if max_results is None else -(-max_results // 15) * 15
+        rect_key = ("rect", format_rect(bounds), keyword, fetch)
+        places = await self.tile_cache.get(rect_key)
+        if places is not None:
+            return [dict(p) for p in places[:max_results]]
+        
+        tiles = tiles_for_rect(bounds, keep=coast_filter)
+        sources = await self._cached_tiles(tiles, keyword)
+        if sources is not None:
+            return _merge_tiles(sources, bounds, max_results)
+        
+        budget = SubdivisionBudget()
+        places = await self._search_keyword_pages(client, keyword, rect, fetch, budget)
+        if places is None or budget.failed:
+            # 실패(차단기 열림·재시도 소진)하면 TTL 이 지난 결과라도 남아 있으면 사용
+            stale = await self.tile_cache.get_stale(rect_key)
+            if stale is not None:
+                return [dict(p) for p in stale[:max_results]]
+            if places is None:
+                return []
+        else:
+            # 캐시된 원본이 호출자의 수정에 영향받지 않도록 복사해 저장
+            entries = [(rect_key, [dict(p) for p in places])]
+            if not budget.truncated:
+                for tile in tiles:
+                    tile_bounds = tile_rect(tile)
+                    if rect_within(tile_bounds, bounds):
+                        entries.append(((tile, keyword), [dict(p) for p in places if in_rect(p, tile_bounds)]))
+            await self.tile_cache.set_many(entries)
+        return places if max_results is None else places[:max_results]
+    
+    async def _cached_tiles(self, tiles: List[Tile], keyword: str) -> Optional[Dict[Tile, List[Dict]]]:
+        """
+        타일마다 자신 또는 그것을 포함하는 더 큰 타일의 캐시 항목을 찾아 {캐시 타일: 장소} 로 반환.
+        하나라도 없으면 None
+        """
+        sources: Dict[Tile, List[Dict]] = {}
+        for tile in tiles:
+            candidates = (tile, *ancestor_tiles(tile))
+            if any(candidate in sources for candidate in candidates):
+                continue
+            found = await self.tile_cache.get_first((candidate, keyword) for candidate in candidates)
+            if found is None:
+                return None
+            sources[found[0][0]] = found[1]
+        return sources
     
     async def _search_by_keyword(
         self, 
         client: httpx.AsyncClient,
         keyword: str, 
         rect: str,
-        max_results: int = 15
+        max_results: Optional[int] = 15
     ) -> List[Dict]:
         """
         키워드로 장소 검색 (페이지네이션 지원)
+        max_results=None 이면 45개 상한을 넘는 영역을 4분할해 가며 영역 전체를 수집
+        """
+        return await self._search_keyword_pages(client, keyword, rect, max_results) or []
+    
+    async def _search_keyword_pages(
+        self,
+        client: httpx.AsyncClient,
+        keyword: str,
+        rect: str,
+        max_results: Optional[int] = 15,
+        budget: Optional["SubdivisionBudget"] = None,
+        depth: int = 0
+    ) -> Optional[List[Dict]]:
+        """
+        첫 페이지의 meta 로 남은 페이지 수를 계산한 뒤 나머지 페이지는 동시에 요청.
+        max_results=None (완전 수집) 이고 total_count 가 페이지 상한을 넘으면 남은 페이지 대신
+        영역을 4분할해 동시에 재귀 검색함 (깊이·요청 수 예산 안에서).
+        첫 페이지 요청이 실패하면 None 을 반환 (결과 없음과 구분)하고,
+        뒤 페이지나 사분면이 실패해 일부만 모았으면 budget.failed, 예산·결과 수·45개 상한 때문에
+        total_count 만큼 다 받지 못했으면 budget.truncated 를 표시함
+        (budget 을 넘긴 호출자만 알 수 있음)
         """
-        places = []
-        page = 1
         size = 15  # 카카오 API 최대값
+        max_pages = 3 if max_results is None else min(3, -(-max_results // size))  # 최대 3페이지
         
-        while len(places) < max_results and page <= 3:  # 최대 3페이지
-            params = {
-                "query": keyword,
-                "rect": rect,
-                "page": page,
-                "size": size
-            }
-            
+        first = await self._request_page(client, keyword, rect, 1, size)
+        if first is None:
+            return None
+        pages = [first]
+        
+        meta = first.get("meta", {})
+        if max_results is None and meta.get("total_count", 0) > max_pages * size:
+            budget = budget or SubdivisionBudget()
+            if depth < budget.max_depth and budget.take(4):
+                return await self._search_quadrants(client, keyword, rect, _documents_to_places(pages, keyword), budget, depth)
+            budget.truncated = True
+            if depth:
+                logger.warning("Subdivision budget exhausted for '%s' in %s; results may be truncated", keyword, rect)
+        
+        if first.get("documents") and not meta.get("is_end", True) and max_pages > 1:
+            pageable = meta.get("pageable_count") or max_pages * size
+            last_page = min(max_pages, -(-pageable // size))
+            if budget is not None and not budget.take(last_page - 1):
+                budget.truncated = True
+            else:
+                rest = await asyncio.gather(
+                    *(self._request_page(client, keyword, rect, page, size) for page in range(2, last_page + 1))
+                )
+                # 실패한 페이지 이후는 버림 (기존 순차 요청과 같은 결과 순서 유지)
+                for data in rest:
+                    if data is None and budget is not None:
+                        budget.failed = True
+                    if not data or not data.get("documents"):
+                        break
+                    pages.append(data)
+        
+        if budget is not None and not budget.truncated:
+            # is_end 는 45개 상한에 닿아도 true 이므로, 받은 문서 수와 total_count 를 비교해 영역의 장소를 다 받았는지 판단
+            collected = sum(len(page.get("documents") or []) for page in pages)
+            total = meta.get("total_count", collected)
+            if total > collected or total > meta.get("pageable_count", total):
+                budget.truncated = True
+        places = _documents_to_places(pages, keyword)
+        return places if max_results is None else places[:max_results]
+    
+    async def _search_quadrants(
+        self,
+        client: httpx.AsyncClient,
+        keyword: str,
+        rect: str,
+        first_places: List[Dict],
+        budget: "SubdivisionBudget",
+        depth: int
+    ) -> List[Dict]:
+        """영역을 4분할해 동시에 검색하고 상위 영역 첫 페이지 결과와 합쳐 id 로 중복 제거"""
+        min_lng, min_lat, max_lng, max_lat = parse_rect(rect)
+        mid_lng, mid_lat = (min_lng + max_lng) / 2, (min_lat + max_lat) / 2
+        quadrants = [
+            (min_lng, min_lat, mid_lng, mid_lat),
+            (mid_lng, min_lat, max_lng, mid_lat),
+            (min_lng, mid_lat, mid_lng, max_lat),
+            (mid_lng, mid_lat, max_lng, max_lat),
+        ]
+        coast_filter = self.coast_filter_for(keyword)
+        if coast_filter is not None:
+            # 내륙 사분면은 요청하지 않고, 미리 잡아 둔 예산은 돌려줘 해안 쪽을 더 깊이 나누는 데 씀
+            coastal = [q for q in quadrants if coast_filter(q)]
+            self.inland_skipped += len(quadrants) - len(coastal)
+            budget.remaining += len(quadrants) - len(coastal)
+            quadrants = coastal
+        results = await asyncio.gather(
+            *(self._search_keyword_pages(client, keyword, format_rect(q), None, budget, depth + 1) for q in quadrants)
+        )
+        if any(found is None for found in results):
+            budget.failed = True
+        places = []
+        seen_ids = set()
+        for found in [first_places, *results]:
+            for place in found or []:  # 실패한 사분면은 건너뜀 (budget.failed 로 호출자에 알림)
+                if place["id"] not in seen_ids:
+                    seen_ids.add(place["id"])
+                    places.append(place)
+        return places
+    
+    async def _request_page(
+        self,
+        client: httpx.AsyncClient,
+        keyword: str,
+        rect: str,
+        page: int,
+        size: int = 15
+    ) -> Optional[Dict]:
+        """
+        키워드 검색 한 페이지 요청. 실패 시 None 반환
+        같은 (키워드, 영역, 페이지) 요청이 동시에 들어오면 하나의 업스트림 호출 결과를 공유함
+        """
+        key = ("kakao", "keyword", keyword.strip(), format_rect(parse_rect(rect)), page, size)
+        return await single_flight.do(key, lambda: self._fetch_page(client, keyword, rect, page, size))
+    
+    async def _fetch_page(
+        self,
+        client: httpx.AsyncClient,
+        keyword: str,
+        rect: str,
+        page: int,
+        size: int
+    ) -> Optional[Dict]:
+        params = {
+            "query": keyword,
+            "rect": rect,
+            "page": page,
+            "size": size
+        }
+        
+        for attempt in range(KAKAO_MAX_RETRIES + 1):
+            if not self.circuit_breaker.allow():
+                # 업스트림이 포화 상태면 기다리지 않고 바로 실패 (타일 캐시가 있으면 지난 결과로 응답)
+                logger.warning("Kakao circuit open; skipping '%s' page %d", keyword, page)
+                return None
             try:
-                logger.info(f"🔥 API Request: {self.base_url} with params: {params}")
-                logger.info(f"🔥 Headers: {self.headers}")
+                record_span("rate_limit", await self.rate_limiter.acquire())
                 
-                response = await client.get(
-                    self.base_url,
-                    headers=self.headers,
-                    params=params,
-                    timeout=10.0
-                )
+                logger.debug("Kakao request: %s %s", self.base_url, params)
                 
-                logger.info(f"🔥 Response status: {response.status_code}")
-                logger.info(f"🔥 Response headers: {dict(response.headers)}")
+                async with self.concurrency_limiter:
+                    response = await client.get(
+                        self.base_url,
+                        headers=self.headers,
+                        params=params,
+                        timeout=10.0
+                    )
                 
                 response.raise_for_status()
                 
                 data = response.json()
-                documents = data.get("documents", [])
-                meta = data.get("meta", {})
-                
-                logger.info(f"🔥 API Response - Found {len(documents)} places, is_end: {meta.get('is_end', True)}")
-                
-                if not documents:
-                    break
-                    
-                for doc in documents:
-                    place = {
-                        "id": doc["id"],
-                        "name": doc["place_name"],
-                        "activity": keyword,  # 검색한 키워드로 활동 추정
-                        "category": doc["category_name"],
-                        "phone": doc.get("phone", ""),
-                        "address": doc.get("address_name", ""),
-                        "road_address": doc.get("road_address_name", ""),
-                        "x": float(doc["x"]),  # 경도
-                        "y": float(doc["y"]),  # 위도
-                        "place_url": doc.get("place_url", ""),
-                        "distance": "",  # 카카오 API에서는 거리 정보가 없으므로 빈 문자열
-                        "source": "kakao",
-                        "collected_at": datetime.now().isoformat(),
-                        "search_keyword": keyword
-                    }
-                    places.append(place)
-                    logger.info(f"  📍 {place['name']} at ({place['x']}, {place['y']})")
-                    
-                    if len(places) >= max_results:
-                        break
-                        
-                # 다음 페이지가 없으면 종료
-                meta = data.get("meta", {})
-                if meta.get("is_end", True):
-                    break
-                    
-                page += 1
-                await asyncio.sleep(0.05)  # 50ms 대기
+                self.concurrency_limiter.on_success()
+                self.circuit_breaker.record_success()
+                if logger.isEnabledFor(logging.DEBUG):
+                    meta = data.get("meta", {})
+                    logger.debug("Kakao response: %d places, is_end: %s", len(data.get("documents", [])), meta.get("is_end", True))
+                return data
                 
             except httpx.HTTPStatusError as e:
-                if e.response.status_code == 429:
-                    logger.warning("Rate limit exceeded, waiting longer...")
-                    await asyncio.sleep(5.0)  # 5초 대기
+                status = e.response.status_code
+                if status == 429 or status >= 500:
+                    self.concurrency_limiter.on_overload()
+                    self.circuit_breaker.record_failure()
+                    delay = _retry_delay(attempt, e.response.headers.get("Retry-After"))
+                    logger.warning("Kakao HTTP %s for '%s' page %d (attempt %d/%d)", status, keyword, page, attempt + 1, KAKAO_MAX_RETRIES + 1)
+                    if attempt < KAKAO_MAX_RETRIES:
+                        await asyncio.sleep(delay)
                     continue
-                elif e.response.status_code == 401:
-                    logger.error(f"Unauthorized: Invalid API key")
-                    break
-                elif e.response.status_code == 403:
-                    logger.error(f"Forbidden: API key permissions issue")
-                    break
+                # 키 문제 등은 업스트림 포화가 아니므로 차단기에는 성공으로 기록
+                self.circuit_breaker.record_success()
+                if status == 401:
+                    logger.error("Unauthorized: Invalid API key")
+                elif status == 403:
+                    logger.error("Forbidden: API key permissions issue")
                 else:
-                    logger.error(f"HTTP error {e.response.status_code}: {e}")
-                    logger.error(f"Response body: {e.response.text}")
-                    break
+                    logger.error("HTTP error %s: %s", status, e)
+                    logger.error("Response body: %s", e.response.text)
+                return None
+            except httpx.TransportError as e:
+                self.circuit_breaker.record_failure()
+                delay = _retry_delay(attempt, None)
+                logger.warning("Kakao request failed for '%s' page %d (attempt %d/%d): %s", keyword, page, attempt + 1, KAKAO_MAX_RETRIES + 1, e)
+                if attempt < KAKAO_MAX_RETRIES:
+                    await asyncio.sleep(delay)
             except Exception as e:
-                logger.error(f"Unexpected error: {e}")
-                break
-                
-        return places[:max_results]
+                self.circuit_breaker.record_success()
+                logger.error("Unexpected error: %s", e)
+                return None
+        logger.error("Kakao request for '%s' page %d failed after %d attempts", keyword, page, KAKAO_MAX_RETRIES + 1)
+        return None
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+    """Retry-After(초 또는 HTTP 날짜)가 있으면 따르고, 없으면 지수 백오프에 full jitter 적용"""
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0.0), KAKAO_RETRY_MAX_DELAY)
+    return random.uniform(0, min(KAKAO_RETRY_MAX_DELAY, KAKAO_RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def _normalize_place(place: Dict, activity: str, keyword: str) -> Dict:
+    """검색 결과를 PlaceResponse 스키마에 맞게 정리"""
+    # 활동 정보 추가 및 필드명 수정
+    place["activity"] = activity
+    place["search_keyword"] = keyword
+    place["source"] = "kakao"
+    place["collected_at"] = datetime.now().isoformat()
+    
+    # 스키마에 맞게 필드명 수정
+    if "addr" in place:
+        place["address"] = place.pop("addr")
+    if "kakao_link" in place:
+        place["place_url"] = place.pop("kakao_link")
+    if "collectedAt" in place:
+        place["collected_at"] = place.pop("collectedAt")
+    
+    # 누락된 필드 추가
+    if "distance" not in place:
+        place["distance"] = ""
+    if "road_address" not in place:
+        place["road_address"] = place.get("address", "")
+    return place
+
+
+class SubdivisionBudget:
+    """
+    4분할 재귀 검색 한 번에 쓸 수 있는 깊이와 업스트림 요청 수 예산.
+    검색 중 실패한 페이지·사분면이 있어 결과가 일부뿐이면 failed,
+    깊이·요청 수 예산(또는 max_results)이 모자라 영역의 장소를 다 받지 못했으면 truncated 가 True 가 됨
+    """
+
+    def __init__(self, max_depth: int = KAKAO_SUBDIVIDE_MAX_DEPTH, max_requests: int = KAKAO_SUBDIVIDE_MAX_REQUESTS):
+        self.max_depth = max_depth
+        self.remaining = max_requests
+        self.failed = False
+        self.truncated = False
+
+    def take(self, requests: int) -> bool:
+        if requests > self.remaining:
+            return False
+        self.remaining -= requests
+        return True
+
+
+def _merge_tiles(sources: Dict[Tile, List[Dict]], bounds: Rect, max_results: Optional[int]) -> List[Dict]:
+    """캐시된 타일들을 영역으로 잘라 합침. 결과를 자를 때 한 타일에 몰리지 않도록 타일별로 번갈아 가며 합침"""
+    places = []
+    seen_ids = set()
+    columns = [[p for p in tile_places if in_rect(p, bounds)] for tile_places in sources.values()]
+    for row in range(max((len(col) for col in columns), default=0)):
+        for col in columns:
+            if row < len(col) and col[row]["id"] not in seen_ids:
+                seen_ids.add(col[row]["id"])
+                places.append(dict(col[row]))  # 캐시된 원본이 수정되지 않도록 복사
+    return places if max_results is None else places[:max_results]
+
+
+def _documents_to_places(pages: List[Dict], keyword: str) -> List[Dict]:
+    places = []
+    lookup = default_region_index().lookup
+    for data in pages:
+        for doc in data.get("documents", []):
+            x, y = float(doc["x"]), float(doc["y"])
+            place = {
+                "id": doc["id"],
+                "name": doc["place_name"],
+                "activity": keyword,  # 검색한 키워드로 활동 추정
+                "category": doc["category_name"],
+                "phone": doc.get("phone", ""),
+                "address": doc.get("address_name", ""),
+                "road_address": doc.get("road_address_name", ""),
+                "x": x,  # 경도
+                "y": y,  # 위도
+                "place_url": doc.get("place_url", ""),
+                "distance": "",  # 카카오 API에서는 거리 정보가 없으므로 빈 문자열
+                "source": "kakao",
+                "collected_at": datetime.now().isoformat(),
+                "search_keyword": keyword,
+                "region": lookup(y, x),  # 시도 (수집 시 한 번 판정)
+            }
+            places.append(place)
+    if logger.isEnabledFor(logging.DEBUG):
+        for place in places:
+            logger.debug("  %s at (%s, %s)", place["name"], place["x"], place["y"])
+    return places
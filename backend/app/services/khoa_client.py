@@ -1,6 +1,44 @@
-from typing import Dict, Any
-import httpx, math, datetime as dt
-from ..config import KHOA_API_KEY
+import asyncio
+import logging
+import math
+import os
+import socket
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import httpx
+
+from ..config import (
+    KHOA_API_KEY,
+    KHOA_BASE_URL,
+    KHOA_CURRENT_BOUNDS,
+    KHOA_CURRENT_INTERPOLATION,
+    KHOA_CURRENT_RETRY_INTERVAL,
+    KHOA_CURRENT_STEP_MINUTES,
+    KMA_FOLLOWER_POLL_INTERVAL,
+)
+from .cache_backend import CacheBackend
+from .spatial_index import KDTree
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+STEP_FORMAT = "%Y%m%d%H%M"
+
+# 면단위 수치조류도 예측 유향·유속
+# 문서: 데이터포털 "수치조류도 예측 유향 유속" https://www.data.go.kr/data/15039006/openapi.do
+TIDAL_CURRENT_AREA_URL = f"{KHOA_BASE_URL}/oceangrid/khoa/takepart/openapi/openApiTidalCurrentArea.do"
+
+# 응답 격자점 필드 (기관 스펙 개정에 대비해 여러 이름 허용)
+_LAT_KEYS = ("pre_lat", "lat", "latitude")
+_LON_KEYS = ("pre_lon", "lon", "longitude")
+_SPEED_KEYS = ("current_speed", "crsp")
+_DIR_KEYS = ("current_dir", "current_direct", "crdir")
+
+_NO_CURRENT = {"current_speed": None, "current_dir": None, "current_time": None}
 
 
 def _center_bbox(lat, lon, half_km=2.0):
@@ -10,26 +48,380 @@ def _center_bbox(lat, lon, half_km=2.0):
     return lat - dlat, lon - dlon, lat + dlat, lon + dlon
 
 
-async def fetch_khoa_current(client: httpx.AsyncClient, lat: float, lon: float) -> Dict[str, Any]:
-    if not KHOA_API_KEY:
-        return {"current_speed": None, "current_dir": None, "current_time": None}
-    # 면단위 수치조류도 예측 유향·유속 (예시 URL, 기관 스펙에 맞춰 파라미터명 수정)
-    # 문서: 데이터포털 "수치조류도 예측 유향 유속"
-    # https://www.data.go.kr/data/15039006/openapi.do
-    s_lat, s_lon, e_lat, e_lon = _center_bbox(lat, lon)
-    url = "http://www.khoa.go.kr/oceangrid/khoa/takepart/openapi/openApiTidalCurrentArea.do"
+def _first_float(row: Dict[str, Any], keys: Tuple[str, ...]) -> Optional[float]:
+    for key in keys:
+        try:
+            value = float(row[key])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if math.isfinite(value):
+            return value
+    return None
+
+
+def forecast_step(now: Optional[datetime] = None, minutes: int = KHOA_CURRENT_STEP_MINUTES) -> datetime:
+    """now(KST) 가 속한 예보 시각 (자정부터 minutes 분 단위로 내림)"""
+    now = (now or datetime.now(KST)).replace(second=0, microsecond=0)
+    return now - timedelta(minutes=(now.hour * 60 + now.minute) % minutes)
+
+
+def parse_current_points(payload: Any) -> Iterator[Tuple[float, float, float, float]]:
+    """수치조류도 응답에서 (위도, 경도, 유속, 유향) 격자점을 추출. 값이 빠진 점은 건너뜀"""
+    result = payload.get("result", payload) if isinstance(payload, dict) else {}
+    rows = result.get("data") if isinstance(result, dict) else None
+    if isinstance(rows, dict):
+        rows = [rows]
+    for row in rows or []:
+        if not isinstance(row, dict):
+            continue
+        lat, lon = _first_float(row, _LAT_KEYS), _first_float(row, _LON_KEYS)
+        speed, direction = _first_float(row, _SPEED_KEYS), _first_float(row, _DIR_KEYS)
+        if None not in (lat, lon, speed, direction):
+            yield lat, lon, speed, direction
+
+
+def _polar(u: float, v: float) -> Tuple[float, float]:
+    return math.hypot(u, v), math.degrees(math.atan2(u, v)) % 360
+
+
+class CurrentGrid:
+    """
+    한 예보 시각의 조류 격자.
+    위경도 축은 정렬된 array('d'), 유속의 동(u)·북(v) 성분은 위도 행 우선 array('d') (결측 NaN).
+    유향은 성분으로 보간해야 350° 와 10° 사이가 180° 가 아니라 0° 가 됨
+    """
+
+    def __init__(self, step: str, lons: array, lats: array, u: array, v: array):
+        self.step = step
+        self.lons, self.lats = lons, lats
+        self.u, self.v = u, v
+
+    @classmethod
+    def from_points(cls, step: str, points: Iterable[Tuple[float, float, float, float]]) -> "CurrentGrid":
+        """
+        격자점을 (i, j) 칸으로 맞춰 담음. 축은 점 간격에서 추정한 등간격이라 육지로 빠진 격자점이 있어도
+        실제 격자 크기만큼만 잡힘. 점이 등간격 격자에 맞지 않거나 칸 대부분이 비면 ValueError
+        """
+        points = list(points)
+        if not points:
+            return cls(step, array("d"), array("d"), array("d"), array("d"))
+        lon_axis = _snap_axis([lon for _, lon, _, _ in points])
+        lat_axis = _snap_axis([lat for lat, _, _, _ in points])
+        if lon_axis is None or lat_axis is None:
+            raise ValueError("tidal current points are not on a regular grid")
+        (lon0, dlon, width), (lat0, dlat, height) = lon_axis, lat_axis
+        if len(points) < _MIN_GRID_FILL * width * height:
+            raise ValueError(f"tidal current grid would be {width}x{height} for {len(points)} points")
+        u = array("d", [math.nan]) * (width * height)
+        v = array("d", u)
+        for lat, lon, speed, direction in points:
+            i = round((lon - lon0) / dlon) if dlon else 0
+            j = round((lat - lat0) / dlat) if dlat else 0
+            radians = math.radians(direction)
+            u[j * width + i], v[j * width + i] = speed * math.sin(radians), speed * math.cos(radians)
+        lons = array("d", (lon0 + i * dlon for i in range(width)))
+        lats = array("d", (lat0 + j * dlat for j in range(height)))
+        return cls(step, lons, lats, u, v)
+
+    def to_payload(self) -> Dict[str, Any]:
+        # 공유 캐시 저장용 (JSON 에는 NaN 이 없으므로 null)
+        return {
+            "step": self.step,
+            "lons": list(self.lons),
+            "lats": list(self.lats),
+            "u": [None if x != x else x for x in self.u],
+            "v": [None if x != x else x for x in self.v],
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "CurrentGrid":
+        def values(key):
+            return array("d", (math.nan if x is None else x for x in payload[key]))
+
+        return cls(payload["step"], values("lons"), values("lats"), values("u"), values("v"))
+
+    def __len__(self) -> int:
+        return sum(1 for x in self.u if x == x)
+
+    def at(self, lat: float, lon: float, method: str = "bilinear") -> Optional[Tuple[float, float]]:
+        """(유속, 유향) 보간값. 격자 범위 밖이거나 주변 격자점이 모두 결측(육지)이면 None"""
+        lons, lats = self.lons, self.lats
+        if not lons or not (lons[0] <= lon <= lons[-1] and lats[0] <= lat <= lats[-1]):
+            return None
+        if method == "bilinear" and len(lons) > 1 and len(lats) > 1:
+            i = min(max(bisect_left(lons, lon), 1), len(lons) - 1)
+            j = min(max(bisect_left(lats, lat), 1), len(lats) - 1)
+            tx = (lon - lons[i - 1]) / (lons[i] - lons[i - 1])
+            ty = (lat - lats[j - 1]) / (lats[j] - lats[j - 1])
+            total = u_sum = v_sum = 0.0
+            for row, wy in ((j - 1, 1 - ty), (j, ty)):
+                for col, wx in ((i - 1, 1 - tx), (i, tx)):
+                    k, weight = row * len(lons) + col, wx * wy
+                    # 결측(육지) 모서리는 빼고 남은 가중치로 정규화
+                    if weight > 0 and self.u[k] == self.u[k]:
+                        total += weight
+                        u_sum += weight * self.u[k]
+                        v_sum += weight * self.v[k]
+            if total > 0:
+                return _polar(u_sum / total, v_sum / total)
+        return self._nearest(lat, lon)
+
+    def _nearest(self, lat: float, lon: float) -> Optional[Tuple[float, float]]:
+        # 가장 가까운 격자점, 결측이면 바로 이웃한 격자점 중 가장 가까운 것
+        lons, lats = self.lons, self.lats
+        i0, j0 = _nearest_index(lons, lon), _nearest_index(lats, lat)
+        scale = math.cos(math.radians(lat))
+        best, best_distance = None, math.inf
+        for j in range(max(j0 - 1, 0), min(j0 + 2, len(lats))):
+            for i in range(max(i0 - 1, 0), min(i0 + 2, len(lons))):
+                k = j * len(lons) + i
+                if self.u[k] != self.u[k]:
+                    continue
+                distance = ((lons[i] - lon) * scale) ** 2 + (lats[j] - lat) ** 2
+                if distance < best_distance:
+                    best, best_distance = k, distance
+        return None if best is None else _polar(self.u[best], self.v[best])
+
+
+# 등간격 격자로 담을 때 최소 채움 비율 (이보다 비면 점 집합으로 보간)
+_MIN_GRID_FILL = 0.05
+# 격자점이 간격의 이 비율 이상 어긋나면 등간격 격자가 아닌 것으로 봄
+_SNAP_TOLERANCE = 0.05
+# 점 집합 보간에 쓰는 이웃 점 수
+_IDW_NEIGHBORS = 4
+
+
+def _snap_axis(values: List[float]) -> Optional[Tuple[float, float, int]]:
+    """
+    좌표 값들이 등간격 축 위에 있으면 (시작값, 간격, 칸 수).
+    간격은 서로 다른 값 사이의 가장 작은 차이 (빠진 격자점은 그 배수 간격으로 나타남)
+    """
+    distinct = sorted({round(value, 6) for value in values})
+    if not distinct:
+        return None
+    if len(distinct) == 1:
+        return distinct[0], 0.0, 1
+    origin, span = distinct[0], distinct[-1] - distinct[0]
+    # 반올림 오차가 쌓이지 않도록 가장 작은 차이로 센 칸 수로 전체 폭을 나눔
+    cells = round(span / min(b - a for a, b in zip(distinct, distinct[1:])))
+    spacing = span / cells
+    for value in distinct:
+        offset = (value - origin) / spacing
+        if abs(offset - round(offset)) > _SNAP_TOLERANCE:
+            return None
+    return origin, spacing, cells + 1
+
+
+def _nearest_index(axis: array, value: float) -> int:
+    i = bisect_left(axis, value)
+    if i == 0:
+        return 0
+    if i == len(axis):
+        return i - 1
+    return i if axis[i] - value < value - axis[i - 1] else i - 1
+
+
+class ScatteredCurrents:
+    """
+    등간격 격자에 맞지 않는 조류 점 집합.
+    KD-트리로 가까운 점을 찾아 유속 성분을 거리 역제곱 가중(IDW)으로 보간 (nearest 면 가장 가까운 점)
+    """
+
+    def __init__(self, step: str, lats: array, lons: array, u: array, v: array):
+        self.step = step
+        self.lats, self.lons = lats, lons
+        self.u, self.v = u, v
+        self.tree = KDTree(list(zip(lats, lons)))
+        self.bounds = (min(lons), min(lats), max(lons), max(lats)) if lons else None
+
+    @classmethod
+    def from_points(cls, step: str, points: Iterable[Tuple[float, float, float, float]]) -> "ScatteredCurrents":
+        points = list(points)
+        radians = [math.radians(direction) for _, _, _, direction in points]
+        return cls(
+            step,
+            array("d", (lat for lat, _, _, _ in points)),
+            array("d", (lon for _, lon, _, _ in points)),
+            array("d", (speed * math.sin(r) for (_, _, speed, _), r in zip(points, radians))),
+            array("d", (speed * math.cos(r) for (_, _, speed, _), r in zip(points, radians))),
+        )
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {"step": self.step, "scattered": True, **{key: list(getattr(self, key)) for key in ("lats", "lons", "u", "v")}}
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "ScatteredCurrents":
+        return cls(payload["step"], *(array("d", payload[key]) for key in ("lats", "lons", "u", "v")))
+
+    def __len__(self) -> int:
+        return len(self.u)
+
+    def at(self, lat: float, lon: float, method: str = "bilinear") -> Optional[Tuple[float, float]]:
+        """(유속, 유향) 보간값. 점들이 걸친 범위 밖이면 None"""
+        if self.bounds is None or not (self.bounds[0] <= lon <= self.bounds[2] and self.bounds[1] <= lat <= self.bounds[3]):
+            return None
+        found = self.tree.query(lat, lon, 1 if method == "nearest" else _IDW_NEIGHBORS)
+        if found[0][1] < 1e-6:
+            found = found[:1]  # 점 위에서는 그 점의 값
+        weights = [(k, 1 / max(distance, 1e-6) ** 2) for k, distance in found]
+        total = sum(weight for _, weight in weights)
+        return _polar(
+            sum(weight * self.u[k] for k, weight in weights) / total,
+            sum(weight * self.v[k] for k, weight in weights) / total,
+        )
+
+
+CurrentField = Union[CurrentGrid, ScatteredCurrents]
+
+
+def current_field_from_points(step: str, points: Iterable[Tuple[float, float, float, float]]) -> CurrentField:
+    """등간격 격자로 담을 수 있으면 CurrentGrid, 아니면 점 집합 보간"""
+    points = list(points)
+    try:
+        return CurrentGrid.from_points(step, points)
+    except ValueError as e:
+        logger.info("Interpolating %d tidal current points without a grid: %s", len(points), e)
+        return ScatteredCurrents.from_points(step, points)
+
+
+def current_field_from_payload(payload: Dict[str, Any]) -> CurrentField:
+    if payload.get("scattered"):
+        return ScatteredCurrents.from_payload(payload)
+    return CurrentGrid.from_payload(payload)
+
+
+async def fetch_current_grid(
+    client: httpx.AsyncClient,
+    step: datetime,
+    bounds: Tuple[float, float, float, float],
+    timeout: float = 30,
+) -> CurrentField:
+    """예보 시각 step 의 bounds(minLng,minLat,maxLng,maxLat) 영역 조류 격자를 한 번에 조회"""
+    min_lon, min_lat, max_lon, max_lat = bounds
     params = {
         "ServiceKey": KHOA_API_KEY,
         "ResultType": "json",
-        "DateTime": dt.datetime.utcnow().strftime("%Y%m%d%H%M"),
-        "MinLat": s_lat,
-        "MinLon": s_lon,
-        "MaxLat": e_lat,
-        "MaxLon": e_lon,
+        "DateTime": step.strftime(STEP_FORMAT),
+        "MinLat": min_lat,
+        "MinLon": min_lon,
+        "MaxLat": max_lat,
+        "MaxLon": max_lon,
     }
-    r = await client.get(url, params=params, timeout=10)
-    j = r.json()
-    # TODO: 기관 응답 스키마에 맞춰 가장 가까운 격자점 1개 추출
-    return {"current_speed": None, "current_dir": None, "current_time": None}
+    r = await client.get(TIDAL_CURRENT_AREA_URL, params=params, timeout=timeout)
+    r.raise_for_status()
+    return current_field_from_points(step.strftime(STEP_FORMAT), parse_current_points(r.json()))
+
+
+async def fetch_khoa_current(client: httpx.AsyncClient, lat: float, lon: float) -> Dict[str, Any]:
+    """한 지점 주변만 조회해 보간 (요청마다 업스트림 호출 — 서버에서는 TidalCurrentRefresher 사용)"""
+    if not KHOA_API_KEY:
+        return dict(_NO_CURRENT)
+    s_lat, s_lon, e_lat, e_lon = _center_bbox(lat, lon)
+    grid = await fetch_current_grid(client, forecast_step(), (s_lon, s_lat, e_lon, e_lat), timeout=10)
+    return current_fields(grid, lat, lon)
+
+
+def current_fields(grid: Optional[CurrentField], lat: float, lon: float, method: str = "bilinear") -> Dict[str, Any]:
+    value = grid.at(lat, lon, method) if grid is not None else None
+    if value is None:
+        return dict(_NO_CURRENT)
+    return {"current_speed": round(value[0], 3), "current_dir": round(value[1], 1), "current_time": grid.step}
+
+
+class TidalCurrentRefresher:
+    """
+    예보 시각이 바뀔 때마다 해안 전체 수치조류도 격자를 한 번 받아 교체하는 백그라운드 작업.
+    요청 처리 쪽은 at()/attach() 로 메모리 격자에서 보간만 하므로 업스트림 호출이 없음.
+    공유 캐시 저장소면 임대를 잡은 워커만 KHOA 를 조회하고 나머지는 저장된 격자를 읽음
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], httpx.AsyncClient],
+        backend: Optional[CacheBackend] = None,
+        bounds: str = KHOA_CURRENT_BOUNDS,
+        step_minutes: int = KHOA_CURRENT_STEP_MINUTES,
+        method: str = KHOA_CURRENT_INTERPOLATION,
+        retry_interval: float = KHOA_CURRENT_RETRY_INTERVAL,
+    ):
+        self.client_factory = client_factory
+        self.backend = backend
+        self.bounds = tuple(float(v) for v in bounds.split(","))
+        self.step_minutes = step_minutes
+        self.method = method
+        self.retry_interval = retry_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.grid: Optional[CurrentField] = None
+        self.fetched_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(KHOA_API_KEY)
+
+    def at(self, lat: float, lon: float) -> Dict[str, Any]:
+        """좌표의 유속·유향·예보 시각 (격자가 없거나 범위 밖이면 모두 None)"""
+        return current_fields(self.grid, lat, lon, self.method)
+
+    def attach(self, places: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """각 장소(x=경도, y=위도)에 보간한 조류 정보를 붙임"""
+        if self.grid is not None:
+            for place in places:
+                place.update(self.at(place["y"], place["x"]))
+        return places
+
+    async def refresh(self, step: Optional[datetime] = None) -> bool:
+        """예보 시각 step 의 격자로 교체. 다른 워커가 조회 중이라 아직 없으면 False"""
+        step = step or forecast_step(minutes=self.step_minutes)
+        key = f"khoa:current:{step.strftime(STEP_FORMAT)}"
+        if self.backend is not None:
+            cached = await asyncio.to_thread(self.backend.get, key)
+            if cached is not None:
+                self._replace(current_field_from_payload(cached))
+                return True
+            if self.backend.shared and not await asyncio.to_thread(
+                self.backend.acquire_lease, "khoa:current:refresher", self.worker_id, self.retry_interval
+            ):
+                return False
+        grid = await fetch_current_grid(self.client_factory(), step, self.bounds)
+        if not len(grid):
+            logger.warning("KHOA tidal current grid for %s is empty; keeping previous grid", grid.step)
+            return True
+        if self.backend is not None:
+            await asyncio.to_thread(self.backend.set, key, grid.to_payload(), self.step_minutes * 60 * 2, pinned=True)
+        self._replace(grid)
+        return True
+
+    def _replace(self, grid: CurrentField):
+        self.grid = grid
+        self.fetched_at = time.time()
+
+    def _until_next_step(self) -> float:
+        now = datetime.now(KST)
+        next_step = forecast_step(now, self.step_minutes) + timedelta(minutes=self.step_minutes)
+        return max(1.0, (next_step - now).total_seconds())
+
+    async def _run(self):
+        while True:
+            try:
+                updated = await self.refresh()
+                delay = self._until_next_step() if updated else KMA_FOLLOWER_POLL_INTERVAL
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("KHOA tidal current refresh failed: %s", e)
+                delay = self.retry_interval
+            await asyncio.sleep(delay)
 
+    def start(self):
+        if self._task is None and self.enabled:
+            self._task = asyncio.create_task(self._run())
 
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
@@ -1,6 +1,36 @@
-from typing import Dict, Any, List
+import logging
+import math
+from array import array
+from functools import lru_cache
+from operator import add, methodcaller
+from typing import Dict, Any, List, Tuple
 import httpx
-from ..config import KMA_API_KEY
+from ..config import KMA_API_KEY, KMA_BASE_URL
+from .single_flight import single_flight
+from .regions import default_region_index
+
+logger = logging.getLogger(__name__)
+
+NAN = float("nan")
+
+# sea_obs.php 응답 컬럼 순서: TP, TM, STN_ID, STN_KO, LON, LAT, WH, WD, WS, WS_GST, TW, TA, PA, HM
+SEA_OBS_TEXT_COLUMNS = ("tp", "observed_at", "station_id", "station_name")
+SEA_OBS_FLOAT_COLUMNS = (
+    "lon",          # LON (경도)
+    "lat",          # LAT (위도)
+    "wave_height",  # WH (유의파고)
+    "wind_dir",     # WD (풍향)
+    "wind_speed",   # WS (풍속)
+    "wind_gust",    # WS_GST (돌풍)
+    "sst",          # TW (해수면 온도)
+    "air_temp",     # TA (기온)
+    "pressure",     # PA (기압)
+    "humidity",     # HM (습도)
+)
+
+# row() 에서 위경도 다음에 붙는 관측값 컬럼 (기존 응답 필드 순서 유지)
+_ROW_FLOAT_COLUMNS = ("sst", "wave_height", "wind_dir", "wind_speed", "wind_gust", "air_temp", "pressure", "humidity")
+_ROW_KEYS = ("station_id", "station_name", "lat", "lon", *_ROW_FLOAT_COLUMNS, "observed_at", "tp", "region")
 
 
 def _to_float(token: str) -> float | None:
@@ -15,78 +45,200 @@ def _to_float(token: str) -> float | None:
         return None
 
 
+def _cell_to_float(cell: str) -> float:
+    # 결측값(-99, 빈 칸, 파싱 불가)은 NaN 으로 표현
+    try:
+        value = float(cell)
+    except ValueError:
+        cleaned = cell.strip().strip("=")
+        if not cleaned:
+            return NAN
+        try:
+            value = float(cleaned)
+        except ValueError:
+            return NAN
+    return NAN if value == -99.0 else value
+
+
+@lru_cache(maxsize=4096)
+def _region_at(lat: float, lon: float) -> str | None:
+    # 관측소 좌표는 시각·스냅샷이 바뀌어도 그대로 반복되므로 좌표별로 한 번만 판정
+    return default_region_index().lookup(lat, lon)
+
+
+def _float_column(cells: List[str]) -> array:
+    """문자열 칸 목록을 array('d') 로 변환 (결측값은 NaN)"""
+    try:
+        # 대부분의 응답은 float() 한 번에 변환됨 (앞뒤 공백 허용)
+        column = array("d", map(float, cells))
+    except ValueError:
+        return array("d", map(_cell_to_float, cells))
+    if -99.0 in column:
+        for i, value in enumerate(column):
+            if value == -99.0:
+                column[i] = NAN
+    return column
+
+
+def _none_if_nan(column: array) -> list:
+    values = column.tolist()
+    if any(map(math.isnan, values)):
+        return [None if v != v else v for v in values]
+    return values
+
+
+class SeaObsColumns:
+    """
+    sea_obs.php 응답의 컬럼 지향 표현.
+    문자열 컬럼은 list, 수치 컬럼은 컬럼마다 array('d') 에 저장하고 결측값은 NaN.
+    위경도 외의 수치 컬럼은 column() 에서 처음 요청될 때 변환하고, dict 변환은 응답 직전에 row()/to_dicts() 로만 수행
+    """
+
+    def __init__(self):
+        self.text = {name: [] for name in SEA_OBS_TEXT_COLUMNS}
+        self.floats: Dict[str, array] = {}
+        self._cells: Dict[str, List[str]] = {name: [] for name in SEA_OBS_FLOAT_COLUMNS}  # 아직 변환하지 않은 컬럼
+        self._regions: List[str | None] | None = None
+
+    def __len__(self) -> int:
+        return len(self.text["station_id"])
+
+    def column(self, name: str):
+        if name in self.text:
+            return self.text[name]
+        column = self.floats.get(name)
+        if column is None:
+            column = self.floats[name] = _float_column(self._cells.pop(name))
+        return column
+
+    def regions(self) -> List[str | None]:
+        """행별 시도 이름 (처음 요청될 때 한 번 판정)"""
+        if self._regions is None:
+            self._regions = list(map(_region_at, self.column("lat"), self.column("lon")))
+        return self._regions
+
+    def row(self, i: int) -> Dict[str, Any]:
+        text = self.text
+        lat, lon = self.column("lat")[i], self.column("lon")[i]
+        row = {
+            "station_id": text["station_id"][i],
+            "station_name": text["station_name"][i],
+            "lat": lat,
+            "lon": lon,
+        }
+        for name in _ROW_FLOAT_COLUMNS:
+            value = self.column(name)[i]
+            row[name] = None if value != value else value  # NaN -> None
+        row["observed_at"] = text["observed_at"][i]
+        row["tp"] = text["tp"][i]
+        # 몇 행만 꺼낼 때는 전체 행의 시도를 판정하지 않음
+        row["region"] = self._regions[i] if self._regions is not None else _region_at(lat, lon)
+        row["source"] = "KMA"  # to_dicts() 와 같은 키 순서
+        return row
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        # 행 단위 row() 대신 컬럼을 통째로 zip 해서 변환 (NaN -> None 은 NaN 이 있는 컬럼만)
+        text = self.text
+        rows = zip(
+            text["station_id"], text["station_name"], self.column("lat").tolist(), self.column("lon").tolist(),
+            *(_none_if_nan(self.column(name)) for name in _ROW_FLOAT_COLUMNS),
+            text["observed_at"], text["tp"], self.regions(),
+        )
+        return [dict(zip(_ROW_KEYS, row), source="KMA") for row in rows]
+
+
+def _split_cells(text: str) -> Tuple[List[str], int]:
+    """
+    데이터 행의 칸을 한 목록으로 펼쳐 (칸 목록, 행당 칸 수) 로 반환.
+    행마다 칸 수가 같으면 (보통) 행을 이어 붙여 split 한 번으로 나눔
+    """
+    lines = [line for line in text.splitlines() if "," in line and not line.lstrip().startswith("#")]
+    counts = set(map(methodcaller("count", ","), lines))
+    if len(counts) == 1 and min(counts) >= 13:
+        return ",".join(lines).split(","), min(counts) + 1
+    # 칸 수가 섞여 있으면 앞 14칸만 사용하고 모자란 행은 버림
+    cells: List[str] = []
+    for line in lines:
+        row = line.split(",")
+        if len(row) >= 14:
+            cells.extend(row[:14])
+    return cells, 14
+
+
+def parse_sea_obs_columns(text: str) -> SeaObsColumns:
+    """
+    sea_obs.php 응답을 컬럼 지향 구조로 파싱.
+    칸을 한 번에 나눈 뒤 컬럼은 슬라이스로 꺼내고, 위경도만 바로 float 로 바꿔 유효한 행을 가림
+    """
+    cells, width = _split_cells(text)
+    columns = SeaObsColumns()
+    for offset, name in enumerate(SEA_OBS_TEXT_COLUMNS):
+        columns.text[name] = list(map(str.strip, cells[offset::width]))
+    for offset, name in enumerate(SEA_OBS_FLOAT_COLUMNS, start=4):
+        columns._cells[name] = cells[offset::width]
+    lon, lat = columns.column("lon"), columns.column("lat")
+    
+    # 위경도가 유효한 행만 포함 (NaN 이 있으면 합도 NaN)
+    if math.isnan(sum(lon) + sum(lat)):
+        invalid = {i for i, v in enumerate(map(add, lon, lat)) if v != v}
+
+        def keep(column):
+            return [v for i, v in enumerate(column) if i not in invalid]
+
+        for name, column in columns.floats.items():
+            columns.floats[name] = array("d", keep(column))
+        for store in (columns.text, columns._cells):
+            for name, column in store.items():
+                store[name] = keep(column)
+    return columns
+
+
 def _parse_sea_obs_all(text: str) -> List[Dict[str, Any]]:
     """
     sea_obs.php 전체 지점 응답을 파싱하여 모든 지점 정보를 반환
     응답 형식: TP, TM, STN_ID, STN_KO, LON, LAT, WH, WD, WS, WS_GST, TW, TA, PA, HM, ...
     """
-    lines = [ln for ln in text.splitlines() if ln.strip() and not ln.strip().startswith("#")]
-    data_lines = [ln for ln in lines if "," in ln]
+    return parse_sea_obs_columns(text).to_dicts()
+
+
+SEA_OBS_URL = f"{KMA_BASE_URL}/api/typ01/url/sea_obs.php"
+
+
+async def fetch_sea_obs_text(client: httpx.AsyncClient, stn: str | int = 0, tm: str | None = None, timeout: float = 15) -> str:
+    """
+    sea_obs.php 원문 응답을 가져옴 (실패 시 예외 발생)
+    같은 (stn, tm) 조회가 동시에 들어오면 하나의 업스트림 호출 결과를 공유함
+    """
+    params = {"stn": stn, "authKey": KMA_API_KEY}
+    if tm:
+        params["tm"] = tm
     
-    stations = []
-    for row in data_lines:
-        cols = [c.strip() for c in row.split(",")]
-        if len(cols) < 14:
-            continue
-            
-        tp = cols[0]         # TP (관측종류)
-        tm = cols[1]         # TM (관측시각)
-        stn_id = cols[2]     # STN_ID
-        stn_name = cols[3]   # STN_KO
-        lon = _to_float(cols[4])  # LON (경도)
-        lat = _to_float(cols[5])  # LAT (위도)
-        wh = _to_float(cols[6])   # WH (유의파고)
-        tw = _to_float(cols[10])  # TW (해수면 온도)
-        
-        # 위경도가 유효한 경우만 포함
-        if lat is not None and lon is not None:
-            station = {
-                "station_id": stn_id,
-                "station_name": stn_name,
-                "lat": lat,
-                "lon": lon,
-                "sst": tw,
-                "wave_height": wh,
-                "observed_at": tm,
-                "tp": tp,
-                "source": "KMA"
-            }
-            stations.append(station)
+    async def fetch() -> str:
+        r = await client.get(SEA_OBS_URL, params=params, timeout=timeout)
+        r.raise_for_status()
+        return r.text
     
-    return stations
+    return await single_flight.do(("kma", "sea_obs", str(stn), tm or ""), fetch)
 
 
 async def fetch_all_stations(client: httpx.AsyncClient, tm: str | None = None) -> List[Dict[str, Any]]:
     """모든 지점의 해양 관측 데이터를 가져옴"""
-    url = "https://apihub.kma.go.kr/api/typ01/url/sea_obs.php"
-    params = {"stn": 0, "authKey": KMA_API_KEY}
-    if tm:
-        params["tm"] = tm
-    
     try:
-        r = await client.get(url, params=params, timeout=15)
-        r.raise_for_status()
-        stations = _parse_sea_obs_all(r.text)
+        text = await fetch_sea_obs_text(client, 0, tm, timeout=15)
+        stations = _parse_sea_obs_all(text)
         return stations
     except Exception as e:
-        print(f"Error fetching stations: {e}")
+        logger.error("Error fetching stations: %s", e)
         return []
 
 
 async def fetch_station_by_id(client: httpx.AsyncClient, station_id: str, tm: str | None = None) -> Dict[str, Any]:
     """특정 지점의 해양 관측 데이터를 가져옴"""
-    url = "https://apihub.kma.go.kr/api/typ01/url/sea_obs.php"
-    params = {"stn": station_id, "authKey": KMA_API_KEY}
-    if tm:
-        params["tm"] = tm
-    
     try:
-        r = await client.get(url, params=params, timeout=10)
-        r.raise_for_status()
-        stations = _parse_sea_obs_all(r.text)
-        if stations:
-            return stations[0]
-        return {}
+        text = await fetch_sea_obs_text(client, station_id, tm, timeout=10)
+        columns = parse_sea_obs_columns(text)
+        # 첫 행만 쓰므로 나머지 행은 dict 로 만들지 않음
+        return columns.row(0) if len(columns) else {}
     except Exception as e:
-        print(f"Error fetching station {station_id}: {e}")
-        return {}
\ No newline at end of file
+        logger.error("Error fetching station %s: %s", station_id, e)
+        return {}
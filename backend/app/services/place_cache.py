@@ -0,0 +1,184 @@
+import asyncio
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from ..config import PLACE_CACHE_TTL, PLACE_CACHE_MAX_ENTRIES, PLACE_TILE_MAX_TILES
+from .cache_backend import CacheBackend, MemoryCacheBackend
+
+# 줌 구간별 타일 크기(도). 요청 영역을 덮는 타일 수가 PLACE_TILE_MAX_TILES 이하가 되는 가장 작은 크기를 사용
+TILE_SIZES = tuple(round(0.01 * 2 ** k, 2) for k in range(10))  # 0.01 ~ 5.12
+
+Rect = Tuple[float, float, float, float]  # (minLng, minLat, maxLng, maxLat)
+Tile = Tuple[float, int, int]  # (타일 크기, x 인덱스, y 인덱스)
+
+_KEY_PREFIX = "place_tile:"
+
+
+def parse_rect(rect: str) -> Rect:
+    """rect 문자열(minLng,minLat,maxLng,maxLat)을 float 튜플로 변환"""
+    parts = [float(v) for v in rect.split(",")]
+    if len(parts) != 4:
+        raise ValueError(f"Invalid rect: {rect}")
+    min_lng, min_lat, max_lng, max_lat = parts
+    return min(min_lng, max_lng), min(min_lat, max_lat), max(min_lng, max_lng), max(min_lat, max_lat)
+
+
+def format_rect(rect: Rect) -> str:
+    return ",".join(f"{v:.6f}".rstrip("0").rstrip(".") for v in rect)
+
+
+def _tile_range(lo: float, hi: float, size: float) -> range:
+    return range(math.floor(lo / size), math.floor(hi / size) + 1)
+
+
+def tiles_for_rect(
+    rect: Rect, max_tiles: int = PLACE_TILE_MAX_TILES, keep: Optional[Callable[[Rect], bool]] = None
+) -> List[Tile]:
+    """
+    요청 영역을 고정 타일 그리드에 맞춰 덮는 타일 목록을 반환.
+    keep 을 주면 (해안 마스크) 통과한 타일만 max_tiles 에 세므로, 내륙이 넓은 영역은 더 작은 해안 타일로 덮임
+    """
+    min_lng, min_lat, max_lng, max_lat = rect
+    for size in TILE_SIZES:
+        xs = _tile_range(min_lng, max_lng, size)
+        ys = _tile_range(min_lat, max_lat, size)
+        last = size == TILE_SIZES[-1]
+        if keep is None:
+            if len(xs) * len(ys) <= max_tiles or last:
+                return [(size, ix, iy) for iy in ys for ix in xs]
+            continue
+        # 판정할 타일이 너무 많은 작은 크기는 건너뜀
+        if len(xs) * len(ys) > max_tiles * 16 and not last:
+            continue
+        tiles = [(size, ix, iy) for iy in ys for ix in xs if keep(tile_rect((size, ix, iy)))]
+        if len(tiles) <= max_tiles or last:
+            return tiles
+    return []
+
+
+def ancestor_tiles(tile: Tile) -> Iterator[Tile]:
+    """tile 을 포함하는 더 큰 타일들 (가까운 크기부터). 타일 크기가 2배씩 커지므로 그리드가 겹쳐 맞물림"""
+    size, ix, iy = tile
+    for larger in TILE_SIZES:
+        if larger > size:
+            factor = round(larger / size)
+            yield larger, ix // factor, iy // factor
+
+
+def tile_rect(tile: Tile) -> Rect:
+    size, ix, iy = tile
+    return (round(ix * size, 6), round(iy * size, 6), round((ix + 1) * size, 6), round((iy + 1) * size, 6))
+
+
+def rect_within(inner: Rect, outer: Rect) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
+
+def in_rect(place: Dict, rect: Rect) -> bool:
+    min_lng, min_lat, max_lng, max_lat = rect
+    return min_lng <= place["x"] <= max_lng and min_lat <= place["y"] <= max_lat
+
+
+class PlaceTileCache:
+    """
+    (타일, 키워드) 단위의 카카오 검색 결과 캐시. 항목은 타일 안의 장소 전부 (일부만 받은 결과는 넣지 않음).
+    TTL 이 지난 항목은 무시하고, 저장소가 가득 차면 오래된 항목부터 제거함.
+    저장소는 기본적으로 프로세스 내 LRU 이고, CACHE_BACKEND=sqlite 면 워커끼리 공유됨.
+    SQLite 처럼 잠금을 기다릴 수 있는 저장소(blocking)는 이벤트 루프를 막지 않도록 전용 스레드에서 호출함
+    """
+
+    def __init__(
+        self,
+        ttl: float = PLACE_CACHE_TTL,
+        max_entries: int = PLACE_CACHE_MAX_ENTRIES,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.backend = backend or MemoryCacheBackend(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.entries = 0  # 마지막으로 센 항목 수 (count_entries 로 갱신)
+        # 저장소가 연결 하나를 잠금으로 나눠 쓰므로 스레드 하나면 충분
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="place-tile-cache") if self.backend.blocking else None
+        )
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return _KEY_PREFIX + json.dumps(key, ensure_ascii=False, separators=(",", ":"))
+
+    async def _call(self, fn: Callable, *args):
+        if self._executor is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args))
+
+    def _get(self, key: Hashable) -> Optional[List[Dict]]:
+        places = self.backend.get(self._key(key))
+        if places is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return places
+
+    def _get_first(self, keys: Iterable[Hashable]) -> Optional[Tuple[Hashable, List[Dict]]]:
+        for key in keys:
+            places = self._get(key)
+            if places is not None:
+                return key, places
+        return None
+
+    def _set_many(self, items: List[Tuple[Hashable, List[Dict]]]):
+        for key, places in items:
+            self.backend.set(self._key(key), places, self.ttl)
+
+    async def get(self, key: Hashable) -> Optional[List[Dict]]:
+        return await self._call(self._get, key)
+
+    async def get_first(self, keys: Iterable[Hashable]) -> Optional[Tuple[Hashable, List[Dict]]]:
+        """keys 를 차례로 찾아 처음 있는 (키, 장소) 를 반환 (저장소 왕복은 한 번)"""
+        return await self._call(self._get_first, list(keys))
+
+    async def get_stale(self, key: Hashable) -> Optional[List[Dict]]:
+        """TTL 이 지났어도 아직 밀려나지 않은 항목을 반환 (업스트림 장애 시 대체 응답용)"""
+        places = await self._call(self.backend.get, self._key(key), True)
+        if places is not None:
+            self.stale_served += 1
+        return places
+
+    async def set(self, key: Hashable, places: List[Dict]):
+        await self._call(self._set_many, [(key, places)])
+
+    async def set_many(self, items: List[Tuple[Hashable, List[Dict]]]):
+        if items:
+            await self._call(self._set_many, items)
+
+    async def clear(self):
+        await self._call(self.backend.clear, _KEY_PREFIX)
+        self.entries = 0
+
+    async def count_entries(self) -> int:
+        self.entries = await self._call(self.backend.count, _KEY_PREFIX)
+        return self.entries
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, float]:
+        """적중 통계 (항목 수는 마지막 count_entries() 값)"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": self.entries,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+오프라인 해안 장소 인덱스 (SQLite R-tree)
+
+카카오 키워드 검색으로 해안 지역을 셀 단위로 수집해 두고, rect+활동 질의를 로컬에서 응답함.
+
+실행 (backend 폴더에서):
+    python -m app.services.place_index crawl [--rect minLng,minLat,maxLng,maxLat] [--max-cells N]
+    python -m app.services.place_index refresh [--max-cells N]
+    python -m app.services.place_index stats
+"""
+import argparse
+import asyncio
+import logging
+import math
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from ..config import (
+    PLACE_INDEX_DB_PATH,
+    PLACE_INDEX_BOUNDS,
+    PLACE_INDEX_CELL_SIZE,
+    PLACE_INDEX_MAX_AGE,
+    PLACE_INDEX_REFRESH_INTERVAL,
+    PLACE_INDEX_REFRESH_BATCH,
+)
+from .kakao_local_client import KEYWORD_ACTIVITIES, KakaoLocalClient, SubdivisionBudget
+from .place_cache import Rect, parse_rect, format_rect
+from .regions import region_of
+
+logger = logging.getLogger(__name__)
+
+Cell = Tuple[int, int]  # (x 인덱스, y 인덱스)
+
+_PLACE_COLUMNS = ("id", "name", "category", "phone", "address", "road_address", "x", "y", "place_url", "region")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS places (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT, category TEXT, phone TEXT, address TEXT, road_address TEXT,
+    x REAL NOT NULL, y REAL NOT NULL,
+    place_url TEXT,
+    collected_at TEXT,
+    region TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS place_rtree USING rtree(id, min_x, max_x, min_y, max_y);
+CREATE TABLE IF NOT EXISTS place_activities (
+    place_rowid INTEGER NOT NULL,
+    activity TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (place_rowid, activity)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS place_activities_activity ON place_activities (activity);
+-- 수집 셀과 마지막 수집 시각 (증분 갱신용)
+CREATE TABLE IF NOT EXISTS cells (
+    ix INTEGER NOT NULL,
+    iy INTEGER NOT NULL,
+    crawled_at REAL NOT NULL,
+    place_count INTEGER NOT NULL,
+    PRIMARY KEY (ix, iy)
+) WITHOUT ROWID;
+"""
+
+
+def cell_rect(cell: Cell, size: float = PLACE_INDEX_CELL_SIZE) -> Rect:
+    ix, iy = cell
+    return (round(ix * size, 6), round(iy * size, 6), round((ix + 1) * size, 6), round((iy + 1) * size, 6))
+
+
+def cells_in_rect(rect: Rect, size: float = PLACE_INDEX_CELL_SIZE) -> List[Cell]:
+    min_lng, min_lat, max_lng, max_lat = rect
+    return [
+        (ix, iy)
+        for iy in range(math.floor(min_lat / size), math.ceil(max_lat / size))
+        for ix in range(math.floor(min_lng / size), math.ceil(max_lng / size))
+    ]
+
+
+def _migrate(conn: sqlite3.Connection):
+    # region 컬럼이 없던 인덱스는 컬럼을 추가하고 저장된 좌표로 시도를 채움
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(places)")}
+    if "region" not in columns:
+        conn.execute("ALTER TABLE places ADD COLUMN region TEXT")
+    rows = conn.execute("SELECT rowid, x, y FROM places WHERE region IS NULL").fetchall()
+    if rows:
+        with conn:
+            conn.executemany("UPDATE places SET region = ? WHERE rowid = ?", [(region_of(y, x), rowid) for rowid, x, y in rows])
+    conn.execute("CREATE INDEX IF NOT EXISTS places_region ON places (region)")
+
+
+class PlaceIndex:
+    """수집한 장소를 id 로 보관하고 R-tree 로 영역 질의하는 SQLite 인덱스"""
+
+    def __init__(self, path: str = PLACE_INDEX_DB_PATH, cell_size: float = PLACE_INDEX_CELL_SIZE):
+        self.path = path
+        self.cell_size = cell_size
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _migrate(conn)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def store_cell(self, cell: Cell, places: List[Dict[str, Any]], complete: bool = True):
+        """
+        한 셀의 수집 결과를 저장. place["activities"] 는 [(activity, keyword), ...].
+        complete=True 면 셀 안의 기존 장소 중 이번 수집에서 빠진 것은 삭제되고,
+        False (검색 결과가 예산에서 잘림) 면 받은 장소만 갱신하고 아무것도 지우지 않음
+        """
+        min_x, min_y, max_x, max_y = cell_rect(cell, self.cell_size)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                stale = {
+                    row[0] for row in conn.execute(
+                        "SELECT p.rowid FROM place_rtree r JOIN places p ON p.rowid = r.id "
+                        "WHERE r.max_x >= ? AND r.min_x <= ? AND r.max_y >= ? AND r.min_y <= ? "
+                        "AND p.x >= ? AND p.x < ? AND p.y >= ? AND p.y < ?",
+                        (min_x, max_x, min_y, max_y) * 2,
+                    )
+                }
+                for place in places:
+                    row = conn.execute("SELECT rowid FROM places WHERE id = ?", (place["id"],)).fetchone()
+                    if place.get("region") is None:
+                        place["region"] = region_of(place["y"], place["x"])
+                    values = [place.get(name, "") for name in _PLACE_COLUMNS] + [place.get("collected_at")]
+                    if row is None:
+                        rowid = conn.execute(
+                            f"INSERT INTO places ({', '.join(_PLACE_COLUMNS)}, collected_at) "
+                            f"VALUES ({', '.join('?' * (len(_PLACE_COLUMNS) + 1))})",
+                            values,
+                        ).lastrowid
+                    else:
+                        rowid = row[0]
+                        stale.discard(rowid)
+                        conn.execute(
+                            f"UPDATE places SET {', '.join(f'{name} = ?' for name in _PLACE_COLUMNS)}, collected_at = ? "
+                            "WHERE rowid = ?",
+                            values + [rowid],
+                        )
+                        conn.execute("DELETE FROM place_rtree WHERE id = ?", (rowid,))
+                        conn.execute("DELETE FROM place_activities WHERE place_rowid = ?", (rowid,))
+                    conn.execute(
+                        "INSERT INTO place_rtree VALUES (?, ?, ?, ?, ?)",
+                        (rowid, place["x"], place["x"], place["y"], place["y"]),
+                    )
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO place_activities VALUES (?, ?, ?)",
+                        [(rowid, activity, keyword) for activity, keyword in place["activities"]],
+                    )
+                for rowid in stale if complete else ():
+                    conn.execute("DELETE FROM place_rtree WHERE id = ?", (rowid,))
+                    conn.execute("DELETE FROM place_activities WHERE place_rowid = ?", (rowid,))
+                    conn.execute("DELETE FROM places WHERE rowid = ?", (rowid,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO cells VALUES (?, ?, ?, ?)",
+                    (cell[0], cell[1], time.time(), len(places)),
+                )
+
+    def stale_cells(self, cells: Iterable[Cell], max_age: float = PLACE_INDEX_MAX_AGE) -> List[Cell]:
+        """아직 수집하지 않았거나 max_age 보다 오래된 셀 (오래된 순)"""
+        with self._lock:
+            crawled = {
+                (ix, iy): crawled_at
+                for ix, iy, crawled_at in self._connection().execute("SELECT ix, iy, crawled_at FROM cells")
+            }
+        cutoff = time.time() - max_age
+        stale = [cell for cell in cells if crawled.get(cell, 0.0) < cutoff]
+        return sorted(stale, key=lambda cell: crawled.get(cell, 0.0))
+
+    def query(
+        self,
+        rect: Rect,
+        activities: List[str],
+        limit_per_activity: Optional[int] = None,
+        region: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        영역 안에서 활동 태그가 붙은 장소를 요청한 활동 순서대로 반환 (region 을 주면 그 시도만).
+        장소는 처음 일치한 활동으로 한 번만 나오고, activities 에 일치한 모든 요청 활동이 붙음
+        """
+        min_x, min_y, max_x, max_y = rect
+        results = []
+        seen: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            conn = self._connection()
+            for activity in dict.fromkeys(activities):
+                cursor = conn.execute(
+                    f"SELECT {', '.join('p.' + name for name in _PLACE_COLUMNS)}, p.collected_at, a.keyword "
+                    "FROM place_rtree r JOIN places p ON p.rowid = r.id "
+                    "JOIN place_activities a ON a.place_rowid = p.rowid AND a.activity = ? "
+                    # R-tree 는 float32 로 저장되므로 겹침으로 1차 필터 후 원래 좌표로 정확히 거름
+                    "WHERE r.max_x >= ? AND r.min_x <= ? AND r.max_y >= ? AND r.min_y <= ? "
+                    "AND p.x BETWEEN ? AND ? AND p.y BETWEEN ? AND ? "
+                    + ("AND p.region = ? " if region is not None else "")
+                    + "ORDER BY p.rowid" + (" LIMIT ?" if limit_per_activity else ""),
+                    (activity, min_x, max_x, min_y, max_y, min_x, max_x, min_y, max_y)
+                    + ((region,) if region is not None else ())
+                    + ((limit_per_activity,) if limit_per_activity else ()),
+                )
+                for row in cursor:
+                    place = dict(zip(_PLACE_COLUMNS + ("collected_at", "search_keyword"), row))
+                    existing = seen.get(place["id"])
+                    if existing is not None:
+                        if activity not in existing["activities"]:
+                            existing["activities"].append(activity)
+                        continue
+                    seen[place["id"]] = place
+                    place.update(activity=activity, activities=[activity], distance="", source="kakao_index")
+                    results.append(place)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connection()
+            places = conn.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+            cells, oldest = conn.execute("SELECT COUNT(*), MIN(crawled_at) FROM cells").fetchone()
+        return {
+            "places": places,
+            "crawled_cells": cells,
+            "oldest_cell_crawled_at": datetime.fromtimestamp(oldest).isoformat(timespec="seconds") if oldest else None,
+            "cell_size": self.cell_size,
+        }
+
+
+class CoastalPlaceCrawler:
+    """
+    PLACE_INDEX_BOUNDS 를 셀로 나눠 ACTIVITY_KEYWORDS 의 모든 키워드를 셀마다 한 번씩 검색해 인덱스에 저장.
+    refresh() 는 오래된 셀만 다시 수집하는 증분 갱신
+    """
+
+    def __init__(
+        self,
+        index: PlaceIndex,
+        kakao: KakaoLocalClient,
+        client_factory: Callable[[], httpx.AsyncClient],
+        bounds: str = PLACE_INDEX_BOUNDS,
+    ):
+        self.index = index
+        self.kakao = kakao
+        self.client_factory = client_factory
+        self.bounds = parse_rect(bounds)
+        self._task: Optional[asyncio.Task] = None
+
+    def coverage(self, rect: Optional[Rect] = None) -> List[Cell]:
+        """수집 대상 셀 목록"""
+        return cells_in_rect(rect or self.bounds, self.index.cell_size)
+
+    def cell_keywords(self, cell: Cell) -> List[str]:
+        """셀에서 검색할 키워드 (내륙 셀은 해안 마스크가 걸린 바다 전용 키워드를 뺌)"""
+        bounds = cell_rect(cell, self.index.cell_size)
+        keywords = []
+        for keyword in KEYWORD_ACTIVITIES:
+            keep = self.kakao.coast_filter_for(keyword)
+            if keep is None or keep(bounds):
+                keywords.append(keyword)
+        return keywords
+
+    async def crawl_cell(self, cell: Cell) -> int:
+        rect = format_rect(cell_rect(cell, self.index.cell_size))
+        keywords = self.cell_keywords(cell)
+        budgets = [SubdivisionBudget() for _ in keywords]
+        results = await asyncio.gather(
+            *(
+                self.kakao._search_keyword_pages(self.client_factory(), keyword, rect, None, budget)
+                for keyword, budget in zip(keywords, budgets)
+            )
+        )
+        if any(places is None or budget.failed for places, budget in zip(results, budgets)):
+            # 일부 키워드(또는 그 뒤 페이지)가 실패한 셀은 저장하지 않음. 빠진 장소를 지우지 않도록 다음 갱신에서 다시 수집
+            raise RuntimeError(f"Kakao search failed for cell {cell}")
+        truncated = any(budget.truncated for budget in budgets)
+        if truncated:
+            logger.warning("Place index crawl for cell %s hit the subdivision budget; keeping places missing from it", cell)
+
+        places: Dict[str, Dict[str, Any]] = {}
+        for keyword, found in zip(keywords, results):
+            for place in found:
+                entry = places.setdefault(place["id"], {**place, "activities": []})
+                tagged = {activity for activity, _ in entry["activities"]}
+                entry["activities"].extend(
+                    (activity, keyword) for activity in KEYWORD_ACTIVITIES[keyword] if activity not in tagged
+                )
+        await asyncio.to_thread(self.index.store_cell, cell, list(places.values()), not truncated)
+        return len(places)
+
+    async def crawl(self, cells: List[Cell]) -> Dict[str, int]:
+        crawled = failed = places = 0
+        for cell in cells:
+            try:
+                places += await self.crawl_cell(cell)
+                crawled += 1
+            except Exception as e:
+                failed += 1
+                logger.error("Place index crawl failed for cell %s: %s", cell, e)
+        return {"crawled_cells": crawled, "failed_cells": failed, "places": places}
+
+    async def refresh(self, max_cells: int = PLACE_INDEX_REFRESH_BATCH) -> Dict[str, int]:
+        stale = await asyncio.to_thread(self.index.stale_cells, self.coverage())
+        return await self.crawl(stale[:max_cells])
+
+    async def _run(self, interval: float):
+        while True:
+            try:
+                result = await self.refresh()
+                if result["crawled_cells"] or result["failed_cells"]:
+                    logger.info("Place index refresh: %s", result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Place index refresh failed: %s", e)
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float = PLACE_INDEX_REFRESH_INTERVAL):
+        if interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+async def _main(args):
+    from ..config import KAKAO_API_KEY
+
+    index = PlaceIndex()
+    if args.command == "stats":
+        print(index.stats())
+        return
+    async with httpx.AsyncClient(timeout=10) as client:
+        crawler = CoastalPlaceCrawler(index, KakaoLocalClient(KAKAO_API_KEY), lambda: client)
+        if args.command == "crawl":
+            cells = crawler.coverage(parse_rect(args.rect) if args.rect else None)
+            if not args.force:
+                cells = index.stale_cells(cells)
+        else:
+            cells = index.stale_cells(crawler.coverage())
+        cells = cells[:args.max_cells] if args.max_cells else cells
+        print(f"Crawling {len(cells)} cells (up to {len(KEYWORD_ACTIVITIES)} keywords each)...")
+        print(await crawler.crawl(cells))
+    print(index.stats())
+    index.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["crawl", "refresh", "stats"])
+    parser.add_argument("--rect", help="수집 영역 minLng,minLat,maxLng,maxLat (기본: PLACE_INDEX_BOUNDS)")
+    parser.add_argument("--max-cells", type=int, default=0, help="이번 실행에서 수집할 최대 셀 수")
+    parser.add_argument("--force", action="store_true", help="최근에 수집한 셀도 다시 수집")
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_main(parser.parse_args()))
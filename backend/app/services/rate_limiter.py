@@ -0,0 +1,210 @@
+import asyncio
+import hashlib
+import time
+from typing import Dict, Optional
+
+from ..config import (
+    KAKAO_QPS,
+    KAKAO_BURST,
+    KAKAO_CONCURRENCY_INITIAL,
+    KAKAO_CONCURRENCY_MIN,
+    KAKAO_CONCURRENCY_MAX,
+    KAKAO_BREAKER_FAILURES,
+    KAKAO_BREAKER_RESET,
+)
+
+
+class TokenBucket:
+    """
+    비동기 토큰 버킷 레이트 리미터.
+    초당 rate 개의 토큰이 채워지고 최대 burst 개까지 쌓이며, 대기자는 FIFO 순서로 처리됨
+    """
+
+    def __init__(self, rate: float, burst: int):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.total_acquired = 0
+        self.total_wait_seconds = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """토큰 1개를 소비하고, 토큰을 기다린 시간(초)을 반환"""
+        async with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            waited = 0.0
+            if self._tokens < 1:
+                waited = (1 - self._tokens) / self.rate
+                await asyncio.sleep(waited)
+                self._refill(time.monotonic())
+            self._tokens -= 1
+            self.total_acquired += 1
+            self.total_wait_seconds += waited
+            return waited
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.total_acquired,
+            "wait_seconds": round(self.total_wait_seconds, 3),
+        }
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD 방식의 동시 요청 수 제한.
+    성공하면 한도를 1/한도 씩 늘리고 (한도만큼 성공하면 +1), 429/5xx 면 한도를 절반으로 줄임.
+    한 번 줄인 뒤 cooldown 초 동안은 다시 줄이지 않아, 같은 시점에 보낸 요청들의 429 로 한도가 바닥나지 않게 함
+    """
+
+    def __init__(
+        self,
+        initial: int = KAKAO_CONCURRENCY_INITIAL,
+        min_limit: int = KAKAO_CONCURRENCY_MIN,
+        max_limit: int = KAKAO_CONCURRENCY_MAX,
+        cooldown: float = 1.0,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_overload(self):
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit / 2)
+        self.decreases += 1
+
+    def stats(self) -> Dict[str, float]:
+        return {"limit": round(self.limit, 2), "in_flight": self.in_flight, "decreases": self.decreases}
+
+
+class CircuitBreaker:
+    """
+    연속 실패(429/5xx/연결 오류)가 failure_threshold 번이면 reset_timeout 초 동안 요청을 막는 차단기.
+    시간이 지나면 요청 하나만 시험 삼아 통과시키고 (half-open), 성공하면 닫고 실패하면 다시 염.
+    시험 요청은 single_flight 의 공유 작업 안에서 돌아 대기 요청이 취소돼도 끝까지 결과를 기록하고,
+    공유 작업 자체가 취소돼 결과가 없으면 (종료 시 등) reset_timeout 이 지난 뒤 다시 시험함
+    """
+
+    def __init__(self, failure_threshold: int = KAKAO_BREAKER_FAILURES, reset_timeout: float = KAKAO_BREAKER_RESET):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.rejected = 0
+        self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    @property
+    def _probing(self) -> bool:
+        return self._probe_started is not None and time.monotonic() - self._probe_started < self.reset_timeout
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probe_started = time.monotonic()
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._clear_probe()
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probe_started is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._clear_probe()
+
+    def _clear_probe(self):
+        self._probe_started = None
+
+    def stats(self) -> Dict[str, object]:
+        return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
+
+
+# API 키별 프로세스 공용 버킷 (같은 키를 쓰는 클라이언트끼리 쿼터를 공유)
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(api_key: str, rate: float = KAKAO_QPS, burst: int = KAKAO_BURST) -> TokenBucket:
+    bucket = _buckets.get(api_key)
+    if bucket is None:
+        bucket = _buckets[api_key] = TokenBucket(rate, burst)
+    return bucket
+
+
+_concurrency_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_concurrency_limiter(api_key: str) -> AdaptiveConcurrencyLimiter:
+    limiter = _concurrency_limiters.get(api_key)
+    if limiter is None:
+        limiter = _concurrency_limiters[api_key] = AdaptiveConcurrencyLimiter()
+    return limiter
+
+
+def get_circuit_breaker(api_key: str) -> CircuitBreaker:
+    breaker = _circuit_breakers.get(api_key)
+    if breaker is None:
+        breaker = _circuit_breakers[api_key] = CircuitBreaker()
+    return breaker
+
+
+def _fingerprint(api_key: str) -> str:
+    return hashlib.sha1(api_key.encode("utf-8")).hexdigest()[:8]
+
+
+def rate_limiters() -> Dict[str, TokenBucket]:
+    """지표용: API 키 대신 키 지문(sha1 앞 8자리)을 이름으로 쓴 버킷 목록"""
+    return {_fingerprint(api_key): bucket for api_key, bucket in _buckets.items()}
+
+
+def concurrency_limiters() -> Dict[str, AdaptiveConcurrencyLimiter]:
+    return {_fingerprint(api_key): limiter for api_key, limiter in _concurrency_limiters.items()}
+
+
+def circuit_breakers() -> Dict[str, CircuitBreaker]:
+    return {_fingerprint(api_key): breaker for api_key, breaker in _circuit_breakers.items()}
@@ -0,0 +1,131 @@
+import json
+import logging
+import math
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..config import REGIONS_GEOJSON_PATH, REGION_MAX_OFFSHORE_DEG
+
+logger = logging.getLogger(__name__)
+
+Ring = List[Tuple[float, float]]  # [(lon, lat), ...]
+
+
+def point_in_ring(lon: float, lat: float, ring: Sequence[Tuple[float, float]]) -> bool:
+    """ray casting 으로 점이 다각형 고리 안에 있는지 판정"""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+class Region:
+    """시도 하나의 경계 (GeoJSON Polygon/MultiPolygon)"""
+
+    def __init__(self, name: str, polygons: List[List[Ring]]):
+        self.name = name
+        self.polygons = polygons  # [외곽 고리, 구멍 고리...] 목록
+        xs = [x for polygon in polygons for x, _ in polygon[0]]
+        ys = [y for polygon in polygons for _, y in polygon[0]]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self.area = (self.bbox[2] - self.bbox[0]) * (self.bbox[3] - self.bbox[1])
+
+    def contains(self, lon: float, lat: float) -> bool:
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= lon <= max_x and min_y <= lat <= max_y):
+            return False
+        for outer, *holes in self.polygons:
+            if point_in_ring(lon, lat, outer) and not any(point_in_ring(lon, lat, hole) for hole in holes):
+                return True
+        return False
+
+    def bbox_distance(self, lon: float, lat: float) -> float:
+        min_x, min_y, max_x, max_y = self.bbox
+        dx = max(min_x - lon, 0.0, lon - max_x)
+        dy = max(min_y - lat, 0.0, lat - max_y)
+        return (dx * dx + dy * dy) ** 0.5
+
+
+def load_regions(path: str = REGIONS_GEOJSON_PATH) -> List[Region]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            features = json.load(f).get("features", [])
+    except (OSError, ValueError) as e:
+        logger.warning("Region boundaries not loaded from %s: %s", path, e)
+        return []
+    regions = []
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        coordinates = geometry.get("coordinates") or []
+        polygons = [coordinates] if geometry.get("type") == "Polygon" else coordinates
+        polygons = [[[tuple(point[:2]) for point in ring] for ring in polygon] for polygon in polygons if polygon]
+        if polygons:
+            regions.append(Region(feature.get("properties", {}).get("name", ""), polygons))
+    return regions
+
+
+class RegionIndex:
+    """
+    시도 다각형 색인. 격자 버킷(bucket_deg)마다 bbox 가 겹치는 시도 목록을 미리 만들어 두고,
+    조회 시 그 후보에만 point-in-polygon 을 적용함
+    """
+
+    def __init__(
+        self,
+        regions: Iterable[Region],
+        bucket_deg: float = 0.25,
+        max_offshore_deg: float = REGION_MAX_OFFSHORE_DEG,
+    ):
+        # 경계가 겹치면 더 작은 쪽(광역시 등)이 이기도록 면적 오름차순
+        self.regions = sorted(regions, key=lambda region: region.area)
+        self.names = frozenset(region.name for region in self.regions)
+        self.bucket_deg = bucket_deg
+        self.max_offshore_deg = max_offshore_deg
+        self._buckets: Dict[Tuple[int, int], List[Region]] = {}
+        for region in self.regions:
+            min_x, min_y, max_x, max_y = region.bbox
+            for ix in range(self._bucket(min_x), self._bucket(max_x) + 1):
+                for iy in range(self._bucket(min_y), self._bucket(max_y) + 1):
+                    self._buckets.setdefault((ix, iy), []).append(region)
+
+    def _bucket(self, value: float) -> int:
+        return math.floor(value / self.bucket_deg)
+
+    def lookup(self, lat: float, lon: float) -> Optional[str]:
+        """
+        좌표가 속한 시도 이름.
+        어느 경계에도 없으면 max_offshore_deg 안의 가장 가까운 시도 (해상 관측소·해안 장소용)
+        """
+        for region in self._buckets.get((self._bucket(lon), self._bucket(lat)), ()):
+            if region.contains(lon, lat):
+                return region.name
+        nearest = min(self.regions, key=lambda region: region.bbox_distance(lon, lat), default=None)
+        if nearest is not None and nearest.bbox_distance(lon, lat) <= self.max_offshore_deg:
+            return nearest.name
+        return None
+
+
+@lru_cache(maxsize=1)
+def default_region_index() -> RegionIndex:
+    return RegionIndex(load_regions())
+
+
+def region_of(lat: float, lon: float) -> Optional[str]:
+    return default_region_index().lookup(lat, lon)
+
+
+def region_names() -> frozenset:
+    return default_region_index().names
+
+
+def tag_regions(items: Iterable[Dict[str, Any]], lat_key: str = "lat", lon_key: str = "lon") -> None:
+    """각 항목에 region 키를 붙임 (좌표가 없으면 None)"""
+    index = default_region_index()
+    for item in items:
+        lat, lon = item.get(lat_key), item.get(lon_key)
+        item["region"] = index.lookup(lat, lon) if lat is not None and lon is not None else None
@@ -0,0 +1,50 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    동시에 들어온 같은 키의 업스트림 호출을 하나로 합치는 in-process single-flight.
+    첫 호출만 실제로 실행되고, 진행 중에 들어온 같은 키의 호출은 그 결과(또는 예외)를 공유함.
+    키의 첫 요소는 업스트림 이름으로 보고 통계를 나눠 집계함
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, key: Tuple, field: str):
+        upstream = str(key[0])
+        stats = self._stats.setdefault(upstream, {"calls": 0, "coalesced": 0})
+        stats[field] += 1
+
+    async def do(self, key: Tuple, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._inflight.get(key)
+        if future is not None:
+            self._count(key, "coalesced")
+        else:
+            self._count(key, "calls")
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        # 대기 중인 호출 하나가 취소돼도 공유 작업은 취소되지 않도록 shield
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Tuple, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # 대기자가 모두 취소된 뒤 실패하면 아무도 예외를 꺼내지 않아 "exception was never retrieved" 로그가 남으므로 여기서 회수
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "upstreams": {name: dict(counts) for name, counts in self._stats.items()},
+        }
+
+
+# 프로세스 공용 인스턴스
+single_flight = SingleFlight()
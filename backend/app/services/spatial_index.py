@@ -0,0 +1,107 @@
+import heapq
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+# 한반도 주변(위도 33~39도)에서는 등장방형 투영으로도 최근접 순서가 충분히 정확함
+_KM_PER_DEG_LAT = 110.574
+_KM_PER_DEG_LON = 111.320
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class KDTree:
+    """
+    위경도 점 집합에 대한 2차원 KD-트리.
+    점들을 기준 위도의 등장방형 평면(km)으로 투영해 만들고, 최근접 결과의 거리는 하버사인으로 계산함
+    """
+
+    def __init__(self, points: Sequence[Tuple[float, float]]):
+        # points: (lat, lon) 목록. 결과는 이 목록의 인덱스로 반환
+        self.points = list(points)
+        self._lat0 = (sum(p[0] for p in self.points) / len(self.points)) if self.points else 36.0
+        self._kx = _KM_PER_DEG_LON * math.cos(math.radians(self._lat0))
+        xy = [self._project(lat, lon) + (i,) for i, (lat, lon) in enumerate(self.points)]
+        # 노드: (x, y, 점 인덱스, 분할 축, 왼쪽, 오른쪽)
+        self._root = self._build(xy, 0)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _project(self, lat: float, lon: float) -> Tuple[float, float]:
+        return lon * self._kx, lat * _KM_PER_DEG_LAT
+
+    def _build(self, xy: List[Tuple[float, float, int]], depth: int) -> Optional[tuple]:
+        if not xy:
+            return None
+        axis = depth % 2
+        xy.sort(key=lambda p: p[axis])
+        mid = len(xy) // 2
+        x, y, idx = xy[mid]
+        return (x, y, idx, axis, self._build(xy[:mid], depth + 1), self._build(xy[mid + 1:], depth + 1))
+
+    def query(self, lat: float, lon: float, k: int = 1) -> List[Tuple[int, float]]:
+        """(lat, lon) 에서 가까운 순으로 k 개의 (점 인덱스, 거리 km) 를 반환"""
+        if self._root is None or k <= 0:
+            return []
+        qx, qy = self._project(lat, lon)
+        heap: List[Tuple[float, int]] = []  # (-거리², 인덱스) 최대 힙
+        stack = [(self._root, 0.0)]  # (노드, 분할면까지의 최소 거리²)
+        while stack:
+            node, bound = stack.pop()
+            # 분할면까지의 거리가 현재 k 번째 거리보다 멀면 이 서브트리는 건너뜀
+            if node is None or (len(heap) == k and bound >= -heap[0][0]):
+                continue
+            x, y, idx, axis, left, right = node
+            d2 = (x - qx) ** 2 + (y - qy) ** 2
+            if len(heap) < k:
+                heapq.heappush(heap, (-d2, idx))
+            elif d2 < -heap[0][0]:
+                heapq.heapreplace(heap, (-d2, idx))
+            diff = (qx - x) if axis == 0 else (qy - y)
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+        found = sorted((-neg_d2, idx) for neg_d2, idx in heap)
+        return [(idx, haversine_km(lat, lon, *self.points[idx])) for _, idx in found]
+
+    def query_many(self, coords: Sequence[Tuple[float, float]]) -> List[Optional[Tuple[int, float]]]:
+        """여러 좌표의 최근접 점을 한 번에 조회 (점이 없으면 None)"""
+        results = []
+        for lat, lon in coords:
+            found = self.query(lat, lon, 1)
+            results.append(found[0] if found else None)
+        return results
+
+
+class StationIndex:
+    """관측소 목록 위의 KD-트리 (스냅샷이 갱신될 때마다 새로 생성)"""
+
+    def __init__(self, stations: Sequence[Dict[str, Any]]):
+        self.stations = [s for s in stations if s.get("lat") is not None and s.get("lon") is not None]
+        self.tree = KDTree([(s["lat"], s["lon"]) for s in self.stations])
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Dict[str, Any]]:
+        """가까운 순으로 k 개 관측소를 distance_km 를 붙여 반환"""
+        return [
+            {**self.stations[idx], "distance_km": round(dist, 3)}
+            for idx, dist in self.tree.query(lat, lon, k)
+        ]
+
+    def attach_nearest_conditions(self, places: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """각 장소(x=경도, y=위도)에 최근접 관측소의 수온·파고를 붙임"""
+        matches = self.tree.query_many([(p["y"], p["x"]) for p in places])
+        for place, match in zip(places, matches):
+            if match is None:
+                continue
+            station = self.stations[match[0]]
+            place["nearest_station_id"] = station["station_id"]
+            place["station_distance_km"] = round(match[1], 3)
+            place["sst"] = station.get("sst")
+            place["wave_height"] = station.get("wave_height")
+        return places
@@ -0,0 +1,160 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from ..config import STATION_EVENTS_HEARTBEAT, STATION_EVENTS_MAX_CLIENTS, STATION_EVENTS_QUEUE_SIZE
+from ..responses import json_bytes
+from .place_cache import Rect
+from .station_snapshot import StationDiffLog, StationSnapshot
+
+FilterKey = Tuple[Optional[str], Optional[Rect]]
+
+
+def sse_message(event: str, payload: Any, event_id: Optional[int] = None) -> bytes:
+    head = f"event: {event}\n" + (f"id: {event_id}\n" if event_id is not None else "")
+    return head.encode("utf-8") + b"data: " + json_bytes(payload) + b"\n\n"
+
+
+def _matches(station: Dict[str, Any], region: Optional[str], bounds: Optional[Rect]) -> bool:
+    if region is not None and station.get("region") != region:
+        return False
+    if bounds is not None:
+        min_lng, min_lat, max_lng, max_lat = bounds
+        return min_lng <= station["lon"] <= max_lng and min_lat <= station["lat"] <= max_lat
+    return True
+
+
+def stations_payload(
+    snapshot: StationSnapshot,
+    changed: Iterable[str],
+    removed: Iterable[str],
+    since: Optional[int],
+    region: Optional[str] = None,
+    bounds: Optional[Rect] = None,
+) -> Dict[str, Any]:
+    """/api/stations?since= 와 같은 형태의 변경분 (필터에 맞는 관측소만, 사라진 ID 는 모두)"""
+    stations = [
+        snapshot.by_id[station_id] for station_id in sorted(changed)
+        if _matches(snapshot.by_id[station_id], region, bounds)
+    ]
+    return {
+        "stations": stations,
+        "removed": sorted(removed),
+        "count": len(stations),
+        "updated_at": snapshot.updated_at,
+        "version": snapshot.version,
+        "since": since,
+        "full": False,
+    }
+
+
+class StationSubscriber:
+    def __init__(self, region: Optional[str], bounds: Optional[Rect], queue_size: int):
+        self.filter: FilterKey = (region, bounds)
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+
+class StationBroadcaster:
+    """
+    스냅샷이 바뀔 때마다 바뀐 관측소를 구독 중인 SSE 클라이언트 모두에게 보냄.
+    같은 필터(시도, 영역)의 클라이언트는 한 번 직렬화한 메시지를 공유하고,
+    큐가 가득 찬 느린 클라이언트는 resync 이벤트를 보내고 끊음 (다시 연결해 since 로 따라잡음)
+    """
+
+    def __init__(
+        self,
+        diffs: StationDiffLog,
+        queue_size: int = STATION_EVENTS_QUEUE_SIZE,
+        max_clients: int = STATION_EVENTS_MAX_CLIENTS,
+        heartbeat: float = STATION_EVENTS_HEARTBEAT,
+    ):
+        self.diffs = diffs
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        self.heartbeat = heartbeat
+        self._subscribers: Set[StationSubscriber] = set()
+        self.published = 0
+        self.dropped = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_clients
+
+    def publish(self, snapshot: StationSnapshot):
+        """StationRefresher 구독 콜백. 직전 스냅샷과의 변경분을 모든 구독자에게 보냄"""
+        diff = self.diffs.latest
+        if diff is None or diff.to_version != snapshot.version or not self._subscribers:
+            return
+        if not diff.changed and not diff.removed:
+            return
+        messages: Dict[FilterKey, Optional[bytes]] = {}
+        for subscriber in list(self._subscribers):
+            if subscriber.filter not in messages:
+                payload = stations_payload(snapshot, diff.changed, diff.removed, diff.from_version, *subscriber.filter)
+                # 필터 밖 변경뿐이면 그 필터의 구독자에게는 보내지 않음
+                messages[subscriber.filter] = (
+                    sse_message("stations", payload, snapshot.version) if payload["stations"] or payload["removed"] else None
+                )
+            message = messages[subscriber.filter]
+            if message is not None:
+                self._offer(subscriber, message)
+        self.published += 1
+
+    def _offer(self, subscriber: StationSubscriber, message: bytes):
+        try:
+            subscriber.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # 밀린 메시지는 버리고 resync 만 남김. 스트림은 resync 를 보낸 뒤 종료
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(sse_message("resync", {"reason": "slow consumer"}))
+            self._drop(subscriber)
+
+    def _drop(self, subscriber: StationSubscriber):
+        if subscriber in self._subscribers:
+            self._subscribers.discard(subscriber)
+            subscriber.dropped = True
+            self.dropped += 1
+
+    async def stream(
+        self,
+        current: Callable[[], StationSnapshot],
+        since: Optional[int] = None,
+        region: Optional[str] = None,
+        bounds: Optional[Rect] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        한 클라이언트의 SSE 스트림. since(또는 Last-Event-ID)가 있으면 먼저 그 뒤의 변경분을 보내고,
+        변경분이 이어지지 않으면 resync 를 보냄. 이후 갱신마다 stations 이벤트, 조용할 때는 heartbeat 주석
+        """
+        subscriber = StationSubscriber(region, bounds, self.queue_size)
+        self._subscribers.add(subscriber)
+        # 구독 등록과 같은 시점의 스냅샷을 기준으로 삼아야 그 사이 갱신을 놓치지 않음
+        snapshot = current()
+        try:
+            yield b"retry: 5000\n\n"
+            if since is not None and snapshot.ready:
+                delta = self.diffs.since(since, snapshot.version)
+                if delta is None:
+                    yield sse_message("resync", {"reason": "too far behind", "version": snapshot.version})
+                elif delta[0] or delta[1]:
+                    yield sse_message("stations", stations_payload(snapshot, *delta, since, region, bounds), snapshot.version)
+            yield sse_message("ready", {"version": snapshot.version}, snapshot.version if snapshot.ready else None)
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield message
+                if subscriber.dropped and subscriber.queue.empty():
+                    return
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,313 @@
+import asyncio
+import inspect
+import logging
+import os
+import socket
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import cached_property
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from ..config import (
+    KMA_REFRESH_INTERVAL,
+    KMA_SNAPSHOT_MAX_AGE,
+    KMA_FOLLOWER_POLL_INTERVAL,
+    KMA_RETRY_INTERVAL,
+    STATION_DIFF_HISTORY,
+)
+from .cache_backend import CacheBackend
+from .kma_client import SeaObsColumns, fetch_sea_obs_text, parse_sea_obs_columns
+from .clustering import GridClusterIndex
+from .spatial_index import StationIndex
+from .suitability import SuitabilityIndex
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+# 공유 캐시 저장소의 스냅샷 원문 키와 리더 임대 이름
+_SHARED_SNAPSHOT_KEY = "kma:sea_obs:snapshot"
+_REFRESH_LEASE = "kma:sea_obs:refresher"
+
+
+@dataclass
+class StationSnapshot:
+    """
+    한 번의 sea_obs.php(stn=0) 조회 결과.
+    컬럼 구조로 보관하고, dict 목록·station_id 색인·KD-트리는 처음 필요할 때 한 번만 만듦
+    """
+
+    columns: SeaObsColumns = field(default_factory=SeaObsColumns)
+    fetched_at: Optional[float] = None  # time.time()
+    _region_clusters: Dict[str, GridClusterIndex] = field(default_factory=dict, init=False, repr=False)
+
+    @cached_property
+    def stations(self) -> List[Dict[str, Any]]:
+        return self.columns.to_dicts()
+
+    @cached_property
+    def by_id(self) -> Dict[str, Dict[str, Any]]:
+        latest: Dict[str, int] = {}
+        station_ids = self.columns.column("station_id")
+        observed_at = self.columns.column("observed_at")
+        for i, station_id in enumerate(station_ids):
+            # 같은 지점이 여러 시각으로 내려오면 가장 최근 관측을 사용
+            current = latest.get(station_id)
+            if current is None or observed_at[i] >= observed_at[current]:
+                latest[station_id] = i
+        # 지점별 최신 행만 dict 로 만듦 (전체 목록을 이미 만들었으면 그 dict 를 그대로 사용)
+        stations = self.__dict__.get("stations")
+        row = self.columns.row if stations is None else stations.__getitem__
+        return {station_id: row(i) for station_id, i in latest.items()}
+
+    @cached_property
+    def index(self) -> StationIndex:
+        # 최근접 관측소 조회용 KD-트리 (스냅샷마다 새로 생성)
+        return StationIndex(list(self.by_id.values()))
+
+    @cached_property
+    def clusters(self) -> GridClusterIndex:
+        # 줌 레벨별 격자 클러스터 (스냅샷마다 새로 생성)
+        return GridClusterIndex(self.by_id.values(), id_key="station_id")
+
+    @cached_property
+    def by_region(self) -> Dict[Optional[str], List[Dict[str, Any]]]:
+        # 시도별 관측소 목록 (region 은 파싱 시 한 번 판정됨)
+        grouped: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        for station in self.stations:
+            grouped.setdefault(station["region"], []).append(station)
+        return grouped
+
+    def region_clusters(self, region: str) -> GridClusterIndex:
+        """한 시도 관측소만의 격자 클러스터 (시도별로 처음 요청될 때 만듦)"""
+        index = self._region_clusters.get(region)
+        if index is None:
+            stations = [station for station in self.by_id.values() if station["region"] == region]
+            index = self._region_clusters[region] = GridClusterIndex(stations, id_key="station_id")
+        return index
+
+    @cached_property
+    def suitability(self) -> SuitabilityIndex:
+        # 활동별 적합도 순위 (스냅샷마다 새로 생성)
+        return SuitabilityIndex(self.by_id.values())
+
+    @property
+    def ready(self) -> bool:
+        return self.fetched_at is not None
+
+    @property
+    def version(self) -> int:
+        """
+        스냅샷 버전 (조회 시각 ms). 공유 저장소의 같은 원문으로 만든 스냅샷은 워커가 달라도 같은 버전이고,
+        재시작해도 줄어들지 않음
+        """
+        return 0 if self.fetched_at is None else int(self.fetched_at * 1000)
+
+    @property
+    def age_seconds(self) -> Optional[float]:
+        if self.fetched_at is None:
+            return None
+        return max(0.0, time.time() - self.fetched_at)
+
+    @property
+    def stale(self) -> bool:
+        age = self.age_seconds
+        return age is None or age > KMA_SNAPSHOT_MAX_AGE
+
+    @cached_property
+    def observed_at(self) -> Optional[str]:
+        """스냅샷에서 가장 최근 관측 시각 (KST YYYYMMDDHHMM)"""
+        return max(self.columns.column("observed_at"), default=None)
+
+    @property
+    def observed_datetime(self) -> Optional[datetime]:
+        try:
+            return datetime.strptime(self.observed_at, "%Y%m%d%H%M").replace(tzinfo=KST)
+        except (TypeError, ValueError):
+            return None
+
+    @property
+    def updated_at(self) -> Optional[str]:
+        if self.fetched_at is None:
+            return None
+        return datetime.fromtimestamp(self.fetched_at).isoformat(timespec="seconds")
+
+
+@dataclass
+class StationDiff:
+    """연속한 두 스냅샷 사이에 관측값이 바뀐(새로 생긴 포함) 지점과 사라진 지점"""
+
+    from_version: int
+    to_version: int
+    changed: Set[str]
+    removed: Set[str]
+
+    @classmethod
+    def between(cls, old: StationSnapshot, new: StationSnapshot) -> "StationDiff":
+        old_by_id, new_by_id = old.by_id, new.by_id
+        changed = {station_id for station_id, station in new_by_id.items() if old_by_id.get(station_id) != station}
+        return cls(old.version, new.version, changed, set(old_by_id) - set(new_by_id))
+
+
+class StationDiffLog:
+    """최근 스냅샷 변경분의 고정 길이 링. 클라이언트 버전부터 현재까지 이어지는 변경분을 합쳐 줌"""
+
+    def __init__(self, size: int = STATION_DIFF_HISTORY):
+        self._diffs: Deque[StationDiff] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._diffs)
+
+    def record(self, diff: StationDiff):
+        self._diffs.append(diff)
+
+    @property
+    def latest(self) -> Optional[StationDiff]:
+        return self._diffs[-1] if self._diffs else None
+
+    def since(self, version: int, current: int) -> Optional[Tuple[Set[str], Set[str]]]:
+        """
+        version 이후 current 까지 (바뀐 지점, 사라진 지점). 링에 없는 버전이거나 중간이 끊겼으면
+        (워커가 일부 갱신을 건너뛴 경우 등) None → 전체 응답
+        """
+        if version == current:
+            return set(), set()
+        changed: Set[str] = set()
+        removed: Set[str] = set()
+        expected = version
+        for diff in self._diffs:
+            if diff.to_version <= version:
+                continue
+            if diff.from_version != expected:
+                return None
+            changed = (changed - diff.removed) | diff.changed
+            removed = (removed - diff.changed) | diff.removed
+            expected = diff.to_version
+        return (changed, removed) if expected == current else None
+
+
+class StationRefresher:
+    """
+    KMA sea_obs.php 를 주기적으로 조회해 StationSnapshot 을 통째로 교체하는 백그라운드 작업.
+    요청 처리 쪽은 snapshot 속성만 읽으므로 별도 락 없이 항상 일관된 스냅샷을 봄.
+    공유 캐시 저장소(backend.shared)가 주어지면 임대를 잡은 리더 워커만 KMA 를 조회해 원문을 저장하고,
+    나머지 워커는 저장된 원문으로 같은 스냅샷을 만듦
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], httpx.AsyncClient],
+        interval: float = KMA_REFRESH_INTERVAL,
+        backend: Optional[CacheBackend] = None,
+        follower_interval: float = KMA_FOLLOWER_POLL_INTERVAL,
+        retry_interval: float = KMA_RETRY_INTERVAL,
+    ):
+        self.client_factory = client_factory
+        self.interval = interval
+        self.backend = backend if backend is not None and backend.shared else None
+        self.follower_interval = follower_interval
+        self.retry_interval = retry_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = self.backend is None
+        self.snapshot = StationSnapshot()
+        self.diffs = StationDiffLog()
+        self._listeners: List[Tuple[Callable[[StationSnapshot], Any], bool]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, listener: Callable[[StationSnapshot], Any], leader_only: bool = False):
+        """
+        스냅샷이 교체될 때마다 호출될 콜백 등록 (async 함수도 가능).
+        leader_only=True 면 KMA 를 직접 조회한 워커에서만 호출 (공유 DB 에 쓰는 작업 등)
+        """
+        self._listeners.append((listener, leader_only))
+
+    async def refresh(self) -> StationSnapshot:
+        """sea_obs.php 를 한 번 조회해 스냅샷을 교체. 실패하거나 빈 응답이면 기존 스냅샷 유지"""
+        text = await fetch_sea_obs_text(self.client_factory(), 0, timeout=15)
+        columns = parse_sea_obs_columns(text)
+        if not len(columns):
+            logger.warning("sea_obs refresh returned no stations; keeping previous snapshot")
+            return self.snapshot
+        snapshot = StationSnapshot(columns=columns, fetched_at=time.time())
+        if self.backend is not None:
+            payload = {"fetched_at": snapshot.fetched_at, "text": text}
+            await asyncio.to_thread(self.backend.set, _SHARED_SNAPSHOT_KEY, payload, KMA_SNAPSHOT_MAX_AGE * 4, pinned=True)
+        await self._publish(snapshot, leader=True)
+        return snapshot
+
+    async def sync_shared(self) -> StationSnapshot:
+        """공유 저장소의 스냅샷이 지금 것보다 새로우면 그 원문으로 스냅샷을 교체"""
+        shared = await asyncio.to_thread(self.backend.get, _SHARED_SNAPSHOT_KEY, True)
+        if shared is None or shared["fetched_at"] == self.snapshot.fetched_at:
+            return self.snapshot
+        columns = parse_sea_obs_columns(shared["text"])
+        if len(columns):
+            await self._publish(StationSnapshot(columns=columns, fetched_at=shared["fetched_at"]), leader=False)
+        return self.snapshot
+
+    async def _publish(self, snapshot: StationSnapshot, leader: bool):
+        if self.snapshot.ready:
+            self.diffs.record(StationDiff.between(self.snapshot, snapshot))
+        self.snapshot = snapshot
+        for listener, leader_only in self._listeners:
+            if leader_only and not leader:
+                continue
+            try:
+                result = listener(snapshot)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Station snapshot listener failed")
+
+    async def _tick(self) -> float:
+        """한 번 갱신하고 다음 갱신까지 기다릴 시간(초)을 반환"""
+        if self.backend is None:
+            await self.refresh()
+            return self.interval
+        # 리더가 죽으면 임대가 만료된 뒤 다른 워커가 이어받음
+        self.is_leader = await asyncio.to_thread(
+            self.backend.acquire_lease, _REFRESH_LEASE, self.worker_id, self.interval * 2 + self.follower_interval
+        )
+        await self.sync_shared()
+        if not self.is_leader:
+            return self.follower_interval
+        # 리더가 막 바뀐 경우 이전 리더가 조회한 스냅샷이 아직 새로우면 다시 조회하지 않음
+        age = self.snapshot.age_seconds
+        if age is None or age >= self.interval * 0.9:
+            await self.refresh()
+        return self.interval
+
+    async def _run(self):
+        retry_delay = self.retry_interval
+        while True:
+            delay = self.interval if self.is_leader else self.follower_interval
+            try:
+                delay = await self._tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("sea_obs refresh failed: %s", e)
+            if not self.snapshot.ready:
+                # 아직 첫 스냅샷이 없으면 갱신 주기까지 기다리지 않고 짧은 간격부터 늘려 가며 다시 시도
+                delay = min(delay, retry_delay)
+                retry_delay = min(retry_delay * 2, self.interval)
+            await asyncio.sleep(delay)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self.backend is not None and self.is_leader:
+            await asyncio.to_thread(self.backend.release_lease, _REFRESH_LEASE, self.worker_id)
@@ -0,0 +1,151 @@
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .regions import region_of
+
+# 활동별 변수 적합도 구간: (하한, 이상적 하한, 이상적 상한, 상한, 가중치)
+# 이상 구간 안이면 1, 하한/상한 밖이면 0, 그 사이는 선형 (사다리꼴)
+ACTIVITY_PROFILES: Dict[str, Dict[str, Tuple[float, float, float, float, float]]] = {
+    "surfing": {
+        "wave_height": (0.5, 1.0, 2.5, 4.0, 3.0),
+        "wind_speed": (0.0, 0.0, 6.0, 12.0, 1.0),
+        "wind_gust": (0.0, 0.0, 10.0, 18.0, 0.5),
+        "sst": (8.0, 18.0, 28.0, 32.0, 0.5),
+    },
+    "scuba": {
+        "wave_height": (0.0, 0.0, 0.8, 2.0, 2.0),
+        "wind_speed": (0.0, 0.0, 6.0, 12.0, 1.0),
+        "wind_gust": (0.0, 0.0, 9.0, 16.0, 0.5),
+        "sst": (10.0, 20.0, 30.0, 32.0, 1.0),
+    },
+    "snorkel": {
+        "wave_height": (0.0, 0.0, 0.5, 1.2, 2.0),
+        "wind_speed": (0.0, 0.0, 5.0, 10.0, 1.0),
+        "sst": (16.0, 23.0, 30.0, 32.0, 1.5),
+    },
+    "freedive": {
+        "wave_height": (0.0, 0.0, 0.6, 1.5, 2.0),
+        "wind_speed": (0.0, 0.0, 6.0, 11.0, 1.0),
+        "sst": (12.0, 21.0, 30.0, 32.0, 1.0),
+    },
+    "kayak": {
+        "wave_height": (0.0, 0.0, 0.5, 1.5, 2.0),
+        "wind_speed": (0.0, 0.0, 5.0, 10.0, 2.0),
+        "wind_gust": (0.0, 0.0, 8.0, 14.0, 1.0),
+    },
+    "yacht": {
+        "wave_height": (0.0, 0.2, 1.5, 3.0, 1.0),
+        "wind_speed": (2.0, 5.0, 10.0, 15.0, 2.0),
+        "wind_gust": (0.0, 0.0, 14.0, 20.0, 1.0),
+    },
+    "jetski": {
+        "wave_height": (0.0, 0.0, 0.8, 2.0, 2.0),
+        "wind_speed": (0.0, 0.0, 8.0, 14.0, 1.0),
+        "sst": (10.0, 18.0, 30.0, 32.0, 0.5),
+    },
+    "windsurf": {
+        "wind_speed": (3.0, 7.0, 12.0, 18.0, 3.0),
+        "wind_gust": (0.0, 0.0, 16.0, 22.0, 1.0),
+        "wave_height": (0.0, 0.0, 1.5, 3.0, 1.0),
+    },
+    "fishing": {
+        "wave_height": (0.0, 0.0, 1.0, 2.5, 2.0),
+        "wind_speed": (0.0, 0.0, 7.0, 13.0, 1.5),
+    },
+    "beach": {
+        "wave_height": (0.0, 0.0, 0.8, 2.0, 1.5),
+        "wind_speed": (0.0, 0.0, 6.0, 11.0, 1.0),
+        "sst": (18.0, 23.0, 29.0, 32.0, 2.0),
+    },
+}
+
+# 응답에 함께 싣는 관측값
+_OBSERVATION_KEYS = ("wave_height", "wind_speed", "wind_gust", "sst")
+
+
+def _trapezoid(value: float, low: float, ideal_low: float, ideal_high: float, high: float) -> float:
+    if value < ideal_low:
+        return 0.0 if value <= low else (value - low) / (ideal_low - low)
+    if value > ideal_high:
+        return 0.0 if value >= high else (high - value) / (high - ideal_high)
+    return 1.0
+
+
+def score_columns(columns: Dict[str, array], activity: str) -> array:
+    """
+    관측값 컬럼(array('d'), 결측 NaN)으로 모든 관측소의 활동 적합도(0~100)를 한 번에 계산.
+    변수별 사다리꼴 점수의 가중 기하평균이며, 결측 변수는 빼고 남은 가중치로 다시 정규화함.
+    가중치가 가장 큰 핵심 변수(서핑의 파고 등)가 결측이면 NaN
+    """
+    profile = ACTIVITY_PROFILES[activity]
+    key_variable = max(profile, key=lambda name: profile[name][4])
+    n = len(next(iter(columns.values()))) if columns else 0
+    log_sum = array("d", bytes(8 * n))
+    weights = array("d", bytes(8 * n))
+    for name, (low, ideal_low, ideal_high, high, weight) in profile.items():
+        column = columns.get(name)
+        if column is None:
+            continue
+        for i, value in enumerate(column):
+            if value != value:  # NaN
+                continue
+            score = _trapezoid(value, low, ideal_low, ideal_high, high)
+            # log(0) 대신 -inf 를 더해 한 변수라도 한계를 넘으면 0점
+            log_sum[i] += math.log(score) if score > 0 else -math.inf
+            weights[i] += weight
+    key_column = columns.get(key_variable)
+    return array("d", (
+        math.exp(total / weight) * 100 if key_column is not None and key_column[i] == key_column[i] else math.nan
+        for i, (total, weight) in enumerate(zip(log_sum, weights))
+    ))
+
+
+class SuitabilityIndex:
+    """
+    스냅샷 관측소 전체의 활동별 적합도와 순위를 미리 계산해 둔 색인.
+    top() 은 정렬된 목록을 자르기만 하므로 요청 시 계산이 없음
+    """
+
+    def __init__(self, stations: Iterable[Dict[str, Any]]):
+        stations = list(stations)
+        columns = {
+            name: array("d", (math.nan if s.get(name) is None else s[name] for s in stations))
+            for name in _OBSERVATION_KEYS
+        }
+        # 스냅샷 관측소는 수집 시 region 이 붙어 있음
+        regions = [
+            s["region"] if "region" in s
+            else region_of(s["lat"], s["lon"]) if s.get("lat") is not None and s.get("lon") is not None
+            else None
+            for s in stations
+        ]
+        self.total = len(stations)
+        # 활동 -> 점수 내림차순 항목 목록, (활동, 시도) -> 그 시도만의 목록
+        self._rankings: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_region: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for activity in ACTIVITY_PROFILES:
+            scores = score_columns(columns, activity)
+            ranked = sorted((i for i, score in enumerate(scores) if score == score), key=lambda i: -scores[i])
+            entries = []
+            for i in ranked:
+                station = stations[i]
+                entry = {
+                    "station_id": station.get("station_id"),
+                    "station_name": station.get("station_name"),
+                    "lat": station.get("lat"),
+                    "lon": station.get("lon"),
+                    "region": regions[i],
+                    "score": round(scores[i], 1),
+                    **{name: station.get(name) for name in _OBSERVATION_KEYS},
+                    "observed_at": station.get("observed_at"),
+                }
+                entries.append(entry)
+                if regions[i] is not None:
+                    self._by_region.setdefault((activity, regions[i]), []).append(entry)
+            self._rankings[activity] = entries
+
+    def top(self, activity: str, k: int = 10, region: Optional[str] = None) -> List[Dict[str, Any]]:
+        if region is None:
+            return self._rankings.get(activity, [])[:k]
+        return self._by_region.get((activity, region), [])[:k]
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+로컬 업스트림 대역(benchmarks.mock_upstreams)을 띄워 두고 백엔드 API 에 부하를 거는 벤치마크
+
+실행: cd backend && python -m benchmarks.load --requests 500 --concurrency 32 --latency-ms 80 --rate-429 0.02
+
+1. 목 업스트림 서버를 같은 프로세스에서 띄우고
+2. 백엔드(uvicorn app.main:app)를 KMA_BASE_URL/KHOA_BASE_URL/KAKAO_BASE_URL 을 목 서버로 바꿔 하위 프로세스로 실행한 뒤
+3. 시나리오별(/api/stations, /api/conditions, /api/places/in-rect)로 정해진 동시성으로 요청을 보내
+   p50/p95/p99 지연, 처리량, 상태 코드, 시나리오 동안의 업스트림 호출 수를 출력함
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import uvicorn
+
+from .mock_upstreams import add_mock_arguments, create_app, mock_config_from_args
+
+SCENARIOS = ("stations", "conditions", "places")
+
+# 장소 검색 영역 후보 (해안 위주, minLng,minLat,maxLng,maxLat 의 중심과 크기)
+PLACE_CENTERS = [(126.53, 33.25), (126.95, 33.45), (129.16, 35.16), (128.6, 38.2), (126.5, 34.3), (127.75, 34.7)]
+PLACE_ACTIVITIES = ["scuba", "surfing", "kayak", "beach", "fishing", "snorkel,freedive", "beach,marine_info"]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def place_request(rnd: random.Random) -> Tuple[str, Dict[str, str]]:
+    lon, lat = rnd.choice(PLACE_CENTERS)
+    half = rnd.choice((0.02, 0.05, 0.1))
+    # 같은 영역이 반복되도록 0.01도 격자에 맞춤 (타일 캐시 적중 상황 재현)
+    lon, lat = round(lon + rnd.uniform(-0.05, 0.05), 2), round(lat + rnd.uniform(-0.05, 0.05), 2)
+    rect = f"{lon - half:.2f},{lat - half:.2f},{lon + half:.2f},{lat + half:.2f}"
+    return "/api/places/in-rect", {"rect": rect, "activities": rnd.choice(PLACE_ACTIVITIES)}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    make_request: Callable[[], Tuple[str, Dict[str, str]]],
+    total: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            path, params = make_request()
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, params=params)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": total,
+        "rps": total / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": latencies[-1] if latencies else float("nan"),
+        "statuses": statuses,
+    }
+
+
+async def wait_ready(client: httpx.AsyncClient, path: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get(path)).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"server did not become ready: {client.base_url}{path}")
+        await asyncio.sleep(0.2)
+
+
+def start_backend(port: int, mock_url: str, data_dir: str, extra_env: Dict[str, str]) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "KMA_BASE_URL": mock_url,
+        "KAKAO_BASE_URL": mock_url,
+        "KHOA_BASE_URL": mock_url,
+        "KMA_API_KEY": "bench",
+        "KHOA_API_KEY": "bench",
+        "KAKAO_API_KEY": "bench",
+        "VITE_KAKAO_APPKEY": "bench",
+        "HISTORY_DB_PATH": os.path.join(data_dir, "history.sqlite3"),
+        "PLACE_INDEX_DB_PATH": os.path.join(data_dir, "places.sqlite3"),
+        **extra_env,
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    mock_server = uvicorn.Server(uvicorn.Config(
+        create_app(mock_config_from_args(args)), host="127.0.0.1", port=args.mock_port, log_level="warning",
+    ))
+    mock_task = asyncio.create_task(mock_server.serve())
+    mock_url = f"http://127.0.0.1:{args.mock_port}"
+    rnd = random.Random(args.seed)
+    results: Dict[str, Any] = {}
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        extra_env = dict(item.split("=", 1) for item in args.env)
+        backend = start_backend(args.port, mock_url, data_dir, extra_env)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        try:
+            async with httpx.AsyncClient(base_url=mock_url) as mock, httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=args.timeout,
+            ) as client:
+                await wait_ready(mock, "/__stats")
+                await wait_ready(client, "/api/http-pool")
+                # 스냅샷 준비 확인 겸 조회할 관측소 ID 목록 확보
+                stations = (await client.get("/api/stations")).json().get("stations", [])
+                station_ids = sorted({s["station_id"] for s in stations}) or ["22101"]
+
+                requests = {
+                    "stations": lambda: ("/api/stations", {}),
+                    "conditions": lambda: ("/api/conditions", {"station_id": rnd.choice(station_ids)}),
+                    "places": lambda: place_request(rnd),
+                }
+                for name in args.scenarios:
+                    await mock.post("/__reset")
+                    result = await run_scenario(client, requests[name], args.requests, args.concurrency)
+                    result["upstream_calls"] = (await mock.get("/__stats")).json()
+                    results[name] = result
+        finally:
+            backend.terminate()
+            backend.wait(timeout=10)
+            mock_server.should_exit = True
+            await mock_task
+    return results
+
+
+def print_report(results: Dict[str, Any]):
+    print(f"{'scenario':<12} {'reqs':>6} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  statuses / upstream calls")
+    for name, r in results.items():
+        print(
+            f"{name:<12} {r['requests']:>6} {r['rps']:>8.1f} {r['p50_ms']:>7.1f}ms {r['p95_ms']:>7.1f}ms "
+            f"{r['p99_ms']:>7.1f}ms {r['max_ms']:>7.1f}ms  {r['statuses']} / {r['upstream_calls']}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300, help="시나리오당 요청 수")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--port", type=int, default=8765, help="백엔드 포트")
+    parser.add_argument("--mock-port", type=int, default=9100, help="목 업스트림 포트")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="백엔드에 넘길 환경변수 (예: KAKAO_QPS=50)")
+    parser.add_argument("--json", help="결과를 JSON 파일로도 저장")
+    add_mock_arguments(parser)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(benchmark(args))
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
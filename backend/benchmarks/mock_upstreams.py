@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+KMA sea_obs.php, KHOA 수치조류도, 카카오 키워드 검색을 흉내 내는 로컬 업스트림 서버 (벤치마크용)
+
+실행: cd backend && python -m benchmarks.mock_upstreams --port 9100 --latency-ms 80 --rate-429 0.02
+백엔드는 KMA_BASE_URL, KHOA_BASE_URL, KAKAO_BASE_URL 을 http://127.0.0.1:9100 으로 바꿔 연결
+
+- sea_obs.php: --sea-obs-file 로 저장해 둔 실제 응답을 재생하거나, 없으면 합성 응답 생성
+- 수치조류도: 요청 영역의 0.1도 격자에 시각별로 바뀌는 합성 유속·유향 생성
+- 카카오 검색: --kakao-file 로 저장해 둔 {키워드: [documents]} JSON 을 재생하거나, 없으면 키워드별 합성 장소 생성.
+  rect 안의 장소만 골라 page/size 로 자르고, 실제 API 처럼 pageable_count 는 45 로 제한
+- 업스트림 호출 수는 GET /__stats 로 조회, POST /__reset 으로 초기화
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from app.services.kakao_local_client import KEYWORD_ACTIVITIES
+
+from .sea_obs_parser import make_payload
+
+KAKAO_PAGEABLE_CAP = 45  # 카카오 키워드 검색은 최대 3페이지 * 15개
+CURRENT_GRID_STEP = 0.1  # 합성 조류 격자 간격(도)
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    rate_429: float = 0.0  # 카카오 요청 중 429 로 응답할 비율
+    stations: int = 120
+    timestamps: int = 1
+    places_per_keyword: int = 300
+    bounds: tuple = (124.5, 33.0, 131.0, 38.7)
+    seed: int = 0
+    sea_obs_file: Optional[str] = None
+    kakao_file: Optional[str] = None
+
+
+def synthetic_documents(keyword: str, count: int, bounds: tuple) -> List[Dict]:
+    """키워드마다 항상 같은 위치의 합성 장소 목록 (키워드 해시를 시드로 사용)"""
+    rnd = random.Random(zlib.crc32(keyword.encode("utf-8")))
+    min_x, min_y, max_x, max_y = bounds
+    documents = []
+    for i in range(count):
+        place_id = f"{zlib.crc32(keyword.encode('utf-8')) % 100000:05d}{i:05d}"
+        documents.append({
+            "id": place_id,
+            "place_name": f"{keyword} {i}",
+            "category_name": f"여행 > {keyword}",
+            "phone": f"064-{i // 100:03d}-{i % 10000:04d}",
+            "address_name": "제주특별자치도",
+            "road_address_name": "",
+            "x": f"{rnd.uniform(min_x, max_x):.6f}",
+            "y": f"{rnd.uniform(min_y, max_y):.6f}",
+            "place_url": f"http://place.map.kakao.com/{place_id}",
+        })
+    return documents
+
+
+def synthetic_currents(bounds: tuple, step: str) -> List[Dict]:
+    """영역 안 0.1도 격자점의 합성 유속(cm/s)·유향 (예보 시각마다 위상이 바뀜)"""
+    min_x, min_y, max_x, max_y = bounds
+    phase = zlib.crc32(step.encode("utf-8")) % 360
+    rows = []
+    # 0.3 / 0.1 = 2.999... 처럼 나눗셈 오차로 마지막 격자선이 빠지지 않도록 반올림 후 내림
+    for j in range(math.floor(round((max_y - min_y) / CURRENT_GRID_STEP, 6)) + 1):
+        lat = min_y + j * CURRENT_GRID_STEP
+        for i in range(math.floor(round((max_x - min_x) / CURRENT_GRID_STEP, 6)) + 1):
+            lon = min_x + i * CURRENT_GRID_STEP
+            wave = math.sin(math.radians(phase + lat * 40 + lon * 25))
+            rows.append({
+                "pre_lat": f"{lat:.4f}",
+                "pre_lon": f"{lon:.4f}",
+                "current_speed": f"{60 + 50 * wave:.1f}",
+                "current_dir": f"{(phase + lon * 30) % 360:.1f}",
+            })
+    return rows
+
+
+def create_app(config: MockConfig) -> Starlette:
+    calls: Counter = Counter()
+    rnd = random.Random(config.seed)
+
+    if config.sea_obs_file:
+        with open(config.sea_obs_file, encoding="utf-8") as f:
+            sea_obs_text = f.read()
+    else:
+        sea_obs_text = make_payload(config.stations, config.timestamps, config.seed)
+
+    recorded: Dict[str, List[Dict]] = {}
+    if config.kakao_file:
+        with open(config.kakao_file, encoding="utf-8") as f:
+            recorded = json.load(f)
+    documents_cache: Dict[str, List[Dict]] = {}
+
+    def documents_for(keyword: str) -> List[Dict]:
+        if keyword in recorded:
+            return recorded[keyword]
+        if keyword not in documents_cache:
+            count = config.places_per_keyword if keyword in KEYWORD_ACTIVITIES else config.places_per_keyword // 10
+            documents_cache[keyword] = synthetic_documents(keyword, count, config.bounds)
+        return documents_cache[keyword]
+
+    async def delay():
+        latency = config.latency_ms + rnd.uniform(-config.jitter_ms, config.jitter_ms)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+    async def sea_obs(request: Request) -> Response:
+        calls["kma.sea_obs"] += 1
+        await delay()
+        stn = request.query_params.get("stn", "0")
+        if stn in ("", "0"):
+            return PlainTextResponse(sea_obs_text)
+        lines = [ln for ln in sea_obs_text.splitlines() if ln.startswith("#") or f", {stn}," in ln]
+        return PlainTextResponse("\n".join(lines))
+
+    async def khoa_current_area(request: Request) -> Response:
+        calls["khoa.current_area"] += 1
+        await delay()
+        params = request.query_params
+        bounds = tuple(float(params[key]) for key in ("MinLon", "MinLat", "MaxLon", "MaxLat"))
+        return JSONResponse({"result": {"meta": {}, "data": synthetic_currents(bounds, params.get("DateTime", ""))}})
+
+    async def kakao_keyword(request: Request) -> Response:
+        calls["kakao.keyword"] += 1
+        await delay()
+        if config.rate_429 and rnd.random() < config.rate_429:
+            calls["kakao.429"] += 1
+            return JSONResponse({"errorType": "RequestThrottled", "message": "mock throttled"}, status_code=429)
+        params = request.query_params
+        keyword = params.get("query", "")
+        page = int(params.get("page", "1"))
+        size = int(params.get("size", "15"))
+        documents = documents_for(keyword)
+        if "rect" in params:
+            min_x, min_y, max_x, max_y = (float(v) for v in params["rect"].split(","))
+            documents = [d for d in documents if min_x <= float(d["x"]) <= max_x and min_y <= float(d["y"]) <= max_y]
+        pageable = min(len(documents), KAKAO_PAGEABLE_CAP)
+        start = (page - 1) * size
+        page_documents = documents[start:min(start + size, pageable)]
+        return JSONResponse({
+            "documents": page_documents,
+            "meta": {
+                "total_count": len(documents),
+                "pageable_count": pageable,
+                "is_end": start + size >= pageable,
+            },
+        })
+
+    async def stats(request: Request) -> Response:
+        return JSONResponse(dict(calls))
+
+    async def reset(request: Request) -> Response:
+        calls.clear()
+        return JSONResponse({})
+
+    return Starlette(routes=[
+        Route("/api/typ01/url/sea_obs.php", sea_obs),
+        Route("/oceangrid/khoa/takepart/openapi/openApiTidalCurrentArea.do", khoa_current_area),
+        Route("/v2/local/search/keyword.json", kakao_keyword),
+        Route("/__stats", stats),
+        Route("/__reset", reset, methods=["POST"]),
+    ])
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=MockConfig.latency_ms, help="업스트림 응답 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=MockConfig.jitter_ms)
+    parser.add_argument("--rate-429", type=float, default=MockConfig.rate_429, help="카카오 429 응답 비율 (0~1)")
+    parser.add_argument("--stations", type=int, default=MockConfig.stations)
+    parser.add_argument("--places-per-keyword", type=int, default=MockConfig.places_per_keyword)
+    parser.add_argument("--sea-obs-file", help="재생할 sea_obs.php 응답 텍스트 파일")
+    parser.add_argument("--kakao-file", help="재생할 카카오 검색 결과 JSON 파일 ({키워드: [documents]})")
+
+
+def mock_config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        stations=args.stations,
+        places_per_keyword=args.places_per_keyword,
+        sea_obs_file=args.sea_obs_file,
+        kakao_file=args.kakao_file,
+    )
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(mock_config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
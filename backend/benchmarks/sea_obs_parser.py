@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+sea_obs.php 파서 마이크로 벤치마크 (기존 dict 파서 vs 컬럼 파서)
+
+실행: cd backend && python -m benchmarks.sea_obs_parser --stations 200 --timestamps 48
+"""
+import argparse
+import random
+import timeit
+from typing import Any, Dict, List
+
+from app.services.kma_client import SEA_OBS_FLOAT_COLUMNS, _to_float, parse_sea_obs_columns
+from app.services.regions import default_region_index
+from app.services.station_snapshot import StationSnapshot
+
+
+def legacy_parse_sea_obs_all(text: str) -> List[Dict[str, Any]]:
+    """컬럼 파서 도입 전의 _parse_sea_obs_all (비교 기준)"""
+    lines = [ln for ln in text.splitlines() if ln.strip() and not ln.strip().startswith("#")]
+    data_lines = [ln for ln in lines if "," in ln]
+
+    stations = []
+    for row in data_lines:
+        cols = [c.strip() for c in row.split(",")]
+        if len(cols) < 14:
+            continue
+        lon = _to_float(cols[4])
+        lat = _to_float(cols[5])
+        if lat is not None and lon is not None:
+            stations.append({
+                "station_id": cols[2],
+                "station_name": cols[3],
+                "lat": lat,
+                "lon": lon,
+                "sst": _to_float(cols[10]),
+                "wave_height": _to_float(cols[6]),
+                "observed_at": cols[1],
+                "tp": cols[0],
+                "source": "KMA",
+            })
+    return stations
+
+
+def make_payload(stations: int, timestamps: int, seed: int = 0) -> str:
+    """여러 시각이 섞인 sea_obs.php 형식의 합성 응답 생성 (결측값 -99 포함)"""
+    rnd = random.Random(seed)
+    lines = ["#START7777", "# TP, TM, STN_ID, STN_KO, LON, LAT, WH, WD, WS, WS_GST, TW, TA, PA, HM,"]
+    positions = [(124 + rnd.random() * 8, 33 + rnd.random() * 6) for _ in range(stations)]
+    for t in range(timestamps):
+        tm = f"20261016{t // 2:02d}{(t % 2) * 30:02d}"
+        for i, (lon, lat) in enumerate(positions):
+            values = [
+                f"{rnd.uniform(0, 4):.1f}", f"{rnd.randint(0, 359)}", f"{rnd.uniform(0, 15):.1f}",
+                f"{rnd.uniform(0, 20):.1f}", f"{rnd.uniform(8, 28):.1f}", f"{rnd.uniform(0, 30):.1f}",
+                f"{rnd.uniform(990, 1030):.1f}", f"{rnd.randint(30, 100)}",
+            ]
+            if rnd.random() < 0.1:
+                values[rnd.randrange(len(values))] = "-99.0"
+            lines.append(f"B, {tm}, {22100 + i}, 부이{i}, {lon:.4f}, {lat:.4f}, " + ", ".join(values) + ",=")
+    lines.append("#7777END")
+    return "\n".join(lines)
+
+
+def parse_all_columns(text: str):
+    """모든 수치 컬럼까지 변환 (이력 저장 경로)"""
+    columns = parse_sea_obs_columns(text)
+    for name in SEA_OBS_FLOAT_COLUMNS:
+        columns.column(name)
+    return columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, default=200)
+    parser.add_argument("--timestamps", type=int, default=48)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_payload(args.stations, args.timestamps)
+    rows = args.stations * args.timestamps
+    print(f"payload: {rows} rows, {len(text) / 1024:.0f} KiB")
+
+    default_region_index()  # 시도 경계 로딩은 측정에서 제외
+    cases = {
+        "legacy dicts": lambda: legacy_parse_sea_obs_all(text),
+        "columns": lambda: parse_sea_obs_columns(text),
+        "all columns": lambda: parse_all_columns(text),
+        "columns + to_dicts": lambda: parse_sea_obs_columns(text).to_dicts(),
+        "snapshot by_id": lambda: StationSnapshot(columns=parse_sea_obs_columns(text)).by_id,
+    }
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"{name:<20} {best * 1000:8.1f} ms  ({rows / best / 1e6:.2f} M rows/s)")
+
+
+if __name__ == "__main__":
+    main()
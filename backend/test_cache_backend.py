@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+캐시 저장소 테스트 (임시 SQLite 파일 사용, 네트워크 불필요)
+
+장소 타일이 가득 차 밀려나도 공유 스냅샷·조류 격자(pinned)는 남는지,
+SQLite 저장소의 타일 캐시가 이벤트 루프 밖 스레드에서 조회되는지 확인
+    python test_cache_backend.py
+    python -m pytest -q test_cache_backend.py
+"""
+import asyncio
+import os
+import tempfile
+import threading
+
+from app.services.cache_backend import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
+from app.services.place_cache import PlaceTileCache
+
+PLACES = [{"id": "1", "x": "129.2", "y": "35.1"}]
+
+
+def test_cache_backend_is_abstract():
+    try:
+        CacheBackend()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("CacheBackend should not be instantiable")
+
+
+def test_pinned_entries_survive_pruning():
+    for make in (
+        lambda data_dir: MemoryCacheBackend(max_entries=4),
+        lambda data_dir: SQLiteCacheBackend(os.path.join(data_dir, "cache.sqlite3"), max_entries=4, prune_every=1),
+    ):
+        with tempfile.TemporaryDirectory() as data_dir:
+            backend = make(data_dir)
+            try:
+                backend.set("kma:sea_obs:snapshot", {"text": "snapshot"}, 60, pinned=True)
+                for i in range(20):
+                    backend.set(f"place_tile:{i}", PLACES, 60)
+                assert backend.get("kma:sea_obs:snapshot") == {"text": "snapshot"}
+                assert backend.count("place_tile:") <= 4
+            finally:
+                backend.close()
+
+
+def test_sqlite_tile_cache_runs_off_loop():
+    with tempfile.TemporaryDirectory() as data_dir:
+        backend = SQLiteCacheBackend(os.path.join(data_dir, "cache.sqlite3"))
+        cache = PlaceTileCache(backend=backend)
+        threads = set()
+        get = backend.get
+
+        def recording_get(*args):
+            threads.add(threading.get_ident())
+            return get(*args)
+
+        backend.get = recording_get
+
+        async def run():
+            await cache.set(((0.01, 1, 2), "해수욕장"), PLACES)
+            found = await cache.get_first([((0.01, 1, 1), "해수욕장"), ((0.01, 1, 2), "해수욕장")])
+            return found, await cache.count_entries()
+
+        try:
+            found, entries = asyncio.run(run())
+        finally:
+            cache.close()
+            backend.close()
+    assert found == (((0.01, 1, 2), "해수욕장"), PLACES)
+    assert entries == 1
+    assert threads and threading.get_ident() not in threads
+
+
+if __name__ == "__main__":
+    test_cache_backend_is_abstract()
+    test_pinned_entries_survive_pruning()
+    test_sqlite_tile_cache_runs_off_loop()
+    print("✅ Pinned entries survive pruning and SQLite tile lookups stay off the event loop")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+카카오 차단기 half-open 시험 요청 취소 테스트 (카카오 응답은 httpx.MockTransport 로 흉내, 네트워크 불필요)
+
+시험 요청을 기다리던 요청이 취소돼도 공유 작업이 결과를 기록해 차단기가 닫히는지,
+시험 요청 작업 자체가 취소되면 reset_timeout 뒤 새 시험 요청을 받는지 확인
+    python test_circuit_breaker.py
+    python -m pytest -q test_circuit_breaker.py
+"""
+import asyncio
+import os
+
+os.environ.setdefault("KAKAO_MAX_RETRIES", "0")
+
+import httpx
+
+from app.services.kakao_local_client import KakaoLocalClient
+from app.services.rate_limiter import CircuitBreaker, TokenBucket
+
+RESET = 0.05
+RECT = "129.1,35.1,129.2,35.2"
+
+
+def _half_open_kakao(latency: float):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET)
+    breaker.record_failure()
+    kakao = KakaoLocalClient("test-key", rate_limiter=TokenBucket(10000, 10000), circuit_breaker=breaker)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json={"documents": [], "meta": {"total_count": 0, "pageable_count": 0, "is_end": True}})
+
+    return kakao, breaker, httpx.MockTransport(handler)
+
+
+def test_cancelled_waiter_does_not_strand_probe():
+    async def run():
+        kakao, breaker, transport = _half_open_kakao(latency=0.05)
+        await asyncio.sleep(RESET)
+        async with httpx.AsyncClient(transport=transport) as client:
+            waiter = asyncio.create_task(kakao._request_page(client, "cancel-waiter", RECT, 1))
+            await asyncio.sleep(0.01)
+            assert breaker.state == "half_open"
+            waiter.cancel()
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                pass
+            # 대기 요청이 취소돼도 공유 시험 요청은 끝까지 돌아 성공을 기록함
+            await asyncio.sleep(0.1)
+        return breaker.state
+
+    assert asyncio.run(run()) == "closed"
+
+
+def test_cancelled_probe_expires():
+    async def run():
+        kakao, breaker, transport = _half_open_kakao(latency=1.0)
+        await asyncio.sleep(RESET)
+        async with httpx.AsyncClient(transport=transport) as client:
+            probe = asyncio.create_task(kakao._fetch_page(client, "cancel-probe", RECT, 1, 15))
+            await asyncio.sleep(0.01)
+            probe.cancel()
+            try:
+                await probe
+            except asyncio.CancelledError:
+                pass
+        blocked = breaker.allow()
+        await asyncio.sleep(RESET)
+        return blocked, breaker.allow()
+
+    blocked, admitted = asyncio.run(run())
+    assert not blocked
+    assert admitted
+
+
+if __name__ == "__main__":
+    test_cancelled_waiter_does_not_strand_probe()
+    test_cancelled_probe_expires()
+    print("✅ Cancelled half-open probes do not keep the breaker open")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+줌 레벨별 격자 클러스터 테스트 (합성 좌표, 네트워크 불필요)
+
+아래 레벨을 2x2 로 합쳐 만든 위 레벨이 점을 그 레벨 격자에 바로 모은 결과와 같은지,
+개수·태그·단일 점 id·영역 필터를 확인
+    python test_clustering.py
+    python -m pytest -q test_clustering.py
+"""
+import math
+import random
+from collections import Counter
+
+from app.config import CLUSTER_MAX_LEVEL, CLUSTER_MIN_LEVEL
+from app.services.clustering import GridClusterIndex, cell_size_for_level, clamp_level
+
+
+def _items(n=2000, seed=3):
+    rnd = random.Random(seed)
+    return [
+        {"id": str(i), "lon": rnd.uniform(126.0, 127.0), "lat": rnd.uniform(33.0, 34.0), "tags": rnd.choice(("scuba", "beach"))}
+        for i in range(n)
+    ]
+
+
+def test_levels_match_direct_gridding():
+    items = _items()
+    index = GridClusterIndex(items, tags_key="tags")
+    for level in range(CLUSTER_MIN_LEVEL, CLUSTER_MAX_LEVEL + 1):
+        size = cell_size_for_level(level)
+        direct = Counter((math.floor(item["lon"] / size), math.floor(item["lat"] / size)) for item in items)
+        clusters = index.clusters(level)
+        assert sorted(cluster["count"] for cluster in clusters) == sorted(direct.values())
+        assert sum(cluster["count"] for cluster in clusters) == len(items)
+        assert sum(tag["count"] for cluster in clusters for tag in cluster["top_activities"]) == len(items)
+
+
+def test_cluster_fields_and_filters():
+    items = [
+        {"id": "a", "lon": 126.5, "lat": 33.5, "tags": ["scuba", "beach"]},
+        {"id": "b", "lon": 126.5000001, "lat": 33.5000001, "tags": "scuba"},
+        {"id": "c", "lon": 129.0, "lat": 35.0},
+        {"id": "no_coords", "lon": None, "lat": 35.0},
+        {"id": "nan", "lon": float("nan"), "lat": 35.0},
+    ]
+    index = GridClusterIndex(items, tags_key="tags")
+    assert index.total == 3
+    clusters = {cluster["count"]: cluster for cluster in index.clusters(CLUSTER_MIN_LEVEL)}
+    pair, single = clusters[2], clusters[1]
+    assert "id" not in pair
+    assert pair["top_activities"][0] == {"activity": "scuba", "count": 2}
+    assert pair["bbox"] == [126.5, 33.5, 126.5000001, 33.5000001]
+    assert single["id"] == "c"
+    assert "top_activities" not in single
+    # bbox 가 영역과 겹치는 클러스터만
+    assert [cluster["count"] for cluster in index.clusters(CLUSTER_MIN_LEVEL, rect=(128.5, 34.5, 129.5, 35.5))] == [1]
+
+
+def test_levels_are_clamped():
+    assert clamp_level(1) == CLUSTER_MIN_LEVEL
+    assert clamp_level(99) == CLUSTER_MAX_LEVEL
+    index = GridClusterIndex(_items(200))
+    assert index.clusters(1) == index.clusters(CLUSTER_MIN_LEVEL)
+    assert index.clusters(99) == index.clusters(CLUSTER_MAX_LEVEL)
+
+
+if __name__ == "__main__":
+    test_levels_match_direct_gridding()
+    test_cluster_fields_and_filters()
+    test_levels_are_clamped()
+    print("✅ Grid clusters are consistent across zoom levels")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+해안 근접 마스크 테스트 (합성 래스터·섬 다각형, 네트워크 불필요)
+
+is_coastal 의 경계 조건(칸 경계에 걸친 영역, 임계 거리와 같은 칸, 래스터 밖으로 나간 영역)과
+섬 다각형으로 만든 래스터의 바다·해안·내륙 칸, 직렬화 왕복을 확인
+    python test_coast_mask.py
+    python -m pytest -q test_coast_mask.py
+"""
+from app.services.coast_mask import MAX_DISTANCE_KM, CoastMask
+
+# 4x4 칸(1도) 래스터. 행은 남 -> 북, 가운데 2x2 칸이 내륙
+DISTANCES = bytes([
+    0, 0, 0, 0,
+    0, 30, 40, 0,
+    0, 50, 60, 0,
+    0, 0, 0, 0,
+])
+
+
+def _mask() -> CoastMask:
+    return CoastMask((0.0, 0.0, 4.0, 4.0), 1.0, 4, 4, DISTANCES)
+
+
+def test_is_coastal_inside_cells():
+    mask = _mask()
+    assert mask.is_coastal((0.2, 0.2, 0.8, 0.8), 10)  # 바다 칸
+    assert not mask.is_coastal((1.2, 1.2, 2.8, 2.8), 10)  # 내륙 2x2 칸 안
+    # 임계 거리와 같은 칸은 해안으로 봄
+    assert mask.is_coastal((1.2, 1.2, 1.8, 1.8), 30)
+    assert not mask.is_coastal((1.2, 1.2, 1.8, 1.8), 29)
+    # 점 하나짜리 영역
+    assert mask.is_coastal((2.5, 2.5, 2.5, 2.5), 60)
+    assert not mask.is_coastal((2.5, 2.5, 2.5, 2.5), 59)
+
+
+def test_is_coastal_cell_edges():
+    mask = _mask()
+    # 최대 경계가 다음 칸의 시작선에 닿으면 그 칸(바다)도 겹친 것으로 봄
+    assert mask.is_coastal((1.2, 1.2, 3.0, 2.8), 10)
+    assert mask.is_coastal((1.2, 1.2, 2.8, 3.0), 10)
+    # 최소 경계가 내륙 칸의 시작선이면 바깥 칸은 포함하지 않음
+    assert not mask.is_coastal((1.0, 1.0, 2.9, 2.9), 10)
+
+
+def test_is_coastal_outside_raster():
+    mask = _mask()
+    # 래스터를 조금이라도 벗어나면 판단할 수 없으므로 해안으로 봄 (검색을 건너뛰지 않음)
+    assert mask.is_coastal((-0.5, 1.2, 2.8, 2.8), 10)
+    assert mask.is_coastal((1.2, 1.2, 4.5, 2.8), 10)
+    assert mask.is_coastal((1.2, 1.2, 2.8, 4.0), 10)  # 래스터 북쪽 끝 경계선
+    assert mask.distance_km(5.0, 5.0) is None
+    assert mask.distance_km(2.5, 1.5) == 50
+
+
+def test_build_from_island_and_round_trip():
+    # 0.5도 칸으로 (1,1)-(3,3) 정사각형 섬을 래스터화
+    island = [(1.0, 1.0), (3.0, 1.0), (3.0, 3.0), (1.0, 3.0), (1.0, 1.0)]
+    mask = CoastMask.build([island], (0.0, 0.0, 4.0, 4.0), cell_deg=0.5)
+    assert (mask.width, mask.height) == (8, 8)
+    assert mask.distance_km(0.25, 0.25) == 0  # 바다
+    assert mask.distance_km(1.25, 1.25) == 0  # 해안 칸은 칸 반대각선만큼 빼서 0
+    center = mask.distance_km(1.75, 1.75)
+    # 가운데 칸 중심은 해안에서 약 0.25도 → 칸 반대각선을 빼도 양수
+    assert 0 < center < MAX_DISTANCE_KM
+    assert mask.is_coastal((1.6, 1.6, 2.4, 2.4), center)
+    assert not mask.is_coastal((1.6, 1.6, 2.4, 2.4), center - 1)
+
+    restored = CoastMask.from_payload(mask.to_payload())
+    assert restored.distances == mask.distances
+    assert restored.bounds == mask.bounds
+    try:
+        CoastMask.from_payload({**mask.to_payload(), "width": 9})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("size mismatch should be rejected")
+
+
+if __name__ == "__main__":
+    test_is_coastal_inside_cells()
+    test_is_coastal_cell_edges()
+    test_is_coastal_outside_raster()
+    test_build_from_island_and_round_trip()
+    print("✅ Coast mask edges behave conservatively")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+관측 이력 공백 채우기 테스트 (KMA 응답은 httpx.MockTransport 로 흉내, 네트워크 불필요)
+
+요청 하나가 채우는 시각 수와 동시 조회 수가 제한되는지, 발표 전일 수 있는 최근 시각은 조회 완료로 남지 않는지 확인
+    python test_history_store.py
+    python -m pytest -q test_history_store.py
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import httpx
+
+from app.services.history_store import KST, TM_FORMAT, ObservationHistoryStore
+from benchmarks.sea_obs_parser import make_payload
+
+
+def _mock_kma():
+    """tm 시각의 관측 응답을 돌려주는 목 KMA 와 (호출 수, 최대 동시 호출 수) 기록"""
+    calls = {"total": 0, "active": 0, "peak": 0}
+    payload = make_payload(3, 1)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls["total"] += 1
+        calls["active"] += 1
+        calls["peak"] = max(calls["peak"], calls["active"])
+        await asyncio.sleep(0.01)
+        calls["active"] -= 1
+        tm = request.url.params.get("tm", "")
+        return httpx.Response(200, text=payload.replace("202610160000", tm))
+
+    return httpx.MockTransport(handler), calls
+
+
+def _history(store, hours, **kwargs):
+    transport, calls = _mock_kma()
+    now = datetime.now(KST).replace(tzinfo=None, minute=0)
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await store.history(
+                client, "22100", (now - timedelta(hours=hours)).strftime(TM_FORMAT), now.strftime(TM_FORMAT), **kwargs
+            )
+
+    return asyncio.run(run()), calls
+
+
+def _store(data_dir, **kwargs):
+    return ObservationHistoryStore(os.path.join(data_dir, "history.sqlite3"), **kwargs)
+
+
+def test_gap_fetches_are_bounded():
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = _store(data_dir, gap_concurrency=2)
+        try:
+            result, calls = _history(store, 24, max_gap_fetches=6)
+        finally:
+            store.close()
+    assert result["fetched_gaps"] == 6
+    assert result["missing_gaps"] == 19
+    assert calls["total"] == 6
+    assert calls["peak"] <= 2
+    assert len(result["observations"]) == 6
+
+
+def test_recent_hours_are_not_marked_fetched():
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = _store(data_dir, publish_delay_minutes=120)
+        try:
+            _history(store, 4, max_gap_fetches=10)
+            now = datetime.now(KST).replace(tzinfo=None)
+            fetched = store.fetched_times("000000000000", "999999999999")
+        finally:
+            store.close()
+    assert fetched
+    assert all(datetime.strptime(tm, TM_FORMAT) <= now - timedelta(minutes=120) for tm in fetched)
+
+
+if __name__ == "__main__":
+    test_gap_fetches_are_bounded()
+    test_recent_hours_are_not_marked_fetched()
+    print("✅ History gap fills are bounded and recent hours stay open")
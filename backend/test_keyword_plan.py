@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+활동 간 키워드 검색 계획 테스트 (네트워크 불필요)
+
+여러 활동이 같이 쓰는 키워드는 한 번만 검색하고, 그 키워드의 결과 수는 활동별 몫 중 가장 큰 값인지 확인
+    python test_keyword_plan.py
+    python -m pytest -q test_keyword_plan.py
+"""
+from app.services.kakao_local_client import ACTIVITY_KEYWORDS, plan_keyword_searches
+
+
+def test_shared_keyword_is_searched_once():
+    plan = plan_keyword_searches(["beach", "marine_info"])
+    keywords = [search.keyword for search in plan.searches]
+    assert keywords.count("해수욕장") == 1
+    assert len(keywords) == len(set(ACTIVITY_KEYWORDS["beach"] + ACTIVITY_KEYWORDS["marine_info"]))
+    assert plan.stats() == {"keyword_searches": 5, "unique_keywords": 4, "searches_saved": 1}
+    beach = next(search for search in plan.searches if search.keyword == "해수욕장")
+    assert beach.activities == ["beach", "marine_info"]
+    # beach 는 키워드 하나에 45개, marine_info 는 키워드 넷에 나눠 11개씩 → 큰 쪽
+    assert beach.max_results == 45
+    assert next(search for search in plan.searches if search.keyword == "해양관측소").max_results == 45 // 4
+
+
+def test_unlimited_and_unknown_activities():
+    plan = plan_keyword_searches(["marine_info", "beach", "unknown"], None)
+    assert all(search.max_results is None for search in plan.searches)
+    assert plan.requested == 5
+    # 같은 활동을 두 번 요청해도 한 번만 계획
+    assert plan_keyword_searches(["scuba", "scuba"]).stats()["keyword_searches"] == len(ACTIVITY_KEYWORDS["scuba"])
+    assert plan_keyword_searches(["unknown"]).searches == []
+
+
+def test_plan_keeps_request_order():
+    plan = plan_keyword_searches(["kayak", "surfing"])
+    assert [search.keyword for search in plan.searches] == ACTIVITY_KEYWORDS["kayak"] + ACTIVITY_KEYWORDS["surfing"]
+    assert plan.stats()["searches_saved"] == 0
+
+
+if __name__ == "__main__":
+    test_shared_keyword_is_searched_once()
+    test_unlimited_and_unknown_activities()
+    test_plan_keeps_request_order()
+    print("✅ Keyword plans deduplicate shared keywords")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+벤치마크용 목 업스트림 테스트 (benchmarks.mock_upstreams 를 ASGI 로 호출, 네트워크 불필요)
+
+목 카카오가 실제 API 처럼 rect 로 거르고 pageable_count 를 45 로 제한하는지, 호출 수 집계·초기화와
+sea_obs 지점 필터, 조류 격자 응답, 부하 결과의 백분위 계산을 확인
+    python test_mock_upstreams.py
+    python -m pytest -q test_mock_upstreams.py
+"""
+from starlette.testclient import TestClient
+
+from app.services.kma_client import parse_sea_obs_columns
+from benchmarks.load import percentile
+from benchmarks.mock_upstreams import KAKAO_PAGEABLE_CAP, MockConfig, create_app
+
+KAKAO = "/v2/local/search/keyword.json"
+
+
+def _client(**kwargs) -> TestClient:
+    return TestClient(create_app(MockConfig(latency_ms=0, jitter_ms=0, **kwargs)))
+
+
+def test_kakao_pages_are_capped_like_the_real_api():
+    client = _client(places_per_keyword=3000)
+    rect = "124.5,33.0,131.0,38.7"
+    pages = [client.get(KAKAO, params={"query": "해수욕장", "rect": rect, "page": page, "size": 15}).json() for page in (1, 2, 3, 4)]
+    meta = pages[0]["meta"]
+    assert meta["total_count"] == 3000
+    assert meta["pageable_count"] == KAKAO_PAGEABLE_CAP
+    assert [len(page["documents"]) for page in pages] == [15, 15, 15, 0]
+    assert [page["meta"]["is_end"] for page in pages] == [False, False, True, True]
+    assert client.get("/__stats").json() == {"kakao.keyword": 4}
+    client.post("/__reset")
+    assert client.get("/__stats").json() == {}
+
+
+def test_kakao_rect_filter():
+    client = _client(places_per_keyword=3000)
+    rect = (126.1, 33.1, 126.4, 33.3)
+    data = client.get(KAKAO, params={"query": "해수욕장", "rect": ",".join(map(str, rect)), "size": 15}).json()
+    assert data["documents"]
+    for document in data["documents"]:
+        assert rect[0] <= float(document["x"]) <= rect[2] and rect[1] <= float(document["y"]) <= rect[3]
+    # 활동 키워드가 아닌 검색어는 장소 수가 1/10
+    other = client.get(KAKAO, params={"query": "카페", "rect": "124.5,33.0,131.0,38.7"}).json()
+    assert other["meta"]["total_count"] == 300
+
+
+def test_sea_obs_and_currents():
+    client = _client(stations=20)
+    text = client.get("/api/typ01/url/sea_obs.php", params={"stn": "0"}).text
+    columns = parse_sea_obs_columns(text)
+    assert len(columns) == 20
+    station_id = columns.column("station_id")[0]
+    single = parse_sea_obs_columns(client.get("/api/typ01/url/sea_obs.php", params={"stn": station_id}).text)
+    assert set(single.column("station_id")) == {station_id}
+    grid = client.get(
+        "/oceangrid/khoa/takepart/openapi/openApiTidalCurrentArea.do",
+        params={"MinLon": 126.0, "MinLat": 33.0, "MaxLon": 126.3, "MaxLat": 33.2, "DateTime": "202610170900"},
+    ).json()["result"]["data"]
+    assert len(grid) == 4 * 3
+    assert client.get("/__stats").json() == {"kma.sea_obs": 2, "khoa.current_area": 1}
+
+
+def test_percentile():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) in (50.0, 51.0)
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 50) != percentile([], 50)  # NaN
+
+
+if __name__ == "__main__":
+    test_kakao_pages_are_capped_like_the_real_api()
+    test_kakao_rect_filter()
+    test_sea_obs_and_currents()
+    test_percentile()
+    print("✅ Mock upstreams behave like the real APIs")
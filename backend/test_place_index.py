@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+장소 인덱스 재수집 테스트 (카카오 응답은 httpx.MockTransport 로 흉내, 네트워크 불필요)
+
+뒤 페이지·분할 사분면이 실패하거나 분할 예산에서 잘린 재수집이 기존에 저장된 장소를 지우지 않는지 확인
+    python test_place_index.py
+    python -m pytest -q test_place_index.py
+"""
+import asyncio
+import math
+import os
+import tempfile
+
+os.environ.setdefault("KAKAO_MAX_RETRIES", "0")
+
+import httpx
+
+from app.services import place_index
+from app.services.kakao_local_client import KEYWORD_ACTIVITIES, KakaoLocalClient, SubdivisionBudget
+from app.services.place_cache import parse_rect
+from app.services.place_index import CoastalPlaceCrawler, PlaceIndex, cell_rect
+from app.services.rate_limiter import CircuitBreaker, TokenBucket
+
+CELL = (806, 219)  # 부산 해운대 부근 0.16도 셀
+COLUMNS = 8
+
+
+def _points(count):
+    """셀 안에 고르게 깔린 count 개 좌표"""
+    min_x, min_y, max_x, max_y = cell_rect(CELL)
+    rows = math.ceil(count / COLUMNS)
+    return [
+        (min_x + (max_x - min_x) * (i % COLUMNS + 0.5) / COLUMNS, min_y + (max_y - min_y) * (i // COLUMNS + 0.5) / rows)
+        for i in range(count)
+    ]
+
+
+def _mock_kakao(places_per_keyword, fail=lambda rect, page: False):
+    points = _points(places_per_keyword)
+    whole = parse_rect(",".join(map(str, cell_rect(CELL))))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        keyword = request.url.params["query"]
+        rect = parse_rect(request.url.params["rect"])
+        page = int(request.url.params["page"])
+        size = int(request.url.params["size"])
+        if fail(rect != whole, page):
+            return httpx.Response(500)
+        found = [
+            (i, x, y) for i, (x, y) in enumerate(points)
+            if rect[0] <= x < rect[2] and rect[1] <= y < rect[3]
+        ]
+        docs = [
+            {"id": f"{keyword}-{i}", "place_name": f"{keyword} {i}", "category_name": "여행 > 관광,명소", "x": str(x), "y": str(y)}
+            for i, x, y in found[(page - 1) * size:page * size]
+        ]
+        meta = {
+            "total_count": len(found),
+            "pageable_count": min(len(found), 45),
+            "is_end": page * size >= min(len(found), 45),
+        }
+        return httpx.Response(200, json={"meta": meta, "documents": docs})
+
+    return httpx.MockTransport(handler)
+
+
+async def _crawl(index: PlaceIndex, transport: httpx.MockTransport) -> dict:
+    kakao = KakaoLocalClient(
+        "test-key", rate_limiter=TokenBucket(10000, 10000), circuit_breaker=CircuitBreaker(failure_threshold=10000)
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        crawler = CoastalPlaceCrawler(index, kakao, lambda: client)
+        return await crawler.crawl([CELL])
+
+
+def _recrawl(places_per_keyword, fail=lambda subdivided, page: False, max_depth=None):
+    """
+    한 번 제대로 수집한 뒤 fail 조건(과 분할 깊이 max_depth)으로 다시 수집하고
+    (처음 장소 수, 재수집 결과, 재수집 후 장소 수) 반환
+    """
+    with tempfile.TemporaryDirectory() as data_dir:
+        index = PlaceIndex(os.path.join(data_dir, "places.sqlite3"))
+        try:
+            first = asyncio.run(_crawl(index, _mock_kakao(places_per_keyword)))
+            assert first["crawled_cells"] == 1
+            stored = index.stats()["places"]
+            if max_depth is not None:
+                place_index.SubdivisionBudget = lambda: SubdivisionBudget(max_depth=max_depth)
+            second = asyncio.run(_crawl(index, _mock_kakao(places_per_keyword, fail)))
+            return stored, second, index.stats()["places"]
+        finally:
+            place_index.SubdivisionBudget = SubdivisionBudget
+            index.close()
+
+
+def test_recrawl_with_failed_pages_keeps_indexed_places():
+    # 2페이지가 모두 500 이면 셀은 실패로 처리되고 기존 장소는 그대로 남아야 함
+    stored, second, after = _recrawl(30, lambda subdivided, page: page == 2)
+    assert stored > 0
+    assert second["failed_cells"] == 1
+    assert after == stored
+
+
+def test_recrawl_with_failed_quadrants_keeps_indexed_places():
+    # 45개가 넘어 4분할한 사분면 요청이 실패해도 셀은 실패로 처리
+    stored, second, after = _recrawl(60, lambda subdivided, page: subdivided)
+    assert second["failed_cells"] == 1
+    assert after == stored
+
+
+def test_recrawl_truncated_by_budget_keeps_indexed_places():
+    # 분할 예산이 없어 45개에서 잘린 결과는 저장하되 빠진 장소를 지우지 않음
+    stored, second, after = _recrawl(60, max_depth=0)
+    assert stored == 60 * len(KEYWORD_ACTIVITIES)
+    assert second["crawled_cells"] == 1
+    assert after == stored
+
+
+if __name__ == "__main__":
+    test_recrawl_with_failed_pages_keeps_indexed_places()
+    test_recrawl_with_failed_quadrants_keeps_indexed_places()
+    test_recrawl_truncated_by_budget_keeps_indexed_places()
+    print("✅ Re-crawls with failed or truncated searches kept the indexed places")
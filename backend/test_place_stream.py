@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+장소 스트리밍 검색 테스트 (benchmarks.mock_upstreams 의 목 카카오를 ASGI 로 연결, 네트워크 불필요)
+
+먼저 끝난 키워드부터 내보내는 스트리밍(ordered=False) 결과가 한 번에 받는 결과와 같은 장소 집합인지,
+묶음 사이에 중복이 없는지, 소비자가 중간에 끊으면 남은 검색이 취소되는지 확인
+    python test_place_stream.py
+    python -m pytest -q test_place_stream.py
+"""
+import asyncio
+import os
+
+os.environ.setdefault("KAKAO_MAX_RETRIES", "0")
+
+import httpx
+
+from app.services.kakao_local_client import KakaoLocalClient
+from app.services.rate_limiter import AdaptiveConcurrencyLimiter, CircuitBreaker, TokenBucket
+from benchmarks.mock_upstreams import MockConfig, create_app
+
+RECT = "126.1,33.1,126.9,33.6"
+ACTIVITIES = ["scuba", "kayak", "beach", "marine_info"]  # beach 와 marine_info 는 해수욕장 키워드를 같이 씀
+
+
+def _kakao() -> KakaoLocalClient:
+    # 테스트마다 이벤트 루프가 다르므로 API 키별 공용 동시 요청 한도 대신 새 한도를 씀
+    return KakaoLocalClient(
+        "test-key",
+        rate_limiter=TokenBucket(10000, 10000),
+        concurrency_limiter=AdaptiveConcurrencyLimiter(),
+        circuit_breaker=CircuitBreaker(failure_threshold=10000),
+    )
+
+
+def _mock_client(latency_ms: float = 0, places_per_keyword: int = 3000) -> httpx.AsyncClient:
+    app = create_app(MockConfig(latency_ms=latency_ms, jitter_ms=latency_ms, places_per_keyword=places_per_keyword))
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mock")
+
+
+def test_stream_matches_buffered_results():
+    async def run():
+        async with _mock_client(latency_ms=5) as client:
+            kakao = _kakao()
+            buffered = await kakao.search_places_in_rect(client, RECT, ACTIVITIES)
+            batches = [batch async for batch in kakao.iter_places_in_rect(client, RECT, ACTIVITIES, ordered=False)]
+        return buffered, batches
+
+    buffered, batches = asyncio.run(run())
+    streamed = [place for batch in batches for place in batch]
+    assert len(batches) > 1
+    assert all(batches)
+    assert len({place["id"] for place in streamed}) == len(streamed)
+    assert {place["id"] for place in streamed} == {place["id"] for place in buffered}
+    # 여러 활동이 같은 키워드(해수욕장 등)로 찾은 장소에는 일치한 활동이 모두 붙음
+    assert any(len(place["activities"]) > 1 for place in streamed)
+
+
+def test_closing_stream_cancels_pending_searches():
+    async def run():
+        # 키워드마다 45개를 넘어 영역을 여러 번 나눠 검색해야 하는 밀도
+        async with _mock_client(latency_ms=20, places_per_keyword=30000) as client:
+            kakao = _kakao()
+            await kakao.search_places_in_rect(client, RECT, ["scuba"], None)
+            full = (await client.get("/__stats")).json()["kakao.keyword"]
+            await client.post("/__reset")
+            stream = kakao.iter_places_in_rect(client, RECT, ["scuba"], None, ordered=False)
+            # 첫 묶음을 기다리던 클라이언트가 연결을 끊은 상황
+            reader = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0.1)
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+            await stream.aclose()
+            # 이미 보낸 요청이 끝날 때까지 기다린 뒤 호출 수 비교
+            await asyncio.sleep(0.3)
+            closed = (await client.get("/__stats")).json()["kakao.keyword"]
+        return full, closed
+
+    full, closed = asyncio.run(run())
+    # 분할 검색이 이어지지 않고 멈춤
+    assert 0 < closed < full
+
+
+if __name__ == "__main__":
+    test_stream_matches_buffered_results()
+    test_closing_stream_cancels_pending_searches()
+    print("✅ Streamed place batches match the buffered search")
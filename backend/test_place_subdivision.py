@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+카카오 45개 상한 분할 검색 테스트 (benchmarks.mock_upstreams 의 목 카카오를 ASGI 로 연결, 네트워크 불필요)
+
+장소가 45개를 넘는 영역을 4분할 재귀 검색해 목 업스트림의 영역 안 장소를 빠짐없이 모으는지,
+예산이 모자라면 budget.truncated 로 알리는지 확인
+    python test_place_subdivision.py
+    python -m pytest -q test_place_subdivision.py
+"""
+import asyncio
+import os
+
+os.environ.setdefault("KAKAO_MAX_RETRIES", "0")
+
+import httpx
+
+from app.services.kakao_local_client import KakaoLocalClient, SubdivisionBudget
+from app.services.place_cache import parse_rect
+from app.services.rate_limiter import AdaptiveConcurrencyLimiter, CircuitBreaker, TokenBucket
+from benchmarks.mock_upstreams import MockConfig, create_app, synthetic_documents
+
+KEYWORD = "카약"  # 해안 마스크를 적용하지 않는 키워드 (내륙 사분면도 검색)
+RECT = "127.0,35.0,127.4,35.4"
+CONFIG = MockConfig(latency_ms=0, jitter_ms=0, places_per_keyword=30000)
+
+
+def _expected_ids(rect: str):
+    min_x, min_y, max_x, max_y = parse_rect(rect)
+    return {
+        d["id"] for d in synthetic_documents(KEYWORD, CONFIG.places_per_keyword, CONFIG.bounds)
+        if min_x <= float(d["x"]) <= max_x and min_y <= float(d["y"]) <= max_y
+    }
+
+
+async def _search(budget: SubdivisionBudget):
+    kakao = KakaoLocalClient(
+        "test-key",
+        rate_limiter=TokenBucket(10000, 10000),
+        concurrency_limiter=AdaptiveConcurrencyLimiter(),
+        circuit_breaker=CircuitBreaker(failure_threshold=10000),
+    )
+    app = create_app(CONFIG)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mock") as client:
+        places = await kakao._search_keyword_pages(client, KEYWORD, RECT, None, budget)
+        calls = (await client.get("/__stats")).json()["kakao.keyword"]
+    return places, calls
+
+
+def test_subdivision_collects_past_the_cap():
+    budget = SubdivisionBudget(max_depth=6, max_requests=256)
+    places, calls = asyncio.run(_search(budget))
+    expected = _expected_ids(RECT)
+    assert len(expected) > 45
+    assert {place["id"] for place in places} == expected
+    assert len(places) == len(expected)
+    assert not budget.truncated and not budget.failed
+    assert calls > 1
+
+
+def test_exhausted_budget_is_reported():
+    budget = SubdivisionBudget(max_depth=6, max_requests=4)
+    places, calls = asyncio.run(_search(budget))
+    assert budget.truncated
+    assert len(places) < len(_expected_ids(RECT))
+    # 첫 페이지 + 예산 4건을 넘겨 요청하지 않음
+    assert calls <= 5
+
+
+def test_no_depth_means_capped_result():
+    budget = SubdivisionBudget(max_depth=0)
+    places, _ = asyncio.run(_search(budget))
+    assert budget.truncated
+    assert len(places) == 45
+
+
+if __name__ == "__main__":
+    test_subdivision_collects_past_the_cap()
+    test_exhausted_budget_is_reported()
+    test_no_depth_means_capped_result()
+    print("✅ Quadtree subdivision collects every place past the 45-result cap")
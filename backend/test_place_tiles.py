@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+카카오 타일 캐시 테스트 (benchmarks.mock_upstreams 의 목 카카오를 ASGI 로 연결, 네트워크 불필요)
+
+45개 상한에 걸린 넓은 영역의 결과가 타일을 채워 이후 확대 요청을 덜 받은 결과로 응답하지 않는지 확인
+    python test_place_tiles.py
+    python -m pytest -q test_place_tiles.py
+"""
+import asyncio
+import os
+
+os.environ.setdefault("KAKAO_MAX_RETRIES", "0")
+
+import httpx
+
+from app.services.kakao_local_client import KakaoLocalClient
+from app.services.place_cache import PlaceTileCache
+from app.services.rate_limiter import CircuitBreaker, TokenBucket
+from benchmarks.mock_upstreams import MockConfig, create_app
+
+KEYWORD = "해수욕장"
+WIDE = "129.0,35.0,129.4,35.3"  # 목 응답 기준 장소가 45개를 넘는 영역
+ZOOM = "129.15,35.06,129.25,35.18"  # WIDE 안에 들어가는 확대 영역
+INNER = "129.18,35.09,129.22,35.15"  # ZOOM 안에 들어가는 더 작은 영역
+
+
+def _kakao(tile_cache=None) -> KakaoLocalClient:
+    return KakaoLocalClient(
+        "test-key",
+        rate_limiter=TokenBucket(10000, 10000),
+        tile_cache=tile_cache,
+        circuit_breaker=CircuitBreaker(failure_threshold=10000),
+    )
+
+
+async def _search(rects, max_results=45):
+    """
+    같은 타일 캐시로 rects 를 차례로 검색해 (결과 목록, 마지막 영역의 카카오 호출 수, 캐시 없이 마지막 영역을 검색한 결과) 반환
+    """
+    app = create_app(MockConfig(latency_ms=0, jitter_ms=0, places_per_keyword=30000))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mock") as client:
+        cached = _kakao(PlaceTileCache())
+        results = []
+        for rect in rects:
+            await client.post("/__reset")
+            results.append(await cached._search_keyword_in_rect(client, KEYWORD, rect, max_results))
+        calls = (await client.get("/__stats")).json().get("kakao.keyword", 0)
+        direct = await _kakao()._search_keyword_in_rect(client, KEYWORD, rects[-1], max_results)
+    return results, calls, direct
+
+
+def test_capped_search_does_not_fill_tiles():
+    (wide, zoom), calls, direct = asyncio.run(_search([WIDE, ZOOM]))
+    assert len(wide) == 45
+    assert calls > 0
+    assert len(direct) > 0
+    assert sorted(p["id"] for p in zoom) == sorted(p["id"] for p in direct)
+
+
+def test_exhaustive_search_serves_zoom_from_tiles():
+    # 상한 아래로 다 받은 영역은 타일을 채우고, 그 안의 확대 요청은 같은 결과를 캐시에서 돌려줌
+    (zoom, inner), calls, direct = asyncio.run(_search([ZOOM, INNER]))
+    assert 0 < len(zoom) < 45
+    assert calls == 0
+    assert sorted(p["id"] for p in inner) == sorted(p["id"] for p in direct)
+
+
+if __name__ == "__main__":
+    test_capped_search_does_not_fill_tiles()
+    test_exhaustive_search_serves_zoom_from_tiles()
+    print("✅ Capped Kakao searches are not cached as complete tiles")
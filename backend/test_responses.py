@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+응답 압축 인코딩 협상 테스트 (네트워크 불필요)
+
+Accept-Encoding 의 q 값을 따르고, q=0 으로 거부한 인코딩으로는 압축하지 않는지 확인
+    python test_responses.py
+    python -m pytest -q test_responses.py
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.responses import CompressionMiddleware, brotli, json_response, negotiate_encoding
+
+PREFERRED = "br" if brotli is not None else "gzip"
+
+
+def test_q_values_are_honoured():
+    assert negotiate_encoding("") is None
+    assert negotiate_encoding("gzip") == "gzip"
+    assert negotiate_encoding("GZIP;q=0.5") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("gzip; q=0.0") is None
+    assert negotiate_encoding("gzip;q=oops") is None
+    assert negotiate_encoding("br;q=0, gzip") == "gzip"
+    assert negotiate_encoding("gzip, deflate, br") == PREFERRED
+
+
+def test_wildcard():
+    assert negotiate_encoding("*") == PREFERRED
+    assert negotiate_encoding("*;q=0") is None
+    assert negotiate_encoding("gzip;q=0, *") == ("br" if brotli is not None else None)
+
+
+def test_middleware_skips_refused_encoding():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=16)
+
+    @app.get("/data")
+    async def data():
+        return json_response({"values": list(range(500))})
+
+    client = TestClient(app)
+    refused = client.get("/data", headers={"Accept-Encoding": "gzip;q=0"})
+    accepted = client.get("/data", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in refused.headers
+    assert accepted.headers.get("content-encoding") == "gzip"
+    assert refused.json() == accepted.json()
+
+
+if __name__ == "__main__":
+    test_q_values_are_honoured()
+    test_wildcard()
+    test_middleware_skips_refused_encoding()
+    print("✅ Accept-Encoding q-values are honoured")
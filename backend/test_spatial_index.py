@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+관측소 KD-트리 최근접 조회 테스트 (합성 좌표, 네트워크 불필요)
+
+무작위 점에서 KD-트리의 k-최근접 결과가 전수 비교 결과와 같은지, 빈 트리·좌표 없는 관측소를 처리하는지 확인
+    python test_spatial_index.py
+    python -m pytest -q test_spatial_index.py
+"""
+import random
+
+from app.services.spatial_index import KDTree, StationIndex, haversine_km
+
+
+def _brute_force(tree: KDTree, lat: float, lon: float, k: int):
+    qx, qy = tree._project(lat, lon)
+
+    def d2(i):
+        x, y = tree._project(*tree.points[i])
+        return (x - qx) ** 2 + (y - qy) ** 2
+
+    return sorted(range(len(tree.points)), key=d2)[:k]
+
+
+def test_kdtree_matches_brute_force():
+    rnd = random.Random(7)
+    points = [(rnd.uniform(33.0, 38.7), rnd.uniform(124.5, 131.0)) for _ in range(300)]
+    tree = KDTree(points)
+    for _ in range(200):
+        lat, lon = rnd.uniform(32.5, 39.0), rnd.uniform(124.0, 131.5)
+        k = rnd.choice((1, 3, 10))
+        found = tree.query(lat, lon, k)
+        assert [idx for idx, _ in found] == _brute_force(tree, lat, lon, k)
+        for idx, dist in found:
+            assert abs(dist - haversine_km(lat, lon, *points[idx])) < 1e-9
+
+
+def test_query_edges():
+    assert KDTree([]).query(35.0, 129.0) == []
+    tree = KDTree([(35.0, 129.0), (35.0, 129.0), (36.0, 128.0)])
+    # 같은 좌표의 점이 여러 개여도 k 개를 모두 돌려줌
+    assert sorted(idx for idx, _ in tree.query(35.0, 129.0, 2)) == [0, 1]
+    assert len(tree.query(35.0, 129.0, 10)) == 3
+    assert tree.query(35.0, 129.0, 0) == []
+    assert tree.query_many([(36.0, 128.0)]) == [(2, 0.0)]
+
+
+def test_station_index_nearest_and_attach():
+    stations = [
+        {"station_id": "22101", "lat": 35.1, "lon": 129.1, "sst": 20.5, "wave_height": 0.5},
+        {"station_id": "22102", "lat": 33.5, "lon": 126.5, "sst": 22.0, "wave_height": 1.2},
+        {"station_id": "nowhere", "lat": None, "lon": None},
+    ]
+    index = StationIndex(stations)
+    assert [s["station_id"] for s in index.nearest(33.4, 126.6, k=5)] == ["22102", "22101"]
+    places = index.attach_nearest_conditions([{"x": 129.2, "y": 35.2}])
+    assert places[0]["nearest_station_id"] == "22101"
+    assert places[0]["sst"] == 20.5
+    assert places[0]["station_distance_km"] > 0
+    assert StationIndex([]).attach_nearest_conditions([{"x": 129.2, "y": 35.2}]) == [{"x": 129.2, "y": 35.2}]
+
+
+if __name__ == "__main__":
+    test_kdtree_matches_brute_force()
+    test_query_edges()
+    test_station_index_nearest_and_attach()
+    print("✅ KD-tree nearest queries match brute force")
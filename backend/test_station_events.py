@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+관측소 SSE 브로드캐스터 테스트 (합성 스냅샷, 네트워크 불필요)
+
+갱신마다 구독자에게 변경분을 보내고, 큐가 가득 찬 느린 구독자는 resync 를 받고 끊기는지,
+빠른 구독자는 영향을 받지 않는지, 지역 필터 밖 변경은 보내지 않는지 확인
+    python test_station_events.py
+    python -m pytest -q test_station_events.py
+"""
+import asyncio
+import json
+
+from app.services.kma_client import parse_sea_obs_columns
+from app.services.station_events import StationBroadcaster
+from app.services.station_snapshot import StationDiff, StationDiffLog, StationSnapshot
+from benchmarks.sea_obs_parser import make_payload
+
+
+def _snapshots(n):
+    return [StationSnapshot(parse_sea_obs_columns(make_payload(10, 1, seed)), fetched_at=1000.0 + seed) for seed in range(n)]
+
+
+def _event(message: bytes):
+    lines = message.decode("utf-8").splitlines()
+    event = next(line[len("event: "):] for line in lines if line.startswith("event: "))
+    data = json.loads(next(line[len("data: "):] for line in lines if line.startswith("data: ")))
+    return event, data
+
+
+class _Feed:
+    """StationRefresher 대신 스냅샷을 차례로 교체하며 변경분을 기록하고 브로드캐스터에 알림"""
+
+    def __init__(self, snapshot, broadcaster, diffs):
+        self.snapshot, self.broadcaster, self.diffs = snapshot, broadcaster, diffs
+
+    def publish(self, snapshot):
+        self.diffs.record(StationDiff.between(self.snapshot, snapshot))
+        self.snapshot = snapshot
+        self.broadcaster.publish(snapshot)
+
+
+async def _open(broadcaster, feed, **kwargs):
+    stream = broadcaster.stream(lambda: feed.snapshot, **kwargs)
+    assert await stream.__anext__() == b"retry: 5000\n\n"
+    assert _event(await stream.__anext__())[0] == "ready"
+    return stream
+
+
+def test_slow_consumer_is_dropped():
+    async def run():
+        snapshots = _snapshots(5)
+        diffs = StationDiffLog()
+        broadcaster = StationBroadcaster(diffs, queue_size=2, heartbeat=10)
+        feed = _Feed(snapshots[0], broadcaster, diffs)
+        fast = await _open(broadcaster, feed)
+        slow = await _open(broadcaster, feed)
+        received = []
+        for snapshot in snapshots[1:]:
+            feed.publish(snapshot)
+            received.append(_event(await fast.__anext__()))
+        stats = broadcaster.stats()
+        slow_events = [_event(message)[0] async for message in slow]
+        await fast.aclose()
+        return received, stats, slow_events, broadcaster.stats()
+
+    received, stats, slow_events, final = asyncio.run(run())
+    assert [event for event, _ in received] == ["stations"] * 4
+    assert all(data["stations"] for _, data in received)
+    assert stats == {"subscribers": 1, "published": 4, "dropped": 1}
+    # 밀린 메시지는 버리고 resync 하나만 받은 뒤 스트림이 끝남
+    assert slow_events == ["resync"]
+    assert final["subscribers"] == 0
+
+
+def test_region_filter_skips_unrelated_changes():
+    async def run():
+        snapshots = _snapshots(2)
+        diffs = StationDiffLog()
+        broadcaster = StationBroadcaster(diffs, queue_size=2, heartbeat=0.05)
+        feed = _Feed(snapshots[0], broadcaster, diffs)
+        stream = await _open(broadcaster, feed, region="없는 지역")
+        feed.publish(snapshots[1])
+        message = await stream.__anext__()
+        await stream.aclose()
+        return message
+
+    # 필터에 맞는 변경이 없으면 stations 이벤트 대신 heartbeat 만 옴
+    assert asyncio.run(run()) == b": ping\n\n"
+
+
+def test_since_catches_up_before_ready():
+    async def run():
+        snapshots = _snapshots(3)
+        diffs = StationDiffLog()
+        broadcaster = StationBroadcaster(diffs)
+        feed = _Feed(snapshots[0], broadcaster, diffs)
+        feed.publish(snapshots[1])
+        feed.publish(snapshots[2])
+        stream = broadcaster.stream(lambda: feed.snapshot, since=snapshots[0].version)
+        messages = [await stream.__anext__() for _ in range(3)]
+        behind = broadcaster.stream(lambda: feed.snapshot, since=1)
+        behind_messages = [await behind.__anext__() for _ in range(2)]
+        await stream.aclose()
+        await behind.aclose()
+        return messages, behind_messages
+
+    messages, behind_messages = asyncio.run(run())
+    assert [_event(message)[0] for message in messages[1:]] == ["stations", "ready"]
+    assert _event(messages[1])[1]["since"] == 1000000
+    assert _event(behind_messages[1])[0] == "resync"
+
+
+if __name__ == "__main__":
+    test_slow_consumer_is_dropped()
+    test_region_filter_skips_unrelated_changes()
+    test_since_catches_up_before_ready()
+    print("✅ Station broadcaster drops slow consumers and filters updates")
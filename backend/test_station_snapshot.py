@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+관측소 스냅샷 갱신 테스트 (KMA 응답은 httpx.MockTransport 로 흉내, 네트워크 불필요)
+
+첫 조회가 실패해도 갱신 주기(KMA_REFRESH_INTERVAL)를 다 기다리지 않고 짧은 간격으로 다시 시도하는지,
+변경분 링(StationDiffLog)이 이어진 변경분만 합치고 끊기거나 밀려난 버전에는 None(전체 응답)을 주는지 확인
+    python test_station_snapshot.py
+    python -m pytest -q test_station_snapshot.py
+"""
+import asyncio
+
+import httpx
+
+from app.services.station_snapshot import StationDiff, StationDiffLog, StationRefresher
+from benchmarks.sea_obs_parser import make_payload
+
+
+def test_first_refresh_retries_with_backoff():
+    calls = []
+    payload = make_payload(3, 1)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(asyncio.get_running_loop().time())
+        if len(calls) <= 2:
+            return httpx.Response(503, text="unavailable")
+        return httpx.Response(200, text=payload)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            refresher = StationRefresher(lambda: client, interval=300, retry_interval=0.02)
+            refresher.start()
+            try:
+                for _ in range(100):
+                    if refresher.snapshot.ready:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                await refresher.stop()
+            return refresher.snapshot
+
+    snapshot = asyncio.run(run())
+    assert snapshot.ready
+    assert len(calls) == 3
+    # 재시도 간격은 retry_interval 부터 두 배씩 늘어남
+    assert calls[2] - calls[1] > calls[1] - calls[0]
+
+
+def test_diff_log_merges_consecutive_diffs():
+    log = StationDiffLog(size=4)
+    log.record(StationDiff(1, 2, {"a", "b"}, set()))
+    log.record(StationDiff(2, 3, {"c"}, {"a"}))
+    log.record(StationDiff(3, 4, {"a"}, {"c"}))
+    assert log.since(4, 4) == (set(), set())
+    assert log.since(3, 4) == ({"a"}, {"c"})
+    # 사라졌다 다시 생긴 지점은 changed, 생겼다 사라진 지점은 removed 로만 남음
+    assert log.since(1, 4) == ({"a", "b"}, {"c"})
+    assert log.since(2, 3) is None  # current 보다 뒤의 변경분이 있으면 이어지지 않음
+
+
+def test_diff_log_gaps_and_eviction():
+    log = StationDiffLog(size=2)
+    log.record(StationDiff(1, 2, {"a"}, set()))
+    # 워커가 3 을 건너뛰고 4 로 갱신한 경우
+    log.record(StationDiff(3, 4, {"b"}, set()))
+    assert log.since(1, 4) is None
+    assert log.since(2, 4) is None
+    assert log.since(3, 4) == ({"b"}, set())
+    log.record(StationDiff(4, 5, {"c"}, set()))
+    # 링에서 밀려난 버전과 모르는 버전은 전체 응답
+    assert log.since(1, 5) is None
+    assert log.since(0, 5) is None
+    assert log.since(3, 5) == ({"b", "c"}, set())
+    assert log.since(7, 5) is None
+
+
+if __name__ == "__main__":
+    test_first_refresh_retries_with_backoff()
+    test_diff_log_merges_consecutive_diffs()
+    test_diff_log_gaps_and_eviction()
+    print("✅ Station snapshots retry with backoff and diffs merge only across unbroken versions")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+활동별 적합도 순위 테스트 (합성 관측값, 네트워크 불필요)
+
+점수 내림차순 정렬, 한계를 넘는 변수의 0점, 핵심 변수 결측 제외, 시도별 순위를 확인
+    python test_suitability.py
+    python -m pytest -q test_suitability.py
+"""
+from app.services.suitability import SuitabilityIndex
+
+
+def _station(station_id, region, **values):
+    return {"station_id": station_id, "station_name": station_id, "lat": 35.0, "lon": 129.0, "region": region, **values}
+
+
+STATIONS = [
+    _station("calm", "부산", wave_height=0.3, wind_speed=2.0, wind_gust=3.0, sst=24.0),
+    _station("breezy", "제주", wave_height=0.6, wind_speed=8.0, wind_gust=10.0, sst=24.0),
+    _station("stormy", "부산", wave_height=3.5, wind_speed=14.0, wind_gust=20.0, sst=24.0),
+    _station("no_wave", "제주", wind_speed=1.0, sst=24.0),
+    _station("surf", "제주", wave_height=1.5, wind_speed=3.0, wind_gust=5.0, sst=22.0),
+]
+
+
+def test_rankings_are_sorted_by_score():
+    index = SuitabilityIndex(STATIONS)
+    ranked = index.top("scuba", k=10)
+    scores = [entry["score"] for entry in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert ranked[0]["station_id"] == "calm"
+    assert ranked[0]["score"] == 100.0
+    # 풍속이 상한을 넘으면 다른 변수와 무관하게 0점
+    assert next(entry for entry in ranked if entry["station_id"] == "stormy")["score"] == 0.0
+
+
+def test_missing_key_variable_is_excluded():
+    index = SuitabilityIndex(STATIONS)
+    # 스쿠버의 핵심 변수(파고)가 없는 관측소는 순위에서 빠짐
+    assert "no_wave" not in {entry["station_id"] for entry in index.top("scuba", k=10)}
+    assert index.top("surfing", k=1)[0]["station_id"] == "surf"
+
+
+def test_region_rankings_and_limit():
+    index = SuitabilityIndex(STATIONS)
+    assert [entry["station_id"] for entry in index.top("scuba", k=10, region="부산")] == ["calm", "stormy"]
+    assert len(index.top("scuba", k=2)) == 2
+    assert index.top("scuba", region="강원") == []
+    assert index.top("unknown") == []
+
+
+if __name__ == "__main__":
+    test_rankings_are_sorted_by_score()
+    test_missing_key_variable_is_excluded()
+    test_region_rankings_and_limit()
+    print("✅ Suitability rankings are ordered and filtered correctly")